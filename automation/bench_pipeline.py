@@ -0,0 +1,460 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+import tempfile
+import tracemalloc
+
+import clients
+import metrics
+import scheduler
+import search_cache
+import dedup_index
+import llm_cache
+import post_index
+import retrieval_index
+import daily_news_crawler
+import run_automation
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 네트워크 없이 전체 파이프라인(collect -> synthesize -> rewrite -> persist)과
+# 이미지 변환을 측정합니다. Tavily/Gemini는 fixture 재생 스텁으로 대체합니다.
+BENCH_DIR = os.path.join(search_cache.CACHE_DIR, "bench")
+FIXTURE_PATH = os.path.join(BENCH_DIR, "tavily_fixture.json")  # --record로 저장한 실제 응답
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# 기사 수 단계 / 반복 횟수 (최솟값 사용)
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_REPEAT = 3
+
+# 이미지 벤치마크: 생성할 이미지 수와 크기
+IMAGE_COUNT = 6
+IMAGE_SIZE = (2400, 1600)
+
+# 회귀 판정: 기준값 대비 허용 비율, 그리고 아주 짧은 구간의 측정 잡음 허용치(초/MB)
+DEFAULT_TOLERANCE = 0.25
+MIN_SLACK = {"seconds": 0.005, "peak_mb": 1.0}
+
+# 재현 가능한 결과를 위해 날짜/난수 고정
+BENCH_DATE = datetime.date(2026, 1, 30)
+SEED = 20260130
+
+_WORDS = (
+    "bitcoin ether stablecoin liquidity treasury yield inflation federal reserve "
+    "etf inflow outflow custody regulation sec congress bill market maker volatility "
+    "funding rate basis leverage onchain whale exchange reserve miner hashrate halving "
+    "tokenization institutional allocation macro dollar index risk appetite equities"
+).split()
+_BOILERPLATE = (
+    "Subscribe to our newsletter",
+    "Sign up for free",
+    "Home | Markets | Crypto | Opinion | Video",
+    "All rights reserved.",
+    "[Read more](https://example.com/more)",
+)
+
+
+# ==========================================
+# 2. Fixture (녹화 응답 재생 + 합성 기사)
+# ==========================================
+def synthetic_article(rng, track_no, i, pub_date):
+    """문장/메뉴/반복 줄이 섞인 실제와 비슷한 raw_content를 가진 기사 1건"""
+    paragraphs = []
+    for _ in range(rng.randint(6, 14)):
+        sentence_count = rng.randint(2, 5)
+        paragraphs.append(
+            " ".join(
+                " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 18))).capitalize() + "."
+                for _ in range(sentence_count)
+            )
+        )
+    lines = [rng.choice(_BOILERPLATE)] + paragraphs + [rng.choice(_BOILERPLATE)] * 2
+    return {
+        "url": f"https://bench.example.com/track{track_no}/article-{i}?utm_source=bench",
+        "title": f"Bench article {track_no}-{i}: " + " ".join(rng.sample(_WORDS, 5)),
+        "published_date": pub_date,
+        "raw_content": "\n".join(lines),
+        "score": round(rng.random(), 3),
+    }
+
+
+def build_fixture(total_articles, recorded=None, seed=SEED):
+    """
+    검색 계획의 트랙별 count 비율대로 total_articles건을 나눈 {query: results} 매핑.
+    녹화된 응답이 있으면 먼저 쓰고, 모자라는 만큼 합성 기사로 채웁니다.
+    약 10%는 URL만 다른 중복 기사로 만들어 중복 제거 경로도 함께 측정합니다.
+    """
+    rng = random.Random(seed)
+    plan = daily_news_crawler.build_search_plan(BENCH_DATE)
+    weights = [track["count"] for track in plan]
+    recorded = recorded or {}
+
+    fixture = {}
+    for track_no, track in enumerate(plan):
+        want = max(1, round(total_articles * track["count"] / sum(weights)))
+        pub_date = (
+            BENCH_DATE.isoformat()
+            if track["type"] == "news"
+            else (BENCH_DATE - datetime.timedelta(days=60)).isoformat()
+        )
+        results = list(recorded.get(track["query"], []))[:want]
+        while len(results) < want:
+            i = len(results)
+            if results and rng.random() < 0.1:
+                duplicate = dict(rng.choice(results))
+                duplicate["url"] = duplicate["url"].split("?")[0] + f"?ref=dup{i}"
+                results.append(duplicate)
+            else:
+                results.append(synthetic_article(rng, track_no, i, pub_date))
+        fixture[track["query"]] = results
+    return fixture
+
+
+class ReplayTavily:
+    """fixture에 있는 query의 결과를 그대로 돌려주는 TavilyClient 대체물"""
+
+    def __init__(self, fixture):
+        self.fixture = fixture
+
+    def search(self, query, max_results=None, **kwargs):
+        # 실제 API처럼 max_results로 자르지 않음 (기사 수 확장 측정이 목적)
+        return {"results": self.fixture.get(query, [])}
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class CannedModel:
+    """프롬프트 종류에 맞는 고정 응답을 돌려주는 GenerativeModel 대체물 (latency 초 지연)"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        time.sleep(self.latency)
+        text = canned_markdown() if "블로그" in prompt else canned_html(prompt)
+        if not stream:
+            return _Chunk(text)
+        return (_Chunk(text[i : i + 400]) for i in range(0, len(text), 400))
+
+
+def canned_html(prompt):
+    """리포트 프롬프트 크기에 비례하는 McKinsey 스타일 HTML (```html 펜스 포함)"""
+    cited = min(40, prompt.count("[Article ID:"))
+    rows = "".join(
+        f"<li>Key finding {i} on liquidity and regulation <sup>[{i}]</sup></li>"
+        for i in range(1, cited + 1)
+    )
+    sections = "".join(
+        f"<div class='section'><h2>Section {s}</h2><p>{'Market structure analysis. ' * 40}</p>"
+        f"<ul>{rows}</ul></div>"
+        for s in range(1, 5)
+    )
+    return (
+        "```html\n<!DOCTYPE html><html><head><style>body{font-family:serif}</style></head>"
+        f"<body><h1>Daily Briefing</h1>{sections}</body></html>\n```"
+    )
+
+
+def canned_markdown():
+    return (
+        "## 오늘의 핵심 요약\n- 유동성 확대\n- 규제 명확화\n- 기관 자금 유입 $1.2B\n\n"
+        + "\n\n".join(f"### Section {i}\n" + "시장 구조 분석 문장입니다. " * 60 for i in range(1, 4))
+    )
+
+
+def load_recorded():
+    try:
+        with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def record_fixture():
+    """실제 Tavily 응답을 검색 계획 그대로 받아 fixture로 저장합니다. (네트워크/API 키 필요)"""
+    client = clients.get_tavily()
+    recorded = {}
+    for track in daily_news_crawler.build_search_plan(BENCH_DATE):
+        print(f"   🎙️ 녹화: {track['query'][:60]}...")
+        results = daily_news_crawler.fetch_news_with_options(
+            track["query"], track["count"], track["days"], client, track["type"], use_cache=False
+        )
+        recorded[track["query"]] = results
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    with open(FIXTURE_PATH, "w", encoding="utf-8") as f:
+        json.dump(recorded, f, ensure_ascii=False)
+    print(f"💾 fixture 저장: {FIXTURE_PATH}")
+
+
+# ==========================================
+# 3. 측정
+# ==========================================
+def isolate(workdir):
+    """캐시/중복 색인/블로그 출력/속도 제한을 임시 환경으로 돌려 실제 데이터에 영향이 없게 함"""
+    search_cache.BYPASS = True
+    search_cache.set_cache(search_cache.SearchCache(os.path.join(workdir, "cache.sqlite3")))
+    dedup_index.INDEX_PATH = os.path.join(workdir, "dedup_index.json")
+    # 응답 캐시는 임시 경로에 쓰고 읽지 않음 (매 반복 실제 생성 경로를 측정)
+    llm_cache.REFRESH = True
+    llm_cache.set_cache(llm_cache.LlmCache(os.path.join(workdir, "llm")))
+    run_automation.BLOG_DIR = os.path.join(workdir, "blog")
+    post_index.INDEX_PATH = os.path.join(workdir, "post_index.json")
+    retrieval_index.set_index(
+        retrieval_index.RetrievalIndex(os.path.join(workdir, "retrieval.sqlite3"))
+    )
+    os.makedirs(run_automation.BLOG_DIR, exist_ok=True)
+
+    unlimited = {
+        name: dict(policy, rate=1e9, burst=1e9)
+        for name, policy in scheduler.PROVIDER_POLICIES.items()
+    }
+    scheduler.set_scheduler(scheduler.CallScheduler(unlimited))
+
+
+def run_pipeline_once(fixture, model, workdir):
+    """collect -> synthesize -> rewrite -> persist를 한 번 실행하고 단계별 시간(초)을 반환"""
+    if os.path.exists(dedup_index.INDEX_PATH):
+        os.remove(dedup_index.INDEX_PATH)  # 매 반복 같은 조건 (지난 브리핑 이력 없음)
+
+    timings = {}
+    client = ReplayTavily(fixture)
+    day = BENCH_DATE.isoformat()
+
+    with clients.override(tavily=client, model=model):
+        started = time.perf_counter()
+        searched = daily_news_crawler.search_sources(BENCH_DATE, client)
+        timings["search"] = time.perf_counter() - started
+
+        mark = time.perf_counter()
+        collected = daily_news_crawler.assemble_context(searched)
+        timings["context"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        html = daily_news_crawler.synthesize_report(collected)
+        timings["synthesize"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        body = run_automation.rewrite_as_blog_post(html)
+        timings["rewrite"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        run_automation.persist_stage(body, day, "bench")
+        timings["persist"] = time.perf_counter() - mark
+
+        timings["total"] = time.perf_counter() - started
+    return timings
+
+
+def bench_pipeline(sizes, repeat, latency, workdir):
+    recorded = load_recorded()
+    if recorded:
+        print(f"🎞️ 녹화된 Tavily 응답 사용: {FIXTURE_PATH}")
+    model = CannedModel(latency)
+    results = {}
+
+    for size in sizes:
+        fixture = build_fixture(size, recorded)
+        articles = sum(len(r) for r in fixture.values())
+
+        # 시간 측정 (tracemalloc 없이, 반복 중 최솟값)
+        best = None
+        for _ in range(repeat):
+            timings = _quiet(run_pipeline_once, fixture, model, workdir)
+            if best is None or timings["total"] < best["total"]:
+                best = timings
+
+        # 메모리 측정은 별도 1회 (tracemalloc이 실행 시간을 늘리므로)
+        tracemalloc.start()
+        _quiet(run_pipeline_once, fixture, model, workdir)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[f"pipeline/{size}"] = {
+            "articles": articles,
+            "seconds": best["total"],
+            "stages": {k: v for k, v in best.items() if k != "total"},
+            "peak_mb": peak / 1024 / 1024,
+            "articles_per_sec": articles / best["total"] if best["total"] else 0.0,
+        }
+    return results
+
+
+def make_images(directory, count, size, seed=SEED):
+    """그라데이션+노이즈 JPEG/PNG를 번갈아 생성 (실제 사진과 비슷한 압축 부담)"""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        gradient = Image.linear_gradient("L").resize(size)
+        noise = Image.effect_noise(size, 40 + rng.randint(0, 30))
+        img = Image.merge("RGB", (gradient, noise, gradient.rotate(90).resize(size)))
+        ext = "jpg" if i % 2 == 0 else "png"
+        path = os.path.join(directory, f"bench-{i}.{ext}")
+        if ext == "jpg":
+            img.save(path, quality=90)
+        else:
+            img.save(path)
+        paths.append(path)
+    return paths
+
+
+def bench_images(count, repeat, workdir):
+    import image_processor
+
+    source_dir = os.path.join(workdir, "images-src")
+    target_dir = os.path.join(workdir, "images-out")
+    os.makedirs(source_dir, exist_ok=True)
+    os.makedirs(target_dir, exist_ok=True)
+    sources = make_images(source_dir, count, IMAGE_SIZE)
+    source_bytes = sum(os.path.getsize(p) for p in sources)
+
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for path in sources:
+            target = os.path.join(target_dir, os.path.splitext(os.path.basename(path))[0] + ".webp")
+            image_processor.convert_job(path, target)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    image_processor.convert_job(sources[0], os.path.join(target_dir, "traced.webp"))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        f"images/{count}": {
+            "images": count,
+            "seconds": best,
+            "per_image": best / count,
+            "mb_per_sec": source_bytes / 1024 / 1024 / best,
+            "peak_mb": peak / 1024 / 1024,
+        }
+    }
+
+
+def _quiet(fn, *args):
+    """파이프라인의 진행 출력(print)을 숨기고 실행"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    try:
+        return fn(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+# ==========================================
+# 4. 기준값 비교
+# ==========================================
+def compare(results, baseline, tolerance):
+    """seconds/peak_mb가 기준값 * (1 + tolerance) + 잡음 허용치를 넘으면 회귀로 판정"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for key, slack in MIN_SLACK.items():
+            if key not in previous:
+                continue
+            limit = previous[key] * (1 + tolerance) + slack
+            if current[key] > limit:
+                regressions.append((name, key, previous[key], current[key]))
+    return regressions
+
+
+def print_results(results, baseline):
+    print(f"\n🏁 [Bench] 결과 (기준 날짜 {BENCH_DATE}, 네트워크 없음)")
+    print(f"   {'Case':<16} {'Items':>6} {'Time':>9} {'Peak':>9} {'Rate':>12} {'vs base':>9}")
+    for name, row in results.items():
+        items = row.get("articles", row.get("images"))
+        rate = (
+            f"{row['articles_per_sec']:.0f} art/s" if "articles_per_sec" in row else f"{row['mb_per_sec']:.1f} MB/s"
+        )
+        previous = baseline.get(name, {}).get("seconds")
+        delta = f"{(row['seconds'] / previous - 1) * 100:+.0f}%" if previous else "-"
+        print(
+            f"   {name:<16} {items:>6} {row['seconds'] * 1000:>7.1f}ms {row['peak_mb']:>7.1f}MB {rate:>12} {delta:>9}"
+        )
+        for stage, seconds in row.get("stages", {}).items():
+            print(f"      - {stage:<12} {seconds * 1000:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="녹화/합성 fixture로 파이프라인과 이미지 변환을 오프라인 측정합니다."
+    )
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="기사 수 단계 (쉼표 구분)"
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="반복 횟수 (최솟값 사용)")
+    parser.add_argument("--images", type=int, default=IMAGE_COUNT, help="이미지 수 (0이면 생략)")
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="가짜 Gemini 응답 지연(초)"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 파일 경로")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 비율 (기본 0.25 = 25%%)"
+    )
+    parser.add_argument(
+        "--record", action="store_true", help="실제 Tavily 응답을 fixture로 녹화 (네트워크 필요)"
+    )
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture()
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        isolate(workdir)
+        results = bench_pipeline(sizes, args.repeat, args.llm_latency, workdir)
+        if args.images:
+            try:
+                results.update(bench_images(args.images, args.repeat, workdir))
+            except ImportError as e:
+                print(f"⚠️ 이미지 벤치마크 생략 (Pillow 필요): {e}")
+        search_cache.get_cache().close()
+
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 기준값 저장: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("ℹ️ 기준값이 없습니다. --save-baseline으로 먼저 저장하세요.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, key, before, after in regressions:
+        print(f"❌ [Regression] {name} {key}: {before:.4f} -> {after:.4f}")
+    if regressions:
+        return 1
+    print(f"✅ 기준값 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
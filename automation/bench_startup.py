@@ -0,0 +1,94 @@
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+AUTOMATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 측정 대상: 각 진입점 모듈 import 비용 vs 예전처럼 import 시점에 SDK까지 불러오는 비용
+TARGETS = {
+    "daily_news_crawler": "import daily_news_crawler",
+    "run_automation": "import run_automation",
+    "sdk (eager baseline)": "import dotenv, tavily, google.generativeai",
+}
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+# ==========================================
+# 2. 측정 함수
+# ==========================================
+def measure(statement, repeat=5):
+    """
+    python -X importtime -c "<statement>"를 repeat번 실행하여
+    (최소 wall time 초, 최소 누적 import 시간 초, self 시간이 큰 모듈 상위 5개)를 반환합니다.
+    """
+    best_wall = best_import = None
+    heaviest = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=AUTOMATION_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        )
+        wall = time.perf_counter() - started
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1:]
+            raise RuntimeError(f"{statement!r} 실패: {' '.join(error)}")
+
+        top_level = []
+        self_times = []
+        for line in result.stderr.splitlines():
+            match = _LINE_RE.match(line)
+            if not match:
+                continue
+            self_times.append((int(match.group(1)), match.group(4)))
+            # 들여쓰기가 1칸인 항목 = 최상위 import (누적 시간에 하위 import 포함)
+            if len(match.group(3)) == 1:
+                top_level.append(int(match.group(2)))
+
+        total_import = sum(top_level) / 1e6
+        if best_wall is None or wall < best_wall:
+            best_wall = wall
+        if best_import is None or total_import < best_import:
+            best_import = total_import
+            heaviest = sorted(self_times, reverse=True)[:5]
+
+    return best_wall, best_import, heaviest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="진입점 모듈의 import(시작) 시간을 측정합니다."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="반복 횟수 (최솟값 사용)"
+    )
+    args = parser.parse_args()
+
+    print(f"⏱️ [Startup] python -X importtime 측정 (repeat={args.repeat}, 최솟값)")
+    print(f"   {'Target':<24} {'Wall':>9} {'Imports':>9}")
+
+    for label, statement in TARGETS.items():
+        try:
+            wall, total_import, heaviest = measure(statement, args.repeat)
+        except RuntimeError as e:
+            print(f"   {label:<24} ⚠️ {e}")
+            continue
+
+        print(f"   {label:<24} {wall * 1000:>7.1f}ms {total_import * 1000:>7.1f}ms")
+        for us, name in heaviest:
+            print(f"      - {name:<32} {us / 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
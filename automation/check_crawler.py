@@ -0,0 +1,104 @@
+import time
+import tempfile
+
+import scheduler
+import search_cache
+import daily_news_crawler
+from checks import run_checks
+
+# ==========================================
+# 병렬 검색(fetch_all_tracks) 확인: 지연이 있는 Tavily 스텁으로 실행
+# ==========================================
+LATENCY = 0.3
+
+
+class SlowTavily:
+    """query별 지연 후 결과 1건을 돌려주는 스텁 (동시에 실행된 최대 호출 수 기록)"""
+
+    def __init__(self, latency=LATENCY, slow_queries=None):
+        self.latency = latency
+        self.slow_queries = slow_queries or {}
+        self.active = 0
+        self.max_active = 0
+
+    def search(self, query, max_results=None, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.slow_queries.get(query, self.latency))
+            return {"results": [{"url": f"https://example.com/{query}", "title": query}]}
+        finally:
+            self.active -= 1
+
+
+def _isolate(workdir):
+    search_cache.set_cache(search_cache.SearchCache(f"{workdir}/cache.sqlite3"))
+    unlimited = {
+        name: dict(policy, rate=1e9, burst=1e9)
+        for name, policy in scheduler.PROVIDER_POLICIES.items()
+    }
+    scheduler.set_scheduler(scheduler.CallScheduler(unlimited))
+
+
+def _plan(n):
+    return [
+        {"category": f"Track {i}", "query": f"q{i}", "count": 3, "days": 1, "type": "news"}
+        for i in range(n)
+    ]
+
+
+def test_tracks_run_concurrently():
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate(workdir)
+        stub = SlowTavily()
+        started = time.perf_counter()
+        results = daily_news_crawler.fetch_all_tracks(
+            _plan(4), max_workers=4, client=stub, use_cache=False
+        )
+        elapsed = time.perf_counter() - started
+
+    # 순차 실행이면 4 x 0.3s = 1.2s, 병렬이면 약 0.3s
+    assert elapsed < LATENCY * 2.5, f"병렬 실행이 아님: {elapsed:.2f}s"
+    assert stub.max_active == 4
+    assert [r[0]["title"] for r in results] == ["q0", "q1", "q2", "q3"]
+
+
+def test_results_keep_plan_order():
+    # 앞 트랙일수록 늦게 끝나도 결과는 search_plan 순서 그대로
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate(workdir)
+        stub = SlowTavily(slow_queries={"q0": 0.4, "q1": 0.2, "q2": 0.0})
+        results = daily_news_crawler.fetch_all_tracks(
+            _plan(3), max_workers=3, client=stub, use_cache=False
+        )
+    assert [r[0]["title"] for r in results] == ["q0", "q1", "q2"]
+
+
+def test_worker_limit_is_respected():
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate(workdir)
+        stub = SlowTavily(latency=0.1)
+        daily_news_crawler.fetch_all_tracks(_plan(6), max_workers=2, client=stub, use_cache=False)
+    assert stub.max_active == 2
+
+
+def test_slow_track_times_out_as_empty():
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate(workdir)
+        stub = SlowTavily(latency=0.05, slow_queries={"q1": 2.0})
+        started = time.perf_counter()
+        results = daily_news_crawler.fetch_all_tracks(
+            _plan(3), max_workers=3, timeout=0.5, client=stub, use_cache=False
+        )
+        elapsed = time.perf_counter() - started
+        # 버려진 검색 스레드가 끝날 때까지 임시 캐시를 유지
+        while stub.active:
+            time.sleep(0.05)
+
+    assert results[1] == []
+    assert results[0] and results[2]
+    assert elapsed < 1.5, f"제한 시간을 기다리지 않음: {elapsed:.2f}s"
+
+
+if __name__ == "__main__":
+    run_checks(globals())
@@ -0,0 +1,262 @@
+import json
+import datetime
+import tempfile
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+import clients
+import daemon
+import daily_news_crawler
+import metrics
+import retrieval_index
+import scheduler
+import search_cache
+from checks import run_checks
+
+# ==========================================
+# 예약 실행 데몬 확인: 가짜 시계로 하루치 일정을 몇 초 만에 실행
+# ==========================================
+START = datetime.datetime(2026, 1, 30, 0, 0)  # 금요일 자정
+
+
+class FakeClock:
+    """sleep()하면 그만큼 시각이 흐르는 가짜 시계 (작업 실행에 걸리는 시간도 흉내 가능)"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+@contextmanager
+def isolated(clock=None):
+    """
+    측정 파일(run_job -> metrics.start_run), 검색 캐시, 로컬 색인, 호출 스케줄러를 임시 디렉터리로 옮기고
+    끝나면 원래대로 되돌립니다. clock을 주면 검색 캐시의 유효 기간도 가짜 시계 기준으로 확인합니다.
+    """
+    metrics_dir = metrics.METRICS_DIR
+    with tempfile.TemporaryDirectory() as workdir:
+        metrics.METRICS_DIR = f"{workdir}/metrics"
+        cache_clock = (lambda: clock().timestamp()) if clock else search_cache.time.time
+        search_cache.set_cache(
+            search_cache.SearchCache(f"{workdir}/cache.sqlite3", clock=cache_clock)
+        )
+        retrieval_index.set_index(retrieval_index.RetrievalIndex(f"{workdir}/index.sqlite3"))
+        unlimited = {
+            name: dict(policy, rate=1e9, burst=1e9)
+            for name, policy in scheduler.PROVIDER_POLICIES.items()
+        }
+        scheduler.set_scheduler(scheduler.CallScheduler(unlimited))
+        try:
+            yield workdir
+        finally:
+            metrics.METRICS_DIR = metrics_dir
+            search_cache.get_cache().close()
+            retrieval_index.get_index().close()
+            search_cache.set_cache(None)
+            retrieval_index.set_index(None)
+            scheduler.set_scheduler(None)
+
+
+def _run_until(instance, clock, end):
+    instance.start()
+    while clock.now < end:
+        clock.sleep(instance.tick())
+
+
+def _recording_jobs(clock, calls, durations=None):
+    durations = durations or {}
+
+    def job(name):
+        def fn():
+            calls.append((name, clock.now))
+            clock.sleep(durations.get(name, 60))
+            return True
+
+        return fn
+
+    return [
+        daemon.Job(name, schedule, job(name))
+        for name, schedule in (
+            ("prefetch", daemon.PREFETCH_SCHEDULE),
+            ("briefing", daemon.BRIEFING_SCHEDULE),
+            ("update", daemon.UPDATE_SCHEDULE),
+        )
+    ]
+
+
+def test_default_schedule_for_one_day():
+    # 자정 정각 실행도 포함되도록 1분 전에 시작 (next_after는 같은 분을 제외)
+    clock = FakeClock(START - datetime.timedelta(minutes=1))
+    calls = []
+    instance = daemon.Daemon(_recording_jobs(clock, calls), clock=clock, sleep=clock.sleep)
+    with isolated():
+        _run_until(instance, clock, START + datetime.timedelta(hours=23, minutes=59))
+
+    assert [(name, at.strftime("%H:%M")) for name, at in calls] == [
+        ("prefetch", "00:00"),
+        ("prefetch", "02:00"),
+        ("prefetch", "04:00"),
+        ("prefetch", "06:00"),
+        ("briefing", "06:30"),
+        ("update", "12:00"),
+        ("update", "18:00"),
+    ]
+    assert all(job.last_status == "ok" for job in instance.jobs.values())
+
+
+def test_idle_wakeups_are_capped():
+    clock = FakeClock(START)
+    instance = daemon.Daemon(_recording_jobs(clock, []), clock=clock, sleep=clock.sleep)
+    instance.start()
+    # 다음 작업이 6시간 뒤여도 MAX_IDLE_SECONDS마다 시계를 다시 확인
+    assert instance.tick() == daemon.MAX_IDLE_SECONDS
+
+
+def test_long_job_skips_missed_runs():
+    clock = FakeClock(START)
+    calls = []
+    jobs = [
+        daemon.Job(
+            "hourly",
+            "0 * * * *",
+            lambda: calls.append(clock.now) or clock.sleep(3 * 60 * 60 + 60) or True,
+        )
+    ]
+    instance = daemon.Daemon(jobs, clock=clock, sleep=clock.sleep)
+    with isolated():
+        _run_until(instance, clock, START + datetime.timedelta(hours=9))
+    # 01:00 실행이 04:01까지 걸리면 02~04시는 몰아서 실행하지 않고 05:00부터 재개
+    assert [at.strftime("%H:%M") for at in calls] == ["01:00", "05:00"]
+
+
+def test_health_returns_503_when_degraded():
+    clock = FakeClock(START)
+    outcome = {"ok": True}
+    instance = daemon.Daemon(
+        [daemon.Job("job", "0 * * * *", lambda: outcome["ok"])], clock=clock, sleep=clock.sleep
+    )
+    instance.start()
+    with isolated():
+        server = daemon.serve(instance, "127.0.0.1", 0)
+        try:
+            codes = _health_sequence(instance, server, outcome)
+        finally:
+            server.shutdown()
+            server.server_close()
+    healthy, degraded, (metrics_code, metrics_body), recovered = codes
+
+    assert healthy[0] == 200 and json.loads(healthy[1])["status"] == "ok"
+    assert degraded[0] == 503 and json.loads(degraded[1])["status"] == "degraded"
+    assert metrics_code == 200 and 'oikonomos_job_failures_total{job="job"} 1' in metrics_body
+    assert recovered[0] == 200
+
+
+def _health_sequence(instance, server, outcome):
+    """성공 -> 실패 -> 성공 순서로 작업을 실행하며 /health, /metrics 응답을 모음"""
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(base + path, timeout=5) as response:
+                return response.status, response.read().decode()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode()
+
+    instance.run_job(instance.jobs["job"])
+    healthy = get("/health")
+
+    outcome["ok"] = False
+    instance.run_job(instance.jobs["job"])
+    degraded = get("/health")
+    metrics_response = get("/metrics")
+
+    outcome["ok"] = True
+    instance.run_job(instance.jobs["job"])
+    return healthy, degraded, metrics_response, get("/health")
+
+
+class CountingTavily:
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, query, **kwargs):
+        self.calls += 1
+        return {"results": [{"url": f"https://example.com/{self.calls}", "title": query}]}
+
+
+def _news_tracks(today):
+    plan = daily_news_crawler.build_search_plan(today)
+    return sum(1 for track in plan if track["type"] == "news")
+
+
+def test_prefetch_skips_tracks_with_fresh_cache():
+    today = datetime.date.today()
+    clock = FakeClock(datetime.datetime.combine(today, datetime.time(0)))
+    stub = CountingTavily()
+    with isolated(clock), clients.override(tavily=stub):
+        first = daemon.prefetch_news(today)
+        after_first = stub.calls
+        # 30분 뒤: 아직 PREFETCH_MAX_AGE 이내라 API 호출 없음
+        clock.sleep(30 * 60)
+        second = daemon.prefetch_news(today)
+        after_second = stub.calls
+        # 수집 간격(2시간)이 지나면 속보 트랙만 다시 검색 (Context는 평소 유효 기간 유지)
+        clock.sleep(90 * 60)
+        daemon.prefetch_news(today)
+
+    assert first and second
+    assert after_first >= _news_tracks(today)
+    assert after_second == after_first
+    assert stub.calls - after_second == _news_tracks(today)
+
+
+def test_briefing_hits_cache_filled_overnight():
+    today = datetime.date.today()
+    start = datetime.datetime.combine(today, datetime.time(0)) - datetime.timedelta(minutes=1)
+    clock = FakeClock(start)
+    stub = CountingTavily()
+    searches = {"prefetch": [], "briefing": []}
+
+    def counted(name, fn):
+        def run():
+            before = stub.calls
+            result = fn()
+            searches[name].append((clock.now.strftime("%H:%M"), stub.calls - before))
+            return result
+
+        return run
+
+    jobs = [
+        daemon.Job(
+            "prefetch",
+            daemon.PREFETCH_SCHEDULE,
+            counted("prefetch", lambda: daemon.prefetch_news(today)),
+        ),
+        # 아침 브리핑의 수집 단계 (collect_briefing_sources -> search_sources와 같은 검색)
+        daemon.Job(
+            "briefing",
+            daemon.BRIEFING_SCHEDULE,
+            counted("briefing", lambda: daily_news_crawler.search_sources(today)),
+        ),
+    ]
+    with isolated(clock), clients.override(tavily=stub):
+        instance = daemon.Daemon(jobs, clock=clock, sleep=clock.sleep)
+        _run_until(instance, clock, start + datetime.timedelta(hours=7))
+
+    news = _news_tracks(today)
+    assert [at for at, _ in searches["prefetch"]] == ["00:00", "02:00", "04:00", "06:00"]
+    # 첫 회차는 전체 수집, 이후 회차는 오래된 속보 트랙만 갱신
+    assert searches["prefetch"][0][1] >= news
+    assert [count for _, count in searches["prefetch"][1:]] == [news] * 3
+    # 06:30 브리핑은 06:00 회차가 채운 캐시만으로 검색 완료
+    assert searches["briefing"] == [("06:30", 0)]
+
+
+if __name__ == "__main__":
+    run_checks(globals())
@@ -0,0 +1,126 @@
+import os
+import subprocess
+import tempfile
+
+import publish
+from checks import run_checks
+
+# ==========================================
+# 배포(publish) 확인: 임시 저장소와 로컬 bare 원격 저장소로 실행
+# ==========================================
+DAY = "2026-01-30"
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, stdout=subprocess.PIPE, encoding="utf-8"
+    ).stdout
+
+
+def write(repo, rel_path, text="x\n"):
+    path = os.path.join(repo, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_repo(workdir):
+    """origin(bare)에 첫 커밋이 push된 작업 저장소를 만듭니다."""
+    remote = os.path.join(workdir, "remote.git")
+    repo = os.path.join(workdir, "blog")
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", remote], check=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", repo], check=True)
+    git(repo, "config", "user.name", "Publisher")
+    git(repo, "config", "user.email", "publisher@example.com")
+    git(repo, "config", "commit.gpgsign", "false")
+    git(repo, "remote", "add", "origin", remote)
+    write(repo, "README.md")
+    git(repo, "add", "README.md")
+    git(repo, "commit", "-q", "-m", "init")
+    git(repo, "push", "-q", "origin", "main")
+    return repo, remote
+
+
+def remote_files(remote):
+    return set(git(remote, "ls-tree", "-r", "--name-only", "main").split())
+
+
+def staged(repo):
+    return set(git(repo, "diff", "--cached", "--name-only").split())
+
+
+def test_publishes_changed_files_with_empty_image_folder():
+    with tempfile.TemporaryDirectory() as workdir:
+        repo, remote = make_repo(workdir)
+        write(repo, f"data/blog/{DAY}-briefing.mdx")
+        write(repo, f"data/blog/{DAY}-briefing-update-1200.mdx")
+        write(repo, f"data/blog/{DAY}-study.mdx")  # 다른 카테고리: 배포 대상 아님
+        # 이미지가 없는 빈 폴더: git이 모르는 경로라 pathspec으로 넘기면 add/commit이 실패함
+        os.makedirs(os.path.join(repo, "public/static/images/2026/01-30-briefing"))
+        write(repo, "notes.txt")
+        git(repo, "add", "notes.txt")  # 미리 스테이징된 다른 파일은 커밋에 섞이지 않아야 함
+
+        ok = publish.publish_to_github(["briefing"], [DAY], yes=True, cwd=repo)
+
+        files = remote_files(remote)
+        still_staged = staged(repo)
+
+    assert ok
+    assert f"data/blog/{DAY}-briefing.mdx" in files
+    assert f"data/blog/{DAY}-briefing-update-1200.mdx" in files
+    assert f"data/blog/{DAY}-study.mdx" not in files
+    assert "notes.txt" not in files
+    assert still_staged == {"notes.txt"}
+
+
+def test_nothing_changed_skips_commit():
+    with tempfile.TemporaryDirectory() as workdir:
+        repo, remote = make_repo(workdir)
+        os.makedirs(os.path.join(repo, "public/static/images/2026/01-30-briefing"))
+        before = git(repo, "rev-parse", "HEAD")
+        ok = publish.publish_to_github(["briefing"], [DAY], yes=True, cwd=repo)
+        after = git(repo, "rev-parse", "HEAD")
+    assert ok
+    assert before == after
+
+
+def test_failed_commit_unstages_artifacts():
+    with tempfile.TemporaryDirectory() as workdir:
+        repo, remote = make_repo(workdir)
+        hook = os.path.join(repo, ".git", "hooks", "pre-commit")
+        write(repo, ".git/hooks/pre-commit", "#!/bin/sh\nexit 1\n")
+        os.chmod(hook, 0o755)
+        write(repo, f"data/blog/{DAY}-briefing.mdx")
+        write(repo, "public/static/images/2026/01-30-briefing/cover.webp")
+        write(repo, "notes.txt")
+        git(repo, "add", "notes.txt")
+
+        ok = publish.publish_to_github(["briefing"], [DAY], yes=True, cwd=repo)
+
+        files = remote_files(remote)
+        still_staged = staged(repo)
+
+    assert not ok
+    assert files == {"README.md"}
+    # 배포 대상은 스테이징에서 내려가고, 원래 스테이징돼 있던 파일은 그대로
+    assert still_staged == {"notes.txt"}
+
+
+def test_staged_rename_is_published():
+    with tempfile.TemporaryDirectory() as workdir:
+        repo, remote = make_repo(workdir)
+        old = "public/static/images/2026/01-30-briefing/a.webp"
+        write(repo, old)
+        git(repo, "add", old)
+        git(repo, "commit", "-q", "-m", "image")
+        git(repo, "mv", old, old.replace("a.webp", "b.webp"))
+
+        ok = publish.publish_to_github(["briefing"], [DAY], yes=True, cwd=repo)
+        files = remote_files(remote)
+
+    assert ok
+    assert old.replace("a.webp", "b.webp") in files and old not in files
+
+
+if __name__ == "__main__":
+    run_checks(globals())
@@ -0,0 +1,188 @@
+import time
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import scheduler
+from checks import run_checks
+
+# ==========================================
+# 호출 스케줄러 확인: 정해진 상태 코드를 차례로 돌려주는 로컬 HTTP 서버로 실행
+# ==========================================
+POLICY = {
+    "rate": 1e9,
+    "burst": 1e9,
+    "max_attempts": 4,
+    "base_delay": 1.0,
+    "max_delay": 20.0,
+    "deadline": 120.0,
+    "failure_threshold": 3,
+    "reset_timeout": 60.0,
+}
+
+
+class FakeClock:
+    """sleep()하면 시간이 그만큼 흐르는 가짜 시계 (백오프를 실제로 기다리지 않음)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeServer:
+    """요청마다 statuses의 다음 상태 코드로 응답 (다 쓰면 200)"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = 0
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                owner.requests += 1
+                status = owner.statuses.pop(0) if owner.statuses else 200
+                body = b"ok" if status == 200 else b"error"
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/search"
+
+    def __enter__(self):
+        threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def fetch(self):
+        with urllib.request.urlopen(self.url, timeout=5) as response:
+            return response.read().decode()
+
+
+def _scheduler(clock, **overrides):
+    policy = dict(POLICY, **overrides)
+    return scheduler.CallScheduler(
+        {"api": policy}, clock=clock, sleep=clock.sleep, rng=scheduler.random.Random(0)
+    )
+
+
+def test_retries_429_and_503_until_success():
+    clock = FakeClock()
+    calls = _scheduler(clock)
+    with FakeServer([429, 503]) as server:
+        assert calls.call("api", server.fetch) == "ok"
+    assert server.requests == 3
+    assert calls.stats["api"] == {"calls": 3, "retries": 2, "failures": 0}
+    # full jitter: 시도마다 0 ~ base * 2^n 범위에서 대기
+    assert len(clock.sleeps) == 2
+    assert 0 <= clock.sleeps[0] <= 1.0 and 0 <= clock.sleeps[1] <= 2.0
+
+
+def test_gives_up_after_max_attempts():
+    clock = FakeClock()
+    calls = _scheduler(clock, failure_threshold=10)
+    with FakeServer([503] * 10) as server:
+        try:
+            calls.call("api", server.fetch)
+        except urllib.error.HTTPError as e:
+            assert e.code == 503
+        else:
+            raise AssertionError("503이 계속되면 예외가 나야 함")
+    assert server.requests == POLICY["max_attempts"]
+    assert calls.stats["api"]["failures"] == 1
+
+
+def test_bad_request_is_not_retried():
+    clock = FakeClock()
+    calls = _scheduler(clock)
+    with FakeServer([400]) as server:
+        try:
+            calls.call("api", server.fetch)
+        except urllib.error.HTTPError as e:
+            assert e.code == 400
+    assert server.requests == 1
+    assert clock.sleeps == []
+    # 잘못된 요청은 공급자 장애가 아니므로 차단 판정에 넣지 않음
+    assert calls._breakers["api"].state == "closed"
+
+
+def test_numbers_in_message_are_not_status_codes():
+    assert scheduler.is_retryable(urllib.error.HTTPError("u", 429, "Too Many", {}, None))
+    assert not scheduler.is_retryable(ValueError("prompt has 4290 tokens"))
+    assert not scheduler.is_retryable(ValueError("invalid id 503"))
+    assert scheduler.is_retryable(TimeoutError())
+
+
+def test_circuit_opens_then_half_opens():
+    clock = FakeClock()
+    calls = _scheduler(clock, max_attempts=1, failure_threshold=3)
+    breaker = calls._components("api")[1]
+    with FakeServer([503] * 4) as server:
+        for _ in range(3):
+            try:
+                calls.call("api", server.fetch)
+            except urllib.error.HTTPError:
+                pass
+        assert breaker.state == "open"
+
+        # 차단 중에는 서버에 요청하지 않고 바로 거절
+        try:
+            calls.call("api", server.fetch)
+        except scheduler.CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("circuit open 상태에서 호출이 허용됨")
+        assert server.requests == 3
+
+        # reset_timeout 후 시험 호출 1건: 실패하면 다시 open
+        clock.now += POLICY["reset_timeout"]
+        assert breaker.state == "half-open"
+        try:
+            calls.call("api", server.fetch)
+        except urllib.error.HTTPError:
+            pass
+        assert breaker.state == "open"
+
+        # 다음 시험 호출이 성공하면 closed
+        clock.now += POLICY["reset_timeout"]
+        assert calls.call("api", server.fetch) == "ok"
+        assert breaker.state == "closed"
+    assert server.requests == 5
+
+
+def test_deadline_bounds_a_hung_attempt():
+    calls = scheduler.CallScheduler({"api": dict(POLICY, deadline=0.3)})
+    release = threading.Event()
+    started = time.perf_counter()
+    try:
+        calls.call("api", release.wait)
+    except scheduler.DeadlineExceededError:
+        pass
+    else:
+        raise AssertionError("응답 없는 호출이 제한 시간에 끊기지 않음")
+    finally:
+        release.set()
+    elapsed = time.perf_counter() - started
+    assert elapsed < 1.0, f"제한 시간을 지키지 않음: {elapsed:.2f}s"
+    assert calls.stats["api"] == {"calls": 1, "retries": 0, "failures": 1}
+
+
+if __name__ == "__main__":
+    run_checks(globals())
@@ -0,0 +1,141 @@
+import os
+import time
+import tempfile
+
+import clients
+import dedup_index
+import llm_cache
+import scheduler
+import streaming
+import structured_report
+import summarizer
+import daily_news_crawler
+from checks import run_checks
+
+# ==========================================
+# 스트리밍 생성 확인: 조각을 천천히 보내는 가짜 Gemini 모델로 실행
+# ==========================================
+REPORT = (
+    "```html\n<!DOCTYPE html>\n<html><head><style>p{}</style></head><body>\n"
+    "<h1>Briefing</h1>\n<p>First paragraph<sup>[1]</sup></p>\n<p>Second</p>\n"
+    "</body>\n</html>\n```"
+)
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    """generate_content(stream=True)에 size 글자씩, 조각마다 on_chunk(보낸 글자 수)를 호출"""
+
+    def __init__(self, text, size=7, delay=0.0, on_chunk=None):
+        self.text = text
+        self.size = size
+        self.delay = delay
+        self.on_chunk = on_chunk
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        if not stream:
+            return _Chunk(self.text)
+
+        def chunks():
+            for i in range(0, len(self.text), self.size):
+                time.sleep(self.delay)
+                yield _Chunk(self.text[i : i + self.size])
+                if self.on_chunk:
+                    self.on_chunk(i + self.size)
+
+        return chunks()
+
+
+def _isolate(workdir):
+    llm_cache.REFRESH = True
+    llm_cache.set_cache(llm_cache.LlmCache(os.path.join(workdir, "llm")))
+    dedup_index.INDEX_PATH = os.path.join(workdir, "dedup_index.json")
+    structured_report.STRUCTURED = False
+    summarizer.MAP_REDUCE = False
+    unlimited = {
+        name: dict(policy, rate=1e9, burst=1e9)
+        for name, policy in scheduler.PROVIDER_POLICIES.items()
+    }
+    scheduler.set_scheduler(scheduler.CallScheduler(unlimited))
+
+
+def test_cleaner_is_independent_of_chunk_boundaries():
+    expected = streaming.HtmlStreamCleaner().process(REPORT)
+    assert expected.startswith("<!DOCTYPE html>")
+    assert "```" not in expected and "</body>" not in expected
+
+    for size in range(1, 12):
+        cleaner = streaming.HtmlStreamCleaner()
+        out = "".join(cleaner.feed(REPORT[i : i + size]) for i in range(0, len(REPORT), size))
+        assert out + cleaner.close() == expected, f"조각 크기 {size}에서 결과가 다름"
+
+
+def test_cleaner_inserts_missing_doctype():
+    cleaner = streaming.HtmlStreamCleaner()
+    out = cleaner.feed("  <html><body>hi") + cleaner.close()
+    assert out.startswith("<!DOCTYPE html>\n<html>")
+
+
+def test_stream_generate_delivers_chunks_in_order():
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate(workdir)
+        received = []
+        model = FakeStreamingModel(REPORT, size=5)
+        text = streaming.stream_generate(model, "prompt", received.append)
+    assert text == REPORT
+    assert "".join(received) == REPORT
+    assert len(received) == -(-len(REPORT) // 5)
+
+
+def test_synthesize_writes_file_while_streaming():
+    with tempfile.TemporaryDirectory() as workdir:
+        _isolate(workdir)
+        html_path = os.path.join(workdir, "report.html")
+        sizes = []
+
+        def on_chunk(sent):
+            # 모델이 조각을 보내는 도중에 .part 파일이 이미 자라고 있어야 함
+            part = f"{html_path}.part"
+            sizes.append(os.path.getsize(part) if os.path.exists(part) else -1)
+
+        model = FakeStreamingModel(REPORT, size=16, delay=0.01, on_chunk=on_chunk)
+        collected = {
+            "date": "2026-01-30",
+            "full_context": "[Article ID: 1]\nTitle: t\n",
+            "sources": [
+                {
+                    "id": 1,
+                    "type": "news",
+                    "category": "c",
+                    "title": "Source",
+                    "url": "https://example.com/a",
+                    "published": None,
+                }
+            ],
+            "dedup_entries": [],
+        }
+        with clients.override(model=model):
+            html = daily_news_crawler.synthesize_report(collected, stream_to=html_path)
+
+        with open(html_path, encoding="utf-8") as f:
+            written = f.read()
+        leftover_part = os.path.exists(f"{html_path}.part")
+
+    assert model.calls == 1
+    assert not leftover_part
+    assert written == html
+    assert html.startswith("<!DOCTYPE html>") and html.endswith("</body></html>")
+    assert "Source" in html and "```" not in html
+    # 중간 시점에 파일 크기가 0보다 크고 계속 늘어남 (끝까지 기다렸다 한 번에 쓰지 않음)
+    progress = [size for size in sizes if size > 0]
+    assert len(progress) >= 3 and progress == sorted(progress) and progress[0] < progress[-1]
+
+
+if __name__ == "__main__":
+    run_checks(globals())
@@ -0,0 +1,37 @@
+import io
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+
+# ==========================================
+# 네트워크 없이 실행하는 동작 확인 스크립트(check_*.py)의 공용 실행기
+# ==========================================
+# 각 check_*.py는 test_로 시작하는 함수만 정의하고 마지막에 run_checks(globals())를 호출합니다.
+#   python check_scheduler.py          -> 전체 실행, 실패가 있으면 종료 코드 1
+#   python -m pytest check_*.py        -> pytest로도 그대로 수집/실행 가능
+
+
+def run_checks(namespace):
+    """namespace의 test_* 함수를 정의 순서대로 실행하고 결과를 출력합니다."""
+    tests = [
+        (name, fn) for name, fn in namespace.items() if name.startswith("test_") and callable(fn)
+    ]
+    failed = 0
+    for name, fn in tests:
+        output = io.StringIO()
+        started = time.perf_counter()
+        try:
+            # 파이프라인 진행 출력은 실패했을 때만 보여줌
+            with redirect_stdout(output):
+                fn()
+        except Exception:
+            failed += 1
+            print(f"❌ {name} ({time.perf_counter() - started:.2f}s)")
+            print(output.getvalue(), end="")
+            traceback.print_exc()
+            continue
+        print(f"✅ {name} ({time.perf_counter() - started:.2f}s)")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,126 @@
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+env_path = Path(__file__).parent / ".env"
+
+# 리포트 생성/블로그 에디팅에 쓰는 기본 모델
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# ==========================================
+# 2. 지연 생성 (Lazy & Memoized)
+# ==========================================
+# 무거운 SDK(google.generativeai, tavily)는 실제로 클라이언트가 필요할 때 처음 import 합니다.
+# 한 번 만든 클라이언트는 프로세스 안에서 재사용됩니다.
+_lock = threading.RLock()
+_instances = {}
+_overrides = {}
+_env_loaded = False
+
+
+def load_env():
+    """.env를 한 번만 읽습니다."""
+    global _env_loaded
+    with _lock:
+        if _env_loaded:
+            return
+        from dotenv import load_dotenv
+
+        load_dotenv(dotenv_path=env_path)
+        _env_loaded = True
+
+
+def require_key(name):
+    load_env()
+    value = os.getenv(name)
+    if not value:
+        print(f"📂 .env 탐색 경로: {env_path}")
+        raise ValueError(f"🚨 API 키 오류: .env 파일이 없거나 {name}가 비어있습니다.")
+    return value
+
+
+def _get(key, factory):
+    with _lock:
+        if key in _overrides:
+            return _overrides[key]
+        if key not in _instances:
+            _instances[key] = factory()
+        return _instances[key]
+
+
+def get_tavily():
+    """TavilyClient (첫 호출 시 생성)"""
+
+    def factory():
+        from tavily import TavilyClient
+
+        client = TavilyClient(api_key=require_key("TAVILY_API_KEY"))
+        print("✅ Tavily 클라이언트 준비 완료")
+        return client
+
+    return _get("tavily", factory)
+
+
+def _configure_genai():
+    def factory():
+        import google.generativeai as genai
+
+        genai.configure(api_key=require_key("GOOGLE_API_KEY"))
+        print("✅ Gemini 설정 완료")
+        return genai
+
+    return _get("genai", factory)
+
+
+def get_model(name=DEFAULT_MODEL):
+    """genai.GenerativeModel (모델 이름별로 첫 호출 시 생성)"""
+
+    def factory():
+        return _configure_genai().GenerativeModel(name)
+
+    return _get(f"model:{name}", factory)
+
+
+# ==========================================
+# 3. 가짜 클라이언트 주입 (테스트/드라이런용)
+# ==========================================
+def set_override(key, obj):
+    """
+    key: "tavily" 또는 "model:<모델 이름>"
+    obj가 None이면 해당 override를 제거합니다.
+    """
+    with _lock:
+        if obj is None:
+            _overrides.pop(key, None)
+        else:
+            _overrides[key] = obj
+
+
+@contextmanager
+def override(tavily=None, model=None, model_name=DEFAULT_MODEL):
+    """with override(tavily=stub, model=fake): ... 범위 안에서만 가짜 클라이언트 사용"""
+    keys = []
+    if tavily is not None:
+        set_override("tavily", tavily)
+        keys.append("tavily")
+    if model is not None:
+        set_override(f"model:{model_name}", model)
+        keys.append(f"model:{model_name}")
+    try:
+        yield
+    finally:
+        for key in keys:
+            set_override(key, None)
+
+
+def reset():
+    """생성된 클라이언트와 override를 모두 비웁니다."""
+    global _env_loaded
+    with _lock:
+        _instances.clear()
+        _overrides.clear()
+        _env_loaded = False
@@ -0,0 +1,243 @@
+import os
+import re
+
+from dedup_index import estimate_tokens
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 프롬프트에 넣을 [Source Data] 전체 토큰 예산
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "48000"))
+
+# 트랙 타입별 가중치: 예산을 나눌 때 이 비율로 배분 (plan["priority"]가 있으면 우선)
+TYPE_PRIORITY = {"news": 1.0, "context": 1.5}
+
+# 기사 1건이 가져갈 수 있는 최대 토큰 (기존 4000 / 20000 글자 상한에 해당)
+MAX_ARTICLE_TOKENS = {"news": 1000, "context": 5000}
+
+# 배정량이 이보다 적으면 기사를 잘라 넣지 않고 제외
+MIN_ARTICLE_TOKENS = 120
+
+SEPARATOR = "-" * 30 + "\n"
+
+# ==========================================
+# 2. 본문 정리 (Boilerplate 제거)
+# ==========================================
+_BOILERPLATE_RE = re.compile(
+    r"(cookie|subscribe|sign up|sign in|log in|newsletter|all rights reserved|"
+    r"advertisement|skip to (main )?content|share this|follow us|privacy policy|"
+    r"terms of (use|service)|read more:|related articles?|recommended for you|"
+    r"click here|accept all|manage preferences|download (the|our) app)",
+    re.IGNORECASE,
+)
+_LINK_ONLY_RE = re.compile(r"^(\W*\[[^\]]*\]\([^)]*\)\W*)+$")
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_SPACES_RE = re.compile(r"[ \t]+")
+
+
+def clean_content(text):
+    """
+    네비게이션, 쿠키 배너, 구독 유도 문구, 링크만 있는 줄, 반복 문단을 제거합니다.
+    짧은 줄에 보일러플레이트 키워드가 있을 때만 지우므로 본문 문장은 보존됩니다.
+    """
+    if not text:
+        return ""
+
+    lines = []
+    seen = set()
+    for raw_line in _IMAGE_RE.sub("", text).splitlines():
+        line = _SPACES_RE.sub(" ", raw_line).strip()
+        if not line:
+            continue
+        if _LINK_ONLY_RE.match(line):
+            continue
+        if len(line) < 160 and _BOILERPLATE_RE.search(line):
+            continue
+        # 메뉴처럼 '|'로 나열된 짧은 항목들
+        if line.count("|") >= 3 and len(line) / (line.count("|") + 1) < 25:
+            continue
+
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """토큰 예산에 맞게 자르되, 가능하면 문장/단어 경계에서 자릅니다."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary > max_chars * 0.8:
+        return cut[: boundary + 1]
+    space = cut.rfind(" ")
+    return cut[:space] if space > max_chars * 0.8 else cut
+
+
+# ==========================================
+# 3. 예산 배분 (Weighted max-min fair share)
+# ==========================================
+def _fair_share(budget, demands, weights=None):
+    """
+    demands를 넘지 않는 선에서 budget을 가중치 비율로 나눕니다.
+    수요가 작은 항목이 남긴 몫은 나머지 항목에 다시 배분됩니다.
+    """
+    weights = weights or [1.0] * len(demands)
+    alloc = [0] * len(demands)
+    active = [i for i, d in enumerate(demands) if d > 0]
+    remaining = budget
+
+    while active and remaining > 0:
+        total_weight = sum(weights[i] for i in active)
+        satisfied = [
+            i for i in active if demands[i] <= remaining * weights[i] / total_weight
+        ]
+        if not satisfied:
+            for i in active:
+                alloc[i] = int(remaining * weights[i] / total_weight)
+            break
+        for i in satisfied:
+            alloc[i] = demands[i]
+            remaining -= demands[i]
+        active = [i for i in active if i not in satisfied]
+
+    return alloc
+
+
+class _Item:
+    __slots__ = ("article_id", "header", "body", "tokens", "cap")
+
+    def __init__(self, article_id, header, body, cap):
+        self.article_id = article_id
+        self.header = header
+        self.body = body
+        self.tokens = estimate_tokens(body)
+        self.cap = cap
+
+
+class _Track:
+    __slots__ = ("category", "weight", "items", "raw_tokens", "cleaned_tokens")
+
+    def __init__(self, category, weight):
+        self.category = category
+        self.weight = weight
+        self.items = []
+        self.raw_tokens = 0
+        self.cleaned_tokens = 0
+
+
+class ContextBuilder:
+    """
+    트랙/기사 단위로 토큰 예산을 나눠 [Source Data] 블록을 조립합니다.
+
+    builder = ContextBuilder(budget)
+    builder.add_track(plan) -> builder.add_article(article)  # sources.Article (id 부여 후)
+    full_context, included_ids = builder.build()
+    """
+
+    def __init__(self, budget=CONTEXT_TOKEN_BUDGET):
+        self.budget = budget
+        self._tracks = []
+        self._by_category = {}
+        self.report = []
+
+    def add_track(self, plan):
+        if plan["category"] in self._by_category:
+            return
+        weight = plan.get("priority", TYPE_PRIORITY.get(plan["type"], 1.0))
+        track = _Track(plan["category"], weight)
+        self._tracks.append(track)
+        self._by_category[plan["category"]] = track
+
+    def add_article(self, article, content=None):
+        """content를 주면 (Map 요약본 등) 기사 원문 대신 그 내용으로 예산을 배분합니다."""
+        if article.category not in self._by_category:
+            self.add_track({"category": article.category, "type": article.track_type})
+        track = self._by_category[article.category]
+
+        body = clean_content(content or article.content)
+        track.raw_tokens += estimate_tokens(article.content)
+        track.cleaned_tokens += estimate_tokens(body)
+        if not body:
+            return
+
+        cap = MAX_ARTICLE_TOKENS.get(article.track_type, MAX_ARTICLE_TOKENS["news"])
+        track.items.append(_Item(article.id, article.prompt_header(), body, cap))
+
+    def _allocate_track(self, items, track_budget):
+        """트랙 안에서 기사별 배정량을 정하고, 최소치 미달 기사는 뒤에서부터 제외합니다."""
+        items = list(items)
+        while items:
+            overhead = [estimate_tokens(it.header + SEPARATOR) + 3 for it in items]
+            demands = [min(it.tokens, it.cap) for it in items]
+            body_budget = max(0, track_budget - sum(overhead))
+            alloc = _fair_share(body_budget, demands)
+            if all(a >= min(MIN_ARTICLE_TOKENS, d) for a, d in zip(alloc, demands)):
+                return list(zip(items, alloc))
+            items.pop()  # 랭킹 점수가 가장 낮은 기사부터 제외
+        return []
+
+    def build(self):
+        """예산 안에서 컨텍스트 문자열을 만들고 포함된 Article ID 집합과 함께 반환합니다."""
+        demands = [
+            sum(
+                min(it.tokens, it.cap) + estimate_tokens(it.header + SEPARATOR) + 3
+                for it in track.items
+            )
+            for track in self._tracks
+        ]
+        weights = [track.weight for track in self._tracks]
+        track_budgets = _fair_share(self.budget, demands, weights)
+
+        parts = []
+        included_ids = set()
+        self.report = []
+
+        for track, track_budget in zip(self._tracks, track_budgets):
+            used = 0
+            allocated = self._allocate_track(track.items, track_budget)
+            for item, tokens in allocated:
+                body = truncate_to_tokens(item.body, tokens)
+                parts.append(item.header)
+                parts.append("Content: ")
+                parts.append(body)
+                parts.append("\n")
+                parts.append(SEPARATOR)
+                used += estimate_tokens(item.header + body + SEPARATOR) + 3
+                included_ids.add(item.article_id)
+
+            self.report.append(
+                {
+                    "category": track.category,
+                    "articles": len(track.items),
+                    "included": len(allocated),
+                    "raw_tokens": track.raw_tokens,
+                    "cleaned_tokens": track.cleaned_tokens,
+                    "budget_tokens": track_budget,
+                    "used_tokens": used,
+                }
+            )
+
+        return "".join(parts), included_ids
+
+    def print_report(self):
+        print(f"📊 [Context] 토큰 예산 사용 내역 (Budget: {self.budget:,})")
+        print(
+            f"   {'Track':<45} {'Art':>7} {'Raw':>8} {'Clean':>8} {'Budget':>8} {'Used':>8}"
+        )
+        total_used = 0
+        for row in self.report:
+            total_used += row["used_tokens"]
+            print(
+                f"   {row['category'][:45]:<45} "
+                f"{row['included']:>3}/{row['articles']:<3} "
+                f"{row['raw_tokens']:>8,} {row['cleaned_tokens']:>8,} "
+                f"{row['budget_tokens']:>8,} {row['used_tokens']:>8,}"
+            )
+        print(f"   {'TOTAL':<45} {'':>7} {'':>8} {'':>8} {'':>8} {total_used:>8,}")
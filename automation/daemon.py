@@ -0,0 +1,490 @@
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import clients
+import delta_briefing
+import llm_cache
+import metrics
+import retrieval_index
+import run_automation
+import scheduler
+import search_cache
+from daily_news_crawler import search_sources
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 실행 일정 (cron 형식: 분 시 일 월 요일, 로컬 시각 기준)
+# - prefetch: 새벽 동안 2시간 간격으로 브리핑과 같은 검색을 미리 실행하여 검색 캐시를 채움
+#   (PREFETCH_MAX_AGE보다 오래된 속보 트랙만 다시 검색, 마지막 회차는 브리핑 30분 전)
+# - briefing: 아침 브리핑 생성 (마지막 prefetch가 채운 캐시에 적중하여 검색 API 호출 없음)
+# - update: 낮/저녁 업데이트 글 (아침 이후 새 속보만, delta_briefing)
+BRIEFING_SCHEDULE = os.getenv("DAEMON_BRIEFING_SCHEDULE", "30 6 * * *")
+PREFETCH_SCHEDULE = os.getenv("DAEMON_PREFETCH_SCHEDULE", "0 0-6/2 * * *")
+
+# prefetch 회차마다 이보다 오래 전에 받은 속보 트랙만 다시 검색 (초, 수집 간격보다 약간 짧게)
+# 브리핑은 평소 유효 기간(search_cache.TTL_BY_TYPE["news"])으로 조회하므로 마지막 회차 결과를 그대로 사용
+PREFETCH_MAX_AGE = int(os.getenv("DAEMON_PREFETCH_MAX_AGE_MINUTES", "100")) * 60
+UPDATE_SCHEDULE = os.getenv("DAEMON_UPDATE_SCHEDULE", "0 12,18 * * *")
+
+# 아침 브리핑 카테고리 (쉼표 구분)
+BRIEFING_CATEGORIES = [
+    c.strip() for c in os.getenv("DAEMON_CATEGORIES", "briefing").split(",") if c.strip()
+]
+
+# 상태 확인 HTTP 서버 (GET /health, GET /metrics, POST /run/<작업>)
+DAEMON_HOST = os.getenv("DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.getenv("DAEMON_PORT", "8787"))
+
+# 다음 작업까지 남은 시간이 길어도 이 간격(초)마다 깨어나 시계를 다시 확인
+MAX_IDLE_SECONDS = 60
+
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),  # 0 = 일요일 (7도 일요일로 인정)
+)
+
+
+# ==========================================
+# 2. cron 일정
+# ==========================================
+def _parse_field(text, low, high, name):
+    """'*', '*/15', '0-6', '1-5/2', '0,30' 형식의 필드를 허용 값 정렬 목록으로 바꿉니다."""
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"{name}: 간격은 1 이상이어야 합니다. ({text})")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if name == "weekday" and end == 7:
+            values.add(0)
+            if start == 7:
+                continue
+            end = 6
+        if not (low <= start <= end <= high):
+            raise ValueError(f"{name}: {low}~{high} 범위를 벗어났습니다. ({text})")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class CronSchedule:
+    """
+    5필드 cron 식 (분 시 일 월 요일). 이름(MON, JAN 등)과 @daily 같은 별칭은 지원하지 않습니다.
+    일/요일이 둘 다 지정되면 cron과 같이 둘 중 하나만 맞아도 실행합니다.
+    """
+
+    def __init__(self, expr):
+        fields = expr.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"cron 식은 5개 필드여야 합니다: {expr!r}")
+        self.expr = expr
+        try:
+            self.minutes, self.hours, self.days, self.months, self.weekdays = (
+                _parse_field(text, low, high, name)
+                for text, (name, low, high) in zip(fields, CRON_FIELDS)
+            )
+        except ValueError as e:
+            raise ValueError(f"잘못된 cron 식 {expr!r}: {e}") from None
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """moment 이후(같은 분 제외) 첫 실행 시각 (초/마이크로초는 0)"""
+        start = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        midnight = start.replace(hour=0, minute=0)
+        # 2월 29일 같은 일정도 찾을 수 있도록 4년 + 하루까지 확인
+        for offset in range(4 * 366 + 1):
+            day = midnight + datetime.timedelta(days=offset)
+            if not self._day_matches(day):
+                continue
+            for hour in self.hours:
+                for minute in self.minutes:
+                    at = day.replace(hour=hour, minute=minute)
+                    if at >= start:
+                        return at
+        raise ValueError(f"실행 시각이 없는 cron 식입니다: {self.expr!r}")
+
+    def __repr__(self):
+        return f"<CronSchedule {self.expr!r}>"
+
+
+# ==========================================
+# 3. 작업 & 데몬
+# ==========================================
+class Job:
+    """일정 하나와 실행 함수, 최근 실행 결과 (메모리에만 보관)"""
+
+    def __init__(self, name, schedule, fn):
+        self.name = name
+        self.schedule = schedule if isinstance(schedule, CronSchedule) else CronSchedule(schedule)
+        self.fn = fn
+        self.next_run = None
+        self.last_run = None
+        self.last_status = None  # "ok" | "failed"
+        self.last_seconds = None
+        self.last_error = None
+        self.runs = 0
+        self.failures = 0
+
+    def to_dict(self):
+        return {
+            "schedule": self.schedule.expr,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_status": self.last_status,
+            "last_seconds": round(self.last_seconds, 3) if self.last_seconds is not None else None,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
+
+
+class Daemon:
+    """
+    cron 일정에 맞춰 작업을 한 번에 하나씩 실행하는 상주 프로세스.
+    클라이언트/캐시 연결은 모듈 싱글턴으로 프로세스에 남아 다음 실행에서 그대로 재사용됩니다.
+
+    clock(현재 시각 datetime)과 sleep(초)을 주입할 수 있어, 가짜 시계로 일정을 확인할 수 있습니다.
+    (scheduler.CallScheduler와 같은 방식)
+    """
+
+    def __init__(self, jobs, clock=datetime.datetime.now, sleep=None):
+        self.jobs = {job.name: job for job in jobs}
+        self._clock = clock
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._sleep = sleep or self._wait
+        self._lock = threading.Lock()
+        self._pending = []  # POST /run/<작업>으로 들어온 즉시 실행 요청
+        self.started_at = None
+        self.running = None
+
+    def _wait(self, seconds):
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def start(self):
+        """시작 시각을 기록하고 모든 작업의 다음 실행 시각을 계산합니다."""
+        self.started_at = self._clock()
+        for job in self.jobs.values():
+            job.next_run = job.schedule.next_after(self.started_at)
+
+    def trigger(self, name):
+        """작업을 다음 tick에서 바로 실행하도록 예약합니다. (없는 작업이면 KeyError)"""
+        if name not in self.jobs:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._pending:
+                self._pending.append(name)
+        self._wake.set()
+
+    def run_job(self, job):
+        job.last_run = self._clock()
+        self.running = job.name
+        started = time.perf_counter()
+        print(f"\n⏰ [Daemon] {job.name} 시작 ({job.last_run:%Y-%m-%d %H:%M})")
+
+        metrics.start_run(f"daemon-{job.name}")
+        try:
+            result = job.fn()
+            ok = result is not None and result is not False
+            job.last_error = None if ok else "결과 없음"
+        except Exception as e:
+            ok = False
+            job.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ [Daemon] {job.name} 실패: {job.last_error}")
+
+        job.last_seconds = time.perf_counter() - started
+        job.last_status = "ok" if ok else "failed"
+        job.runs += 1
+        job.failures += 0 if ok else 1
+        self.running = None
+        print(f"{'✅' if ok else '⚠️'} [Daemon] {job.name} 종료 ({job.last_seconds:.1f}s)")
+        return ok
+
+    def tick(self):
+        """
+        예약된 요청과 시각이 된 작업을 실행하고, 다음에 깨어날 때까지 기다릴 초를 반환합니다.
+        작업이 길어져 지나간 실행 시각은 몰아서 실행하지 않고 건너뜁니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for name in pending:
+            self.run_job(self.jobs[name])
+
+        for job in sorted(self.jobs.values(), key=lambda job: job.next_run):
+            if job.next_run <= self._clock():
+                self.run_job(job)
+                job.next_run = job.schedule.next_after(self._clock())
+
+        next_due = min(job.next_run for job in self.jobs.values())
+        remaining = (next_due - self._clock()).total_seconds()
+        return max(0.0, min(MAX_IDLE_SECONDS, remaining))
+
+    def run_forever(self):
+        self.start()
+        for job in self.jobs.values():
+            print(f"   🗓️ {job.name:<10} '{job.schedule.expr}' -> 다음 실행 {job.next_run:%Y-%m-%d %H:%M}")
+        while not self._stop.is_set():
+            self._sleep(self.tick())
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    # ---------- 상태 ----------
+    def status(self):
+        now = self._clock()
+        failed = any(job.last_status == "failed" for job in self.jobs.values())
+        return {
+            "status": "degraded" if failed else "ok",
+            "now": now.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "uptime_seconds": round((now - self.started_at).total_seconds(), 1)
+            if self.started_at
+            else 0,
+            "running": self.running,
+            "jobs": {name: job.to_dict() for name, job in self.jobs.items()},
+            "providers": scheduler.get_scheduler().stats,
+        }
+
+    def metrics_text(self):
+        """Prometheus 텍스트 형식 (작업 횟수/시간, 공급자 호출 수, 마지막 실행의 span 합계)"""
+        status = self.status()
+        lines = [f"oikonomos_uptime_seconds {status['uptime_seconds']}"]
+        for name, job in self.jobs.items():
+            label = f'{{job="{name}"}}'
+            lines.append(f"oikonomos_job_runs_total{label} {job.runs}")
+            lines.append(f"oikonomos_job_failures_total{label} {job.failures}")
+            if job.last_seconds is not None:
+                lines.append(f"oikonomos_job_last_seconds{label} {job.last_seconds:.3f}")
+                lines.append(f"oikonomos_job_last_success{label} {int(job.last_status == 'ok')}")
+            if job.next_run:
+                lines.append(f"oikonomos_job_next_run_timestamp{label} {job.next_run.timestamp():.0f}")
+        for provider, stats in status["providers"].items():
+            for key, value in stats.items():
+                lines.append(f'oikonomos_provider_{key}_total{{provider="{provider}"}} {value}')
+        for span, row in metrics.summarize().items():
+            label = f'{{span="{span}"}}'
+            lines.append(f"oikonomos_last_run_span_seconds{label} {row['seconds']:.4f}")
+            lines.append(f"oikonomos_last_run_span_count{label} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# ==========================================
+# 4. 상태 확인 HTTP 서버
+# ==========================================
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self, code, body, content_type="application/json; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        owner = self.server.owner
+        if self.path == "/health":
+            # 최근 실행이 실패한 작업이 있으면 503 (모니터링이 상태 코드만 봐도 감지하도록)
+            status = owner.status()
+            code = 200 if status["status"] == "ok" else 503
+            self._reply(code, json.dumps(status, ensure_ascii=False))
+        elif self.path == "/metrics":
+            self._reply(200, owner.metrics_text(), "text/plain; version=0.0.4")
+        else:
+            self._reply(404, json.dumps({"error": "not found"}))
+
+    def do_POST(self):
+        name = self.path[len("/run/"):] if self.path.startswith("/run/") else None
+        try:
+            self.server.owner.trigger(name)
+        except KeyError:
+            self._reply(404, json.dumps({"error": f"unknown job: {name}"}))
+            return
+        self._reply(202, json.dumps({"queued": name}))
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 콘솔에 찍지 않음
+
+
+def serve(daemon, host=DAEMON_HOST, port=DAEMON_PORT):
+    """백그라운드 스레드에서 상태 확인 서버를 띄우고 서버 객체를 반환합니다."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.owner = daemon
+    threading.Thread(target=server.serve_forever, name="daemon-http", daemon=True).start()
+    print(f"🩺 [Daemon] 상태 확인: http://{host}:{server.server_port}/health")
+    return server
+
+
+# ==========================================
+# 5. 작업 정의
+# ==========================================
+def warm_up():
+    """API 클라이언트와 캐시/색인 연결을 미리 만들어 첫 실행에서 초기화 시간을 없앱니다."""
+    started = time.perf_counter()
+    clients.get_tavily()
+    clients.get_model()
+    clients.get_model(run_automation.EDITOR_MODEL_NAME)
+    search_cache.get_cache()
+    llm_cache.get_cache()
+    retrieval_index.get_index()
+    scheduler.get_scheduler()
+    print(f"🔥 [Daemon] 클라이언트/캐시 준비 완료 ({time.perf_counter() - started:.1f}s)")
+
+
+def prefetch_news(today=None, max_age=None):
+    """
+    아침 브리핑과 같은 검색(search_sources)을 미리 실행하여 검색 캐시와 로컬 색인을 채웁니다.
+    속보(News) 트랙은 받은 지 max_age(기본값: PREFETCH_MAX_AGE)초가 지난 것만 다시 검색하고,
+    Context 트랙은 로컬 색인 조회와 (부족할 때) 평소 유효 기간의 캐시를 그대로 씁니다.
+    브리핑은 같은 검색 조건으로 조회하므로 마지막 회차가 채운 캐시에 적중합니다.
+    """
+    today = today or datetime.date.today()
+    max_age = PREFETCH_MAX_AGE if max_age is None else max_age
+    with metrics.span("daemon.prefetch") as s:
+        searched = search_sources(today, news_max_age=max_age)
+        news = [
+            items
+            for plan, items in zip(searched["plan"], searched["results"])
+            if plan["type"] == "news"
+        ]
+        fetched = sum(len(items) for items in news)
+        s.set(
+            tracks=len(news),
+            results=fetched,
+            failed_tracks=sum(1 for items in news if not items),
+        )
+    print(f"📡 [Prefetch] 속보 {len(news)}개 트랙, 기사 {fetched}건 캐시 준비")
+    return fetched or None
+
+
+def build_jobs(
+    categories=None, briefing_schedule=None, prefetch_schedule=None, update_schedule=None
+):
+    categories = categories or BRIEFING_CATEGORIES
+    return [
+        Job("prefetch", prefetch_schedule or PREFETCH_SCHEDULE, prefetch_news),
+        Job(
+            "briefing",
+            briefing_schedule or BRIEFING_SCHEDULE,
+            lambda: run_automation.save_to_blog(categories=categories) or None,
+        ),
+        # 새 기사가 없어 건너뛴 경우("")도 정상 종료로 기록
+        Job(
+            "update",
+            update_schedule or UPDATE_SCHEDULE,
+            lambda: delta_briefing.run_delta(categories[0]),
+        ),
+    ]
+
+
+# ==========================================
+# 6. 실행부
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="예약 실행 데몬: 새벽 동안 뉴스 미리 수집 + 아침 브리핑 + 낮/저녁 업데이트"
+    )
+    parser.add_argument(
+        "categories",
+        nargs="*",
+        help=f"아침 브리핑 카테고리 (쉼표 구분 가능). 기본값: {','.join(BRIEFING_CATEGORIES)}",
+    )
+    parser.add_argument("--schedule", default=BRIEFING_SCHEDULE, help="아침 브리핑 cron 식")
+    parser.add_argument("--prefetch-schedule", default=PREFETCH_SCHEDULE, help="미리 수집 cron 식")
+    parser.add_argument("--update-schedule", default=UPDATE_SCHEDULE, help="낮/저녁 업데이트 cron 식")
+    parser.add_argument("--host", default=DAEMON_HOST, help="상태 확인 서버 주소")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help="상태 확인 서버 포트")
+    parser.add_argument("--no-http", action="store_true", help="상태 확인 서버를 띄우지 않음")
+    parser.add_argument("--run-now", action="store_true", help="시작하자마자 아침 브리핑을 한 번 실행")
+    parser.add_argument(
+        "--once",
+        choices=("prefetch", "briefing", "update"),
+        help="지정한 작업만 한 번 실행하고 종료 (작업 스케줄러/cron 연동용)",
+    )
+    parser.add_argument(
+        "--next", type=int, metavar="N", help="일정별 다음 실행 시각 N개를 출력하고 종료"
+    )
+    args = parser.parse_args()
+
+    categories = [c.strip() for arg in args.categories for c in arg.split(",") if c.strip()]
+    try:
+        jobs = build_jobs(
+            categories, args.schedule, args.prefetch_schedule, args.update_schedule
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.next:
+        now = datetime.datetime.now()
+        for job in jobs:
+            moment = now
+            print(f"{job.name} ('{job.schedule.expr}')")
+            for _ in range(args.next):
+                moment = job.schedule.next_after(moment)
+                print(f"   {moment:%Y-%m-%d %a %H:%M}")
+        sys.exit(0)
+
+    if not os.path.exists(run_automation.BLOG_DIR):
+        print("❌ 블로그 폴더 누락")
+        sys.exit(1)
+
+    try:
+        warm_up()
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    daemon = Daemon(jobs)
+    if args.once:
+        daemon.start()
+        ok = daemon.run_job(daemon.jobs[args.once])
+        metrics.print_summary()
+        sys.exit(0 if ok else 1)
+
+    server = None if args.no_http else serve(daemon, args.host, args.port)
+    if args.run_now:
+        daemon.trigger("briefing")
+
+    print("🛰️ [Daemon] 예약 실행 대기 중... (Ctrl+C로 종료)")
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 [Daemon] 종료합니다.")
+    finally:
+        daemon.stop()
+        if server:
+            server.shutdown()
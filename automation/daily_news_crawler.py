@@ -1,83 +1,199 @@
 import os
+import sys
+import time
 import datetime
-from pathlib import Path
-import google.generativeai as genai
-from tavily import TavilyClient
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import clients
+import search_cache
+import dedup_index
+import context_builder
+import streaming
+import scheduler
+import run_store
+import metrics
+import sources
+import ranking
+import summarizer
+import llm_cache
+import retrieval_index
+import structured_report
 
 # ==========================================
-# 1. 환경 설정 및 API 키 로드
+# 1. 설정
 # ==========================================
-env_path = Path(__file__).parent / ".env"
-load_dotenv(dotenv_path=env_path)
-
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-
-if not TAVILY_API_KEY or not GOOGLE_API_KEY:
-    print(f"📂 .env 탐색 경로: {env_path}")
-    raise ValueError("🚨 API 키 오류: .env 파일이 없거나 키가 비어있습니다.")
-else:
-    print("✅ API Key 로드 성공")
-
-# ==========================================
-# 2. 클라이언트 초기화
-# ==========================================
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel("gemini-2.5-flash")
+# API 키 로드와 Tavily/Gemini 클라이언트 생성은 clients 모듈에서 첫 사용 시점에 수행합니다.
+# (import만으로는 .env를 읽거나 무거운 SDK를 불러오지 않음)
+
+# 검색 대상 신뢰 도메인
+TRUSTED_DOMAINS = [
+    "bloomberg.com",
+    "reuters.com",
+    "wsj.com",
+    "ft.com",
+    "theblock.co",
+    "coindesk.com",
+    "cointelegraph.com",
+    "federalreserve.gov",
+    "sec.gov",
+    "whitehouse.gov",
+    "congress.gov",
+]
+
+# 병렬 검색 설정: 동시에 실행할 트랙 수 / 트랙당 제한 시간(초)
+SEARCH_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", "4"))
+SEARCH_TRACK_TIMEOUT = float(os.getenv("SEARCH_TRACK_TIMEOUT", "90"))
 
 
 # ==========================================
-# 3. 함수 정의
+# 2. 함수 정의
 # ==========================================
 
 
-def fetch_news_with_options(query, count, days):
+def fetch_news_with_options(
+    query, count, days, client=None, track_type=None, use_cache=True, end_date=None, max_age=None
+):
     """
     Tavily API를 사용하여 24시간 이내(day)의 최신 뉴스만 정밀 검색합니다.
+    client를 넘기면 (테스트용 스텁 등) 공용 Tavily 클라이언트 대신 사용합니다.
+    동일한 검색 조건의 결과가 디스크 캐시에 남아 있으면 API를 호출하지 않습니다.
+    end_date('YYYY-MM-DD')를 주면 지금 기준 대신 그 날짜까지 days일 기간을 검색합니다. (지난 날짜 초안용)
+    max_age(초)를 주면 저장된 지 그보다 오래된 캐시는 쓰지 않고 새로 검색합니다. (미리 수집용)
     """
+    track_type = track_type or ("news" if days <= 3 else "context")
+
+    # [측정] 검색 1건의 소요 시간, 결과 수, raw_content 크기, 실제 API 호출 수(재시도 포함)
+    with metrics.span("tavily.search", track=track_type, query=query[:80]) as s:
+        results = _search(
+            query, count, days, client, track_type, use_cache, end_date, max_age
+        )
+        raw = "".join(r.get("raw_content") or "" for r in results)
+        raw_bytes, raw_tokens = metrics.text_size(raw)
+        s.set(results=len(results), bytes=raw_bytes, tokens=raw_tokens)
+        s.set(cost_usd=s.attrs.get("api_calls", 0) * metrics.TAVILY_COST_PER_SEARCH)
+    return results
+
+
+def _search(query, count, days, client, track_type, use_cache, end_date=None, max_age=None):
+
+    search_topic = "news" if days <= 3 else "general"
+    time_filter = "day" if days <= 1 else "year"
+
+    # 지난 날짜: 상대 기간(time_range) 대신 그 날짜로 끝나는 절대 기간으로 검색
+    window = {"time_range": time_filter}
+    if end_date:
+        end = datetime.date.fromisoformat(end_date)
+        start = end - datetime.timedelta(days=max(1, days))
+        window = {"start_date": start.isoformat(), "end_date": end.isoformat()}
+        time_filter = f"{window['start_date']}~{window['end_date']}"
+
+    # [캐시] 검색 파라미터 전체를 키로 사용 (track_type별 TTL 적용)
+    use_cache = use_cache and not search_cache.BYPASS
+    cache_key = search_cache.make_key(
+        query, count, days, search_topic, time_filter, TRUSTED_DOMAINS
+    )
+    if use_cache:
+        try:
+            cached = search_cache.get_cache().get(cache_key, track_type, max_age)
+        except Exception as e:
+            print(f"   ⚠️ 캐시 조회 실패 (무시하고 검색): {e}")
+            cached = None
+        if cached is not None:
+            print(f"   💾 Cache hit ({track_type}): {query[:60]}...")
+            metrics.annotate(cache="hit")
+            return cached
+
+    metrics.annotate(cache="miss")
+
     print(f"   🔍 Searching (Strict 24h for News): {query}...")
 
-    trusted_domains = [
-        "bloomberg.com",
-        "reuters.com",
-        "wsj.com",
-        "ft.com",
-        "theblock.co",
-        "coindesk.com",
-        "cointelegraph.com",
-        "federalreserve.gov",
-        "sec.gov",
-        "whitehouse.gov",
-        "congress.gov",
-    ]
+    # 캐시 적중 시에는 Tavily SDK를 불러오지 않도록 여기서 클라이언트를 가져옴
+    client = client or clients.get_tavily()
 
+    # [스케줄러] 토큰 버킷으로 호출 속도를 맞추고, 429/5xx/타임아웃은 백오프 후 재시도
     try:
-        search_topic = "news" if days <= 3 else "general"
-        time_filter = "day" if days <= 1 else "year"
-
-        response = tavily.search(
+        response = scheduler.get_scheduler().call(
+            "tavily",
+            client.search,
+            deadline=SEARCH_TRACK_TIMEOUT,
             query=query,
             search_depth="advanced",
             topic=search_topic,  # [수정] 뉴스 카테고리 명시
-            time_range=time_filter,  # [수정] 'day'로 설정 시 24시간 이내 데이터 우선
-            include_domains=trusted_domains,  # 해당 도메인에서 뉴스 탐색
+            include_domains=TRUSTED_DOMAINS,  # 해당 도메인에서 뉴스 탐색
             include_raw_content=True,
             max_results=count,
+            **window,  # [수정] time_range='day'면 24시간 이내 데이터 우선 (지난 날짜는 start/end_date)
         )
-        return response.get("results", [])
+        results = response.get("results", [])
     except Exception as e:
-        print(f"   ⚠️ Error searching {query}: {e}")
+        print(f"   ❌ 검색 최종 실패 ({type(e).__name__}), 트랙 제외: {query[:60]}... / {e}")
         return []
 
+    # 빈 결과는 저장하지 않음 (일시적 장애가 TTL 동안 고정되는 것을 방지)
+    # BYPASS 모드에서도 최신 결과로 캐시를 갱신합니다.
+    if results:
+        try:
+            search_cache.get_cache().put(cache_key, results, track_type)
+        except Exception as e:
+            print(f"   ⚠️ 캐시 저장 실패: {e}")
+    return results
 
-def get_morning_investment_briefing():
-    today = datetime.date.today()
-    today_str = today.strftime("%Y-%m-%d")
-    current_month_str = today.strftime("%B %Y")
 
-    print(f"--------\n[{today_str}] 🚀 맥킨지 스타일 Hybrid 브리핑 생성 시작...")
+def fetch_all_tracks(
+    search_plan, max_workers=None, timeout=None, client=None, use_cache=True, news_max_age=None
+):
+    """
+    search_plan의 모든 트랙을 스레드 풀에서 동시에 검색합니다.
+    결과는 완료 순서와 관계없이 search_plan 순서 그대로 반환되므로
+    Article ID 부여 순서가 항상 동일하게 유지됩니다.
+    제한 시간을 넘긴 트랙은 빈 리스트로 처리합니다.
+    use_cache=False면 캐시를 읽지 않고 새로 검색하여 캐시를 갱신합니다.
+    news_max_age(초)를 주면 속보(News) 트랙은 저장된 지 그 이내인 캐시만 사용합니다. (야간 미리 수집용)
+    """
+    max_workers = max_workers or SEARCH_MAX_WORKERS
+    timeout = timeout or SEARCH_TRACK_TIMEOUT
+
+    started_at = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [
+            executor.submit(
+                fetch_news_with_options,
+                plan["query"],
+                plan["count"],
+                plan["days"],
+                client,
+                plan.get("type"),
+                use_cache,
+                plan.get("end_date"),
+                news_max_age if plan.get("type") == "news" else None,
+            )
+            for plan in search_plan
+        ]
+
+        results = []
+        for i, (plan, future) in enumerate(zip(search_plan, futures)):
+            # 풀은 제출 순서(FIFO)대로 실행하므로, i번째 트랙은 늦어도
+            # (i // max_workers)번째 배치에서 시작됩니다. 배치마다 timeout을 부여합니다.
+            deadline = started_at + timeout * (i // max_workers + 1)
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                print(
+                    f"   ⏱️ Timeout ({timeout:.0f}s): {plan['category']} 트랙을 건너뜁니다."
+                )
+                future.cancel()
+                results.append([])
+        return results
+    finally:
+        # 타임아웃된 스레드가 끝나기를 기다리지 않습니다.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_search_plan(today):
+    """오늘 날짜 기준 검색 계획(트랙 목록)을 만듭니다."""
+    current_month_str = today.strftime("%B %Y")
 
     # [투 트랙 전략: News(1일) vs Context(360일)]
     search_plan = [
@@ -136,68 +252,250 @@ def get_morning_investment_briefing():
         },
     ]
 
-    full_context = ""
-    source_verification_list = []
-    article_idx = 1
+    # 지난 날짜로 실행하면 '지금부터 24시간'이 아니라 그 날짜까지의 기간을 검색
+    if today < datetime.date.today():
+        for plan in search_plan:
+            plan["end_date"] = today.isoformat()
 
-    current_year = str(today.year)
+    return search_plan
 
-    for plan in search_plan:
-        print(
-            f"Step 1-{article_idx//6 + 1}. {plan['category']} 수집 중... (Type: {plan['type']})"
+
+def search_sources(today=None, client=None, news_max_age=None):
+    """
+    [Stage 1-1: Search] 모든 트랙을 병렬 검색하여 원본 결과를 그대로 반환합니다.
+    Context 트랙은 로컬 색인(retrieval_index)에서 먼저 찾고, 부족할 때만 실시간 검색합니다.
+    news_max_age(초): 속보 트랙 캐시를 이 시간 이내 것만 사용 (daemon 미리 수집용)
+    반환값(plan + 트랙별 results)은 JSON으로 저장 가능한 dict입니다.
+    """
+    today = today or datetime.date.today()
+    search_plan = build_search_plan(today)
+
+    # [로컬 색인] Context 트랙은 속보 헤드라인으로 지난 크롤링 색인을 먼저 조회하고,
+    # 비슷한 문서가 부족한 트랙만 실시간 검색 (LOCAL_CONTEXT=0이면 모든 트랙 실시간 검색)
+    local = retrieval_index.LOCAL_CONTEXT
+    live = [
+        i for i, plan in enumerate(search_plan) if not (local and plan["type"] == "context")
+    ]
+    track_results = [None] * len(search_plan)
+
+    # 실시간 검색 트랙을 동시에 검색 (결과 순서는 search_plan 순서로 고정)
+    print(f"Step 1. {len(live)}개 트랙 병렬 수집 중... (workers={SEARCH_MAX_WORKERS})")
+    fetched = fetch_all_tracks(
+        [search_plan[i] for i in live], client=client, news_max_age=news_max_age
+    )
+    for i, results in zip(live, fetched):
+        track_results[i] = results
+
+    if local:
+        headlines = [
+            result.get("title") or ""
+            for i in live
+            if search_plan[i]["type"] == "news"
+            for result in track_results[i]
+        ]
+        fallback = []
+        for i, plan in enumerate(search_plan):
+            if track_results[i] is not None:
+                continue
+            track_results[i] = retrieval_index.context_results(
+                plan, headlines, today, ranking.top_k(plan)
+            )
+            if track_results[i] is None:
+                fallback.append(i)
+        if fallback:
+            fetched = fetch_all_tracks([search_plan[i] for i in fallback], client=client)
+            for i, results in zip(fallback, fetched):
+                track_results[i] = results
+            live += fallback
+
+    # 이번에 실시간으로 수집한 기사는 다음 실행부터 로컬 색인 검색 대상이 됨
+    retrieval_index.record_crawl(
+        [search_plan[i] for i in live], [track_results[i] for i in live], today
+    )
+
+    return {
+        "date": today.strftime("%Y-%m-%d"),
+        "plan": search_plan,
+        "results": track_results,
+    }
+
+
+def assemble_context(searched):
+    """
+    [Stage 1-2: Context] 검색 결과를 필터링/중복 제거 후 프롬프트용 컨텍스트로 조립합니다.
+    반환값은 JSON으로 저장 가능한 dict입니다.
+    """
+    with metrics.span("context.assemble") as s:
+        collected = _assemble_context(searched)
+        context_bytes, context_tokens = metrics.text_size(collected["full_context"])
+        s.set(
+            articles=len(collected["sources"]),
+            bytes=context_bytes,
+            tokens=context_tokens,
         )
+    return collected
 
-        # 설정된 days 옵션에 따라 검색 수행
-        articles = fetch_news_with_options(plan["query"], plan["count"], plan["days"])
 
-        for article in articles:
-            content = article.get("raw_content", "")
-            pub_date = article.get("published_date", "")
-            title = article.get("title", "")
+def _assemble_context(searched):
+    today_str = searched["date"]
+    today = datetime.datetime.strptime(today_str, "%Y-%m-%d").date()
+    search_plan = searched["plan"]
+    track_results = searched["results"]
 
-            # [스마트 필터링]
-            # News 타입인데 날짜가 없거나 너무 옛날이면 과감히 삭제
-            if plan["type"] == "news":
-                if (
-                    pub_date and str(int(current_year) - 1) in pub_date
-                ):  # 작년 뉴스 필터링
-                    continue
+    # [Source Data]는 토큰 예산 안에서 트랙/기사별로 배분하여 조립
+    builder = context_builder.ContextBuilder()
+    kept_articles = []
+    article_idx = 1
 
-            # Context 타입은 날짜가 좀 지나도 OK, 단 너무 오래된(2년 전) 건 삭제
-            if plan["type"] == "context":
-                if pub_date and str(int(current_year) - 2) in pub_date:
-                    continue
+    # [중복 제거] 이번 실행 내부 색인 + 지난 브리핑에서 이미 사용한 기사 색인
+    run_index = dedup_index.DedupIndex()
+    history_index = dedup_index.load_history(today=today)
+    dedup_stats = dedup_index.DedupStats()
+    rank_stats = ranking.RankStats()
+    now = ranking.reference_time(today)
 
-            if not content:
+    for track_no, (plan, results) in enumerate(zip(search_plan, track_results), 1):
+        print(
+            f"Step 1-{track_no}. {plan['category']} 정리 중... (Type: {plan['type']}, {len(results)}건)"
+        )
+
+        builder.add_track(plan)
+
+        # [랭킹] 발행일 기준 허용 기간을 넘긴 기사와 발행일 없는 속보를 제외하고
+        # 최신성 + 도메인 신뢰도 + Tavily 관련도 점수 순으로 정렬 -> 중복이 아닌 상위 K개만 사용
+        # (News: 검색 기간 + 여유 며칠, Context: 2년)
+        candidates = [sources.Article.from_result(result, plan) for result in results]
+        ranked = ranking.rank_track(candidates, plan, now, TRUSTED_DOMAINS, rank_stats)
+        limit_k = ranking.top_k(plan)
+        selected = 0
+
+        for article, _ in ranked:
+            if selected >= limit_k:
+                break
+            if not article.content:
                 continue
 
-            # Context 자료는 본문을 좀 더 길게 가져와서 깊이를 더함
+            # 중복 판정/절약량 계산용 (실제 잘라내기는 ContextBuilder가 예산에 맞춰 수행)
             limit = 20000 if plan["type"] == "context" else 4000
-            truncated_content = content[:limit]
-
-            # AI에게 줄 데이터에 [TYPE] 태그를 붙여서 구분시킴
-            full_context += f"\n[Article ID: {article_idx} | Type: {plan['type'].upper()} | Category: {plan['category']}]\n"
-            full_context += f"Title: {title}\n"
-            full_context += f"Date: {pub_date}\n"
-            full_context += f"Content: {truncated_content}\n"
-            full_context += "-" * 30 + "\n"
-
-            # 출처 리스트 (Context 자료는 별도 표기)
-            # Context 자료는 (Report/Context)라고 명시하여 사용자가 구분하게 함
-            label = "📄 REPORT" if plan["type"] == "context" else "📰 NEWS"
-            style = (
-                "color:#005a9c; font-weight:bold;"
-                if plan["type"] == "context"
-                else "color:#666;"
-            )
 
-            source_verification_list.append(
-                f"<li style='margin-bottom: 5px;'><b>[{article_idx}]</b> <span style='font-size:0.8em; {style}'>[{label}]</span> <span style='color:#666; font-size:0.9em'>({pub_date})</span> <a href='{article['url']}' target='_blank' style='color:#051c2c; text-decoration:none; border-bottom:1px solid #ccc;'>{title}</a></li>"
-            )
+            # [중복 제거] 같은 기사(정규화 URL) 또는 거의 같은 본문(SimHash)은 한 번만 전달
+            # 지난 브리핑과의 비교는 속보(news)에만 적용 (배경 리포트는 매일 재사용)
+            canonical_url = dedup_index.canonicalize_url(article.url)
+            fingerprint = dedup_index.simhash(article.content)
+            reason = run_index.match(canonical_url, fingerprint)
+            if reason is None and plan["type"] == "news":
+                if history_index.match(
+                    canonical_url, fingerprint, before_date=today_str
+                ):
+                    reason = "history"
+            if reason:
+                dedup_stats.record(reason, article.content[:limit])
+                continue
+            run_index.add(canonical_url, fingerprint, today_str)
+
+            # AI에게 줄 데이터에 [TYPE] 태그를 붙여서 구분시킴 (출처 목록은 마지막에 렌더링)
+            article.id = article_idx
+            kept_articles.append(article)
             article_idx += 1
+            selected += 1
+
+        print(f"   🏅 상위 {selected}/{len(results)}건 선택 (최대 {limit_k}건)")
+
+    print(f"🗓️ [Rank] {rank_stats.summary()}")
+    print(f"🧹 [Dedup] {dedup_stats.summary()}")
+
+    # [Map-Reduce] 예산 배분 전에 기사 원문 전체를 요약하고, 예산은 요약본 기준으로 배분
+    # (잘린 본문을 요약하지 않으며, 요약이 짧은 만큼 더 많은 기사가 프롬프트에 들어감)
+    summaries = summarizer.summarize_articles(kept_articles) if summarizer.MAP_REDUCE else {}
+    for article in kept_articles:
+        builder.add_article(article, summaries.get(article.id))
+
+    full_context, included_ids = builder.build()
+    builder.print_report()
+
+    # 예산 부족으로 프롬프트에서 빠진 기사는 출처 목록에서도 제외 (본문은 더 이상 보관하지 않음)
+    used_sources = [a.to_dict() for a in kept_articles if a.id in included_ids]
+
+    return {
+        "date": today_str,
+        "full_context": full_context,
+        "sources": used_sources,
+        # 중복 제거 이력에는 실제로 프롬프트에 들어간 기사만 기록 (예산 부족으로 빠진 기사는 다음에 다시 후보)
+        # run_index 항목은 kept_articles와 같은 순서로 추가됨
+        "dedup_entries": [
+            entry
+            for entry, article in zip(run_index.export(), kept_articles)
+            if article.id in included_ids
+        ],
+    }
+
+
+def collect_briefing_sources(today=None, client=None, store=None):
+    """
+    [Stage 1: Collect] search -> context 두 단계를 실행합니다.
+    store(run_store.RunStore)를 주면 각 단계 산출물을 실행 디렉터리에 저장하고,
+    입력이 바뀌지 않은 단계는 저장된 결과를 재사용합니다. (--no-cache 시 검색은 항상 새로)
+    """
+    today = today or datetime.date.today()
+    today_str = today.strftime("%Y-%m-%d")
+
+    print(f"--------\n[{today_str}] 🚀 맥킨지 스타일 Hybrid 브리핑 생성 시작...")
+
+    if store is None:
+        return assemble_context(search_sources(today, client))
+
+    search_inputs = {
+        "date": today_str,
+        "plan": build_search_plan(today),
+        "domains": TRUSTED_DOMAINS,
+        "local_context": retrieval_index.LOCAL_CONTEXT,
+    }
+    if search_cache.BYPASS:
+        search_inputs["bypass"] = time.time()  # 항상 새로 검색
+    # 실패(빈 결과) 트랙이 있으면 저장하지 않음 -> 다음 실행에서 다시 검색 (성공 트랙은 검색 캐시 적중)
+    searched, search_sha, _ = store.run(
+        "search",
+        "search.json",
+        search_inputs,
+        lambda: search_sources(today, client),
+        keep=lambda searched: all(searched["results"]),
+    )
+
+    # 중복 제거 이력은 '오늘 이전' 기록만 쓰므로 같은 날 재실행 시 결과가 바뀌지 않음
+    context_inputs = {
+        "search": search_sha,
+        "budget": context_builder.CONTEXT_TOKEN_BUDGET,
+        "map_reduce": summarizer.MAP_REDUCE and summarizer.MAP_MODEL_NAME,
+    }
+    collected, _, _ = store.run(
+        "context", "context.json", context_inputs, lambda: assemble_context(searched)
+    )
+    return collected
+
+
+def synthesize_report(collected, stream_to=None, structured=None):
+    """
+    [Stage 2: Synthesize] 수집 결과로 McKinsey 스타일 HTML 리포트를 생성합니다.
+    stream_to에 파일 경로를 주면 Gemini 응답을 스트리밍으로 받아 즉시 기록합니다.
+    (Map-Reduce 모드의 기사별 요약은 수집 단계에서 예산 배분 전에 이미 반영되어 있습니다)
+    structured=True(기본값: structured_report.STRUCTURED)이면 모델은 섹션 내용만 JSON으로 만들고
+    HTML은 로컬 템플릿으로 렌더링합니다. (실패 시 기존 HTML 생성으로 대체)
+    """
+    today_str = collected["date"]
+    full_context = collected["full_context"]
 
     print(f"Step 2. AI 분석 (News + Context 융합) 및 리포트 생성 중...")
 
+    # 출처 리스트 HTML (</body> 직전에 삽입)
+    source_html = sources.render_html_footer(sources.from_dicts(collected["sources"]))
+
+    if structured_report.STRUCTURED if structured is None else structured:
+        final_html = _synthesize_structured(collected, full_context, source_html, stream_to)
+        if final_html is not None:
+            _record_used(collected)
+            return final_html
+        print("   ↩️ [Structured] 기존 HTML 생성 방식으로 다시 시도합니다.")
+
     # [디자인 업그레이드: McKinsey Style HTML Template]
     prompt = f"""
     당신은 글로벌 최상위 컨설팅펌(McKinsey & Company)의 '수석 매크로 전략가'입니다.
@@ -297,40 +595,132 @@ def get_morning_investment_briefing():
     ```
     """
 
-    response = model.generate_content(prompt)
+    model = clients.get_model()
+
+    # HTML 정리: ```html 펜스 제거, <!DOCTYPE html> 보장, </body> 이후 제거
+    cleaner = streaming.HtmlStreamCleaner()
+
+    # [측정] 프롬프트/응답 크기, 토큰 수, 추정 비용, 생성 시간
+    with metrics.span("gemini.synthesize", stream=bool(stream_to)):
+        if stream_to:
+            # [스트리밍] 도착하는 조각을 즉시 파일에 기록 (완료 후 원자적으로 교체)
+            html_parts = []
+            part_path = f"{stream_to}.part"
+            try:
+                with open(part_path, "w", encoding="utf-8") as f:
+
+                    def on_text(text):
+                        cleaned = cleaner.feed(text)
+                        if cleaned:
+                            f.write(cleaned)
+                            f.flush()
+                            html_parts.append(cleaned)
+
+                    llm_cache.generate(
+                        clients.DEFAULT_MODEL,
+                        prompt,
+                        lambda: streaming.stream_generate(
+                            model, prompt, on_text, label="Synthesis"
+                        ),
+                        on_text=on_text,
+                    )
+                    tail = cleaner.close()
+                    f.write(tail + source_html)
+                    html_parts.extend((tail, source_html))
+                os.replace(part_path, stream_to)
+            except Exception:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+            final_html = "".join(html_parts)
+        else:
+
+            def produce():
+                response = scheduler.get_scheduler().call("gemini", model.generate_content, prompt)
+                metrics.record_generation(response, prompt, response.text)
+                return response.text
+
+            text = llm_cache.generate(clients.DEFAULT_MODEL, prompt, produce)
+            final_html = cleaner.process(text) + source_html
+
+    _record_used(collected)
+    return final_html
 
-    # HTML 정리 (가끔 마크다운 ```html 태그가 붙어 나올 경우 제거)
-    final_html = response.text.replace("```html", "").replace("```", "")
 
-    # 혹시 <!DOCTYPE html>이 빠져있으면 강제 삽입 (모바일 렌더링 위해 필수)
-    if "<!DOCTYPE html>" not in final_html:
-        final_html = "<!DOCTYPE html>\n" + final_html
+def _synthesize_structured(collected, full_context, source_html, stream_to=None):
+    """섹션 JSON 생성 -> 로컬 렌더링. 실패하면 None"""
+    today_str = collected["date"]
+    with metrics.span("gemini.synthesize", structured=True, stream=bool(stream_to)) as s:
+        sections = structured_report.generate_sections(today_str, full_context)
+        if sections is None:
+            s.set(fallback=True)
+            return None
+        valid_ids = {item["id"] for item in collected["sources"]}
+        try:
+            final_html = structured_report.render(sections, today_str, valid_ids) + source_html
+        except Exception as e:
+            print(f"   ⚠️ [Structured] 렌더링 실패 ({type(e).__name__}: {e})")
+            s.set(fallback=True)
+            return None
+        s.set(output_bytes=metrics.text_size(final_html)[0])
+
+    # 스트리밍 모드와 같은 파일에 기록 (렌더링이 끝난 뒤 원자적으로 교체)
+    if stream_to:
+        part_path = f"{stream_to}.part"
+        with open(part_path, "w", encoding="utf-8") as f:
+            f.write(final_html)
+        os.replace(part_path, stream_to)
+    return final_html
 
-    # 출처 리스트 HTML 추가
-    source_html = (
-        "<div class='footer'><h3>✅ Source Verification</h3>"
-        + "".join(source_verification_list)
-        + "</div></body></html>"
-    )
 
-    # </body> 태그 직전에 출처 삽입
-    if "</body>" in final_html:
-        final_html = (
-            final_html.replace("</body>", "").replace("</html>", "") + source_html
-        )
-    else:
-        final_html += source_html
+def _record_used(collected):
+    """리포트 생성에 성공한 경우에만 이번에 사용한 기사를 기록 (실패 후 재실행 시 누락 방지)"""
+    try:
+        dedup_index.record_used(collected["dedup_entries"])
+    except OSError as e:
+        print(f"⚠️ [Dedup] 색인 저장 실패: {e}")
 
-    return final_html
+
+def get_morning_investment_briefing(stream_to=None, store=None):
+    """
+    뉴스/컨텍스트를 수집하여 McKinsey 스타일 HTML 리포트를 생성합니다.
+    stream_to에 파일 경로를 주면 Gemini 응답을 스트리밍으로 받아 즉시 기록합니다.
+    store를 주면 수집 단계 산출물을 실행 디렉터리에 저장/재사용합니다.
+    """
+    collected = collect_briefing_sources(store=store)
+    return synthesize_report(collected, stream_to=stream_to)
 
 
 # ==========================================
-# 4. 실행부
+# 3. 실행부
 # ==========================================
 if __name__ == "__main__":
-    try:
-        final_report_html = get_morning_investment_briefing()
+    # --no-cache: 검색 캐시를 무시하고 새로 수집
+    if "--no-cache" in sys.argv:
+        search_cache.BYPASS = True
+
+    # --stream: Gemini 응답을 받는 즉시 HTML 파일에 기록
+    use_stream = "--stream" in sys.argv
+
+    # --map-reduce: 기사별 요약(병렬) 후 요약본으로 최종 리포트 생성
+    if "--map-reduce" in sys.argv:
+        summarizer.MAP_REDUCE = True
+
+    # --structured: 모델은 섹션 JSON만 생성하고 HTML은 로컬 템플릿으로 렌더링
+    if "--structured" in sys.argv:
+        structured_report.STRUCTURED = True
+
+    # --live-context: Context 트랙도 로컬 색인 대신 항상 실시간 검색
+    if "--live-context" in sys.argv:
+        retrieval_index.LOCAL_CONTEXT = False
 
+    # --refresh-llm: 저장된 Gemini 응답을 무시하고 새로 생성 (결과는 다시 저장)
+    if "--refresh-llm" in sys.argv:
+        llm_cache.REFRESH = True
+
+    metrics.start_run("briefing")
+
+    try:
         # 구글 드라이브 경로 (없으면 로컬 저장)
         save_folder = "G:/내 드라이브/News_Briefing"
         if not os.path.exists(save_folder):
@@ -339,11 +729,20 @@ def get_morning_investment_briefing():
 
         filename = f"{save_folder}/Briefing_{datetime.date.today()}.html"
 
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(final_report_html)
+        # 수집 결과를 실행 디렉터리에 남겨, 리포트 생성이 실패해도 재실행 시 검색을 반복하지 않음
+        store = run_store.RunStore(str(datetime.date.today()))
+
+        if use_stream:
+            get_morning_investment_briefing(stream_to=filename, store=store)
+        else:
+            final_report_html = get_morning_investment_briefing(store=store)
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(final_report_html)
 
         print(f"\n✅ [McKinsey Style] 리포트 생성 완료!")
         print(f"📄 파일 열기: {filename}")
 
     except Exception as e:
         print(f"❌ Error: {e}")
+
+    metrics.print_summary()
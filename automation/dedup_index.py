@@ -0,0 +1,250 @@
+import os
+import re
+import json
+import hashlib
+import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+INDEX_PATH = os.path.join(CACHE_DIR, "dedup_index.json")
+
+# 지난 브리핑 기록 보관 기간(일). 이보다 오래된 항목은 로드/저장 시 정리
+RETENTION_DAYS = 14
+
+# SimHash 유사도 기준: 64비트 중 다른 비트 수가 이 값 이하이면 같은 기사로 간주
+NEAR_DUP_DISTANCE = 3
+
+# 4개 밴드(16비트씩)로 나눠 색인 -> 거리 3 이하인 쌍은 최소 한 밴드가 반드시 일치(비둘기집 원리)
+_BANDS = 4
+_BAND_BITS = 64 // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+# 정규화 시 제거할 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "cmpid",
+    "taid",
+    "mod",
+    "guccounter",
+}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ==========================================
+# 2. 정규화 & 지문(Fingerprint)
+# ==========================================
+def canonicalize_url(url):
+    """
+    같은 기사를 가리키는 URL 변형(www/m., 추적 파라미터, #fragment, /amp, 끝 슬래시)을
+    하나의 형태로 맞춥니다.
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+            break
+
+    path = parts.path or "/"
+    if path.endswith("/amp"):
+        path = path[: -len("/amp")]
+    path = path.rstrip("/") or "/"
+
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    query.sort()
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def simhash(text, shingle_size=3):
+    """본문을 단어 3-gram(shingle)으로 나눠 64비트 SimHash를 계산합니다."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return 0
+
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[i : i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        ]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            if h >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 (영문 기준 4글자 ≈ 1토큰)."""
+    return (len(text) + 3) // 4
+
+
+def _bands(value):
+    return [(i, value >> (i * _BAND_BITS) & _BAND_MASK) for i in range(_BANDS)]
+
+
+# ==========================================
+# 3. 중복 색인
+# ==========================================
+class DedupIndex:
+    """
+    URL(정규화) 완전 일치 + SimHash 근사 중복을 O(1)에 가깝게 찾는 색인.
+    path가 None이면 메모리 전용(이번 실행 내부 중복 제거용)으로 동작합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = []  # [canonical_url, simhash, date]
+        self._by_url = {}
+        self._by_band = {}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for url, fingerprint, date in data.get("entries", []):
+                    self._insert(url, int(fingerprint, 16), date)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ [Dedup] 색인 파일을 읽지 못해 새로 시작합니다: {e}")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, url):
+        return url in self._by_url
+
+    def _insert(self, url, fingerprint, date):
+        idx = len(self._entries)
+        self._entries.append((url, fingerprint, date))
+        if url:
+            self._by_url[url] = idx
+        if fingerprint:
+            for band in _bands(fingerprint):
+                self._by_band.setdefault(band, []).append(idx)
+
+    def add(self, url, fingerprint, date):
+        self._insert(url, fingerprint, date)
+
+    def match(self, url, fingerprint, before_date=None):
+        """
+        중복이면 사유("url" / "near-dup"), 아니면 None.
+        before_date를 주면 그 날짜 이전에 기록된 항목만 비교합니다.
+        """
+
+        def eligible(idx):
+            return before_date is None or self._entries[idx][2] < before_date
+
+        idx = self._by_url.get(url)
+        if idx is not None and eligible(idx):
+            return "url"
+
+        if fingerprint:
+            checked = set()
+            for band in _bands(fingerprint):
+                for idx in self._by_band.get(band, ()):
+                    if idx in checked:
+                        continue
+                    checked.add(idx)
+                    other = self._entries[idx][1]
+                    if (
+                        eligible(idx)
+                        and bin(fingerprint ^ other).count("1") <= NEAR_DUP_DISTANCE
+                    ):
+                        return "near-dup"
+        return None
+
+    def export(self):
+        """JSON으로 저장 가능한 [url, simhash(hex), date] 목록을 반환합니다."""
+        return [
+            [url, format(fingerprint, "016x"), date]
+            for url, fingerprint, date in self._entries
+        ]
+
+    def prune(self, today=None, retention_days=RETENTION_DAYS):
+        """보관 기간이 지난 항목을 제거하고 색인을 다시 구성합니다."""
+        today = today or datetime.date.today()
+        cutoff = (today - datetime.timedelta(days=retention_days)).isoformat()
+
+        kept = [e for e in self._entries if e[2] >= cutoff]
+        removed = len(self._entries) - len(kept)
+        if removed:
+            self._entries, self._by_url, self._by_band = [], {}, {}
+            for url, fingerprint, date in kept:
+                self._insert(url, fingerprint, date)
+        return removed
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"entries": self.export()}, f, ensure_ascii=False, separators=(",", ":")
+            )
+        os.replace(tmp_path, self.path)
+
+
+class DedupStats:
+    """실행 1회 동안 제거한 중복 건수와 절약한 토큰 수를 집계합니다."""
+
+    def __init__(self):
+        self.counts = {"url": 0, "near-dup": 0, "history": 0}
+        self.tokens_saved = 0
+
+    def record(self, reason, text):
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+        self.tokens_saved += estimate_tokens(text)
+
+    def summary(self):
+        return (
+            f"URL 중복 {self.counts['url']}건, 유사 본문 {self.counts['near-dup']}건, "
+            f"이전 브리핑 {self.counts['history']}건 제거 (약 {self.tokens_saved:,} 토큰 절약)"
+        )
+
+
+def load_history(path=None, today=None):
+    """지난 브리핑에서 사용한 기사 색인을 불러오고 오래된 항목을 정리합니다."""
+    index = DedupIndex(path or INDEX_PATH)
+    index.prune(today)
+    return index
+
+
+def record_used(entries, path=None, today=None):
+    """이번 브리핑에 사용한 기사(export() 형식)를 지난 브리핑 색인에 추가하고 저장합니다."""
+    history = load_history(path, today)
+    for url, fingerprint, date in entries:
+        if url and url in history:
+            continue
+        history.add(url, int(fingerprint, 16), date)
+    history.save()
@@ -0,0 +1,349 @@
+import os
+import sys
+import json
+import argparse
+import datetime
+
+import clients
+import context_builder
+import dedup_index
+import html_compact
+import llm_cache
+import metrics
+import post_index
+import ranking
+import scheduler
+import search_cache
+import sources
+from daily_news_crawler import TRUSTED_DOMAINS, build_search_plan, fetch_all_tracks
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 오늘 마지막 실행이 본 기사와 발행한 리포트 요약 (automation/.cache/delta_state.json)
+STATE_PATH = os.path.join(search_cache.CACHE_DIR, "delta_state.json")
+STATE_VERSION = 1
+
+# 업데이트는 속보(News) 트랙만, 트랙당 적은 수로 검색 (캐시 없이 항상 새로)
+DELTA_RESULTS_PER_TRACK = int(os.getenv("DELTA_RESULTS_PER_TRACK", "8"))
+
+# 새 기사 [Source Data] 예산과 이전 리포트 요약 상한 (아침 실행 예산 48,000의 일부)
+DELTA_TOKEN_BUDGET = int(os.getenv("DELTA_TOKEN_BUDGET", "8000"))
+PRIOR_SUMMARY_TOKENS = int(os.getenv("PRIOR_SUMMARY_TOKENS", "600"))
+
+# 새 기사가 이보다 적으면 LLM을 호출하지 않고 종료
+MIN_NEW_ARTICLES = int(os.getenv("DELTA_MIN_NEW_ARTICLES", "2"))
+
+DELTA_MODEL_NAME = clients.DEFAULT_MODEL
+
+
+# ==========================================
+# 2. 실행 상태 (마지막 실행이 본 것)
+# ==========================================
+def load_state(path=None):
+    """저장된 상태 dict를 반환합니다. (없거나 읽을 수 없으면 None)"""
+    path = path or STATE_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ [Delta] 상태 파일을 읽지 못했습니다: {e}")
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(state, path=None):
+    path = path or STATE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def compact_summary(text, max_tokens=None):
+    """
+    리포트(HTML 또는 Markdown)에서 제목과 목록 항목만 남긴 짧은 요약.
+    티커/Executive Insight/핵심 요약이 목록이므로 이것만으로 '이미 다룬 내용'을 전달할 수 있습니다.
+    """
+    max_tokens = max_tokens or PRIOR_SUMMARY_TOKENS
+    markdown = html_compact.to_markdown(text) if "<" in text[:200] else text
+    lines = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        # 출처 목록부터는 버림 (HTML 리포트의 Source Verification / MDX의 참고 자료)
+        if stripped.startswith("#") and ("Source Verification" in stripped or "참고 자료" in stripped):
+            break
+        if stripped.startswith(("#", "- ", "* ")) or stripped[:2].rstrip(".").isdigit():
+            lines.append(stripped)
+    return context_builder.truncate_to_tokens("\n".join(lines), max_tokens)
+
+
+def record_briefing(collected, html_content, mdx_paths, path=None, now=None):
+    """
+    아침 브리핑이 끝난 뒤 호출: 사용한 기사(URL + SimHash)와 리포트 요약을 오늘의 상태로 저장합니다.
+    (날짜가 바뀌면 이전 상태를 덮어씀)
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    state = {
+        "version": STATE_VERSION,
+        "date": collected["date"],
+        "last_run_at": now.isoformat(),
+        "seen": collected.get("dedup_entries") or [],
+        "reports": [
+            {
+                "at": now.isoformat(),
+                "kind": "morning",
+                "summary": compact_summary(html_content),
+                "posts": [os.path.basename(p) for p in mdx_paths],
+            }
+        ],
+    }
+    save_state(state, path)
+    return state
+
+
+# ==========================================
+# 3. 새 기사만 고르기
+# ==========================================
+def _published_after(article, since):
+    """
+    since(UTC) 이후 발행된 기사인지.
+    발행일만 있고 시각이 없는(자정) 값은 같은 날짜면 새 기사로 봅니다. (URL/본문 중복 검사로 한 번 더 거름)
+    """
+    published = article.published
+    if published is None:
+        return False
+    if published.time() == datetime.time(0, 0):
+        return published.date() >= since.date()
+    return published > since
+
+
+def select_new_articles(plan, track_results, seen, since, now, budget=None):
+    """
+    지난 실행 이후의 기사 중 이미 본 기사(정규화 URL/유사 본문)를 뺀 뒤 트랙별 상위 K개로
+    [Source Data]를 조립합니다. (full_context, 포함된 Article 목록, 포함된 기사의 중복 제거 항목, 제외 수)
+    예산 부족으로 프롬프트에서 빠진 기사는 중복 제거 항목에 넣지 않습니다. (다음 업데이트/아침 브리핑의 후보로 남김)
+    """
+    builder = context_builder.ContextBuilder(budget or DELTA_TOKEN_BUDGET)
+    run_index = dedup_index.DedupIndex()
+    today_str = now.date().isoformat()
+    kept, old = [], 0
+    article_id = 1
+
+    for track, results in zip(plan, track_results):
+        builder.add_track(track)
+        candidates = [sources.Article.from_result(result, track) for result in results]
+        selected = 0
+        for article, _ in ranking.rank_track(candidates, track, now, TRUSTED_DOMAINS):
+            if selected >= ranking.top_k(track):
+                break
+            if not article.content:
+                continue
+            if not _published_after(article, since):
+                old += 1
+                continue
+            canonical_url = dedup_index.canonicalize_url(article.url)
+            fingerprint = dedup_index.simhash(article.content)
+            if seen.match(canonical_url, fingerprint) or run_index.match(canonical_url, fingerprint):
+                old += 1
+                continue
+            run_index.add(canonical_url, fingerprint, today_str)
+
+            article.id = article_id
+            builder.add_article(article)
+            kept.append(article)
+            article_id += 1
+            selected += 1
+
+    if not kept:
+        return "", [], [], old
+    full_context, included_ids = builder.build()
+    # run_index 항목은 kept와 같은 순서로 추가됨
+    used_entries = [
+        entry for entry, article in zip(run_index.export(), kept) if article.id in included_ids
+    ]
+    return full_context, [a for a in kept if a.id in included_ids], used_entries, old
+
+
+# ==========================================
+# 4. 업데이트 글 작성
+# ==========================================
+def _prompt(prior_summary, full_context, since_label):
+    return f"""
+    당신은 'Crypto Oikonomos' 블로그의 **수석 전문 에디터**입니다.
+    오늘 아침 브리핑(및 이전 업데이트)은 이미 발행되었습니다. 아래 [이전 리포트 요약]은 독자가 이미 읽은 내용입니다.
+    [새 기사]는 {since_label} 이후 새로 나온 속보입니다. 이것만으로 짧은 **업데이트 글**(Markdown)을 작성하십시오.
+
+    [작성 원칙]
+    1. **Delta Only:** 이전 리포트에 이미 있는 내용은 반복하지 말고, 새로 바뀐 점/추가된 사실만 다루십시오.
+       이전 내용과 이어지거나 뒤집히는 소식이면 "오늘 아침 브리핑에서 다룬 ~이" 처럼 연결하십시오.
+    2. **Structure:**
+       - **업데이트 요약 (2~3줄)**
+       - 주제별 짧은 소제목(##)과 문단. 중요도 순.
+       - **💡 투자자의 시선**: 1문단
+    3. **Citation:** 사실 문장 끝에 근거 기사 ID를 [1] 처럼 표기하십시오.
+    4. **Constraint:** [새 기사]에 없는 내용은 지어내지 마십시오. HTML 태그와 이모티콘(위 항목 제외)은 쓰지 마십시오.
+    5. 분량은 아침 브리핑의 1/3 이하로 간결하게.
+
+    [이전 리포트 요약]
+    {prior_summary}
+
+    [새 기사]
+    {full_context}
+    """
+
+
+def write_update_post(body, day, category, label, new_articles, blog_dir, morning):
+    """업데이트 MDX 저장. 아침 글이 있으면 맨 위에 링크를 겁니다."""
+    name = f"{day}-{category}-update-{label.replace(':', '')}.mdx"
+    mdx_path = os.path.join(blog_dir, name)
+
+    link = ""
+    if morning is not None:
+        slug = morning.file[: -len(".mdx")]
+        link = f"> 이 글은 [{morning.title or '오늘 아침 브리핑'}](/blog/{slug})의 업데이트입니다.\n\n"
+
+    frontmatter = f"""---
+title: '시장 브리핑 업데이트: {day} {label}'
+date: '{day}'
+tags: ['{category.capitalize()}', 'Update']
+draft: true
+summary: 오늘 아침 브리핑 이후 새로 나온 소식을 정리한 업데이트입니다.
+---
+
+"""
+    content = f"{frontmatter}{link}{body.strip()}\n".replace("$", "\\$")
+    content += sources.render_mdx_sources(new_articles).replace("$", "\\$")
+    with open(mdx_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return mdx_path
+
+
+def run_delta(category="briefing", blog_dir=None, state_path=None, now=None, client=None):
+    """
+    오늘 마지막 실행 이후의 새 속보만 모아 업데이트 글을 만듭니다.
+    반환값: 저장한 MDX 경로 / 새 기사가 부족해 건너뛰면 "" / 실패하면 None
+    """
+    blog_dir = blog_dir or post_index.BLOG_DIR
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    day = now.astimezone().date().isoformat()
+
+    state = load_state(state_path)
+    if state is None or state.get("date") != day:
+        print(f"❌ [Delta] 오늘({day}) 아침 브리핑 기록이 없습니다. run_automation.py를 먼저 실행하세요.")
+        return None
+
+    since = datetime.datetime.fromisoformat(state["last_run_at"])
+    since_label = since.astimezone().strftime("%H:%M")
+    print(f"🔁 [Delta] {since_label} 이후 새 속보만 수집합니다... (이전 실행 {len(state['reports'])}회)")
+
+    # 1. 속보 트랙만, 적은 수로, 캐시 없이 검색 (Tavily 최소 기간 'day' + 발행 시각으로 다시 거름)
+    plan = [
+        dict(track, count=min(track["count"], DELTA_RESULTS_PER_TRACK))
+        for track in build_search_plan(now.astimezone().date())
+        if track["type"] == "news"
+    ]
+    track_results = fetch_all_tracks(plan, client=client, use_cache=False)
+
+    # 2. 지난 실행이 본 기사 제외
+    seen = dedup_index.DedupIndex()
+    for url, fingerprint, date in state["seen"]:
+        seen.add(url, int(fingerprint, 16), date)
+    full_context, new_articles, used_entries, old = select_new_articles(
+        plan, track_results, seen, since, now
+    )
+    print(f"   🆕 새 기사 {len(new_articles)}건 (이미 본/이전 기사 {old}건 제외)")
+    if len(new_articles) < MIN_NEW_ARTICLES:
+        print(f"📭 [Delta] 새 기사가 {MIN_NEW_ARTICLES}건 미만이라 업데이트를 건너뜁니다.")
+        return ""
+
+    # 3. 새 기사 + 이전 리포트 요약만으로 1회 생성
+    prior_summary = "\n\n".join(
+        f"({report['kind']} {datetime.datetime.fromisoformat(report['at']).astimezone():%H:%M})\n{report['summary']}"
+        for report in state["reports"]
+    )
+    prior_summary = context_builder.truncate_to_tokens(
+        prior_summary, PRIOR_SUMMARY_TOKENS * len(state["reports"])
+    )
+    prompt = _prompt(prior_summary, full_context, since_label)
+
+    try:
+        with metrics.span(
+            "gemini.delta",
+            new_articles=len(new_articles),
+            context_tokens=dedup_index.estimate_tokens(full_context),
+            prior_tokens=dedup_index.estimate_tokens(prior_summary),
+        ):
+            model = clients.get_model(DELTA_MODEL_NAME)
+
+            def produce():
+                response = scheduler.get_scheduler().call("gemini", model.generate_content, prompt)
+                metrics.record_generation(response, prompt, response.text)
+                return response.text
+
+            body = llm_cache.generate(DELTA_MODEL_NAME, prompt, produce)
+    except Exception as e:
+        print(f"❌ [Delta] 업데이트 글 작성 중 오류 발생: {e}")
+        return None
+    if not body:
+        print("❌ [Delta] 업데이트 본문이 비어있습니다.")
+        return None
+
+    # 4. 저장 + 아침 글 링크 + 색인/상태 갱신
+    label = now.astimezone().strftime("%H:%M")
+    try:
+        index = post_index.load(blog_dir)
+        mdx_path = write_update_post(
+            body, day, category, label, new_articles, blog_dir, index.get(day, category)
+        )
+        index.update(mdx_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ [Delta] 업데이트 글 저장 실패: {e}")
+        return None
+
+    state["last_run_at"] = now.isoformat()
+    state["seen"].extend(used_entries)
+    state["reports"].append(
+        {
+            "at": now.isoformat(),
+            "kind": "update",
+            "summary": compact_summary(body),
+            "posts": [os.path.basename(mdx_path)],
+        }
+    )
+    try:
+        save_state(state, state_path)
+        # 다음 날 아침 브리핑에서 업데이트로 다룬 기사도 제외되도록 중복 제거 이력에 기록
+        dedup_index.record_used(used_entries)
+    except OSError as e:
+        print(f"⚠️ [Delta] 상태 저장 실패: {e}")
+
+    print(f"✅ [Delta] 업데이트 글 생성 완료: {mdx_path}")
+    return mdx_path
+
+
+# ==========================================
+# 5. 실행부
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="아침 브리핑 이후 새로 나온 속보만으로 업데이트 글 작성 (낮/저녁용)"
+    )
+    parser.add_argument("category", nargs="?", default="briefing", help="아침 글 카테고리 (기본값: briefing)")
+    parser.add_argument(
+        "--refresh-llm",
+        action="store_true",
+        help="저장된 Gemini 응답을 무시하고 새로 생성 (결과는 캐시에 다시 저장)",
+    )
+    args = parser.parse_args()
+
+    if args.refresh_llm:
+        llm_cache.REFRESH = True
+
+    metrics.start_run("delta")
+    result = run_delta(args.category)
+    metrics.print_summary()
+    sys.exit(1 if result is None else 0)
@@ -0,0 +1,162 @@
+import re
+from html.parser import HTMLParser
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 내용 없이 버리는 태그 (안쪽 텍스트 포함)
+SKIP_TAGS = {"head", "style", "script", "title", "noscript", "svg"}
+
+# 앞뒤로 줄바꿈을 넣는 블록 태그
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "main", "blockquote",
+    "ul", "ol", "table", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "li",
+}
+
+_SPACE_RE = re.compile(r"[ \t\r\n\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+# ==========================================
+# 2. 변환기 (HTML -> 간결한 Markdown, 한 번 훑기)
+# ==========================================
+class _Converter(HTMLParser):
+    """
+    리포트 HTML을 한 번만 훑으며 Markdown 조각을 모읍니다.
+    - <head>/<style>/<script>와 모든 속성(style/class 등)은 버림
+    - 제목/목록/강조/인용/표는 Markdown 문법으로, <br>은 줄바꿈으로
+    - <sup>[1]</sup> 출처 ID는 [1] 그대로 유지 (링크 주소는 토큰 절약을 위해 생략)
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self._skip = 0
+        self._lists = []  # 중첩 목록: ["ul" | "ol", 번호]
+        self._quote = 0
+        self._row = None  # 표의 현재 행 셀 목록
+        self._rows_done = 0
+        self._cell = None
+
+    # ---------- 출력 ----------
+    def _write(self, text):
+        if self._cell is not None:
+            self._cell.append(text)
+        else:
+            self.out.append(text)
+
+    def _newline(self, blank=False):
+        if self._cell is not None:
+            self._cell.append(" ")
+            return
+        prefix = "> " * self._quote
+        self.out.append("\n\n" + prefix if blank else "\n" + prefix)
+
+    # ---------- 태그 ----------
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+            return
+        if self._skip:
+            return
+
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._newline(blank=True)
+            self._write("#" * int(tag[1]) + " ")
+        elif tag in ("ul", "ol"):
+            self._lists.append([tag, 0])
+            self._newline()
+        elif tag == "li":
+            self._newline()
+            indent = "  " * (len(self._lists) - 1)
+            if self._lists and self._lists[-1][0] == "ol":
+                self._lists[-1][1] += 1
+                self._write(f"{indent}{self._lists[-1][1]}. ")
+            else:
+                self._write(f"{indent}- ")
+        elif tag == "blockquote":
+            self._quote += 1
+            self._newline(blank=True)
+        elif tag == "tr":
+            self._row = []
+        elif tag in ("td", "th"):
+            self._cell = []
+        elif tag == "br":
+            self._newline()
+        elif tag in ("strong", "b"):
+            self._write("**")
+        elif tag in ("em", "i"):
+            self._write("*")
+        elif tag in BLOCK_TAGS:
+            self._newline(blank=True)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in ("br",):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._skip:
+            return
+
+        if tag in ("ul", "ol"):
+            if self._lists:
+                self._lists.pop()
+            self._newline()
+        elif tag == "blockquote":
+            self._quote = max(0, self._quote - 1)
+            self._newline(blank=True)
+        elif tag == "li":
+            pass  # 다음 항목/목록 끝에서 줄바꿈 (항목 사이 빈 줄 없음)
+        elif tag in ("td", "th"):
+            if self._cell is not None and self._row is not None:
+                self._row.append(_SPACE_RE.sub(" ", "".join(self._cell)).strip())
+            self._cell = None
+        elif tag == "tr":
+            if self._row:
+                self.out.append("\n| " + " | ".join(self._row) + " |")
+                if self._rows_done == 0:
+                    self.out.append("\n|" + " --- |" * len(self._row))
+                self._rows_done += 1
+            self._row = None
+        elif tag == "table":
+            self._rows_done = 0
+            self._newline(blank=True)
+        elif tag in ("strong", "b"):
+            self._write("**")
+        elif tag in ("em", "i"):
+            self._write("*")
+        elif tag in BLOCK_TAGS:
+            self._newline(blank=True)
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        text = _SPACE_RE.sub(" ", data)
+        if text.strip():
+            self._write(text)
+        elif text and self.out and not self.out[-1].endswith((" ", "\n")):
+            self._write(" ")
+
+
+def to_markdown(html):
+    """리포트 HTML을 프롬프트용 간결한 Markdown으로 바꿉니다. (외부 라이브러리 없음)"""
+    converter = _Converter()
+    converter.feed(html or "")
+    converter.close()
+
+    lines = []
+    for line in "".join(converter.out).split("\n"):
+        line = line.rstrip()
+        stripped = line.lstrip()
+        # 내용 없는 강조 기호/인용 기호만 남은 줄 정리, 줄 앞 공백은 목록 들여쓰기만 유지
+        if stripped in ("**", "*", ">", "-"):
+            line = ""
+        elif not stripped.startswith(("- ", "> ")) and not stripped[:1].isdigit():
+            line = stripped
+        lines.append(line)
+    text = _BLANK_LINES_RE.sub("\n\n", "\n".join(lines))
+    return text.strip() + "\n"
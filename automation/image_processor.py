@@ -1,8 +1,15 @@
 import os
-import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image
 from datetime import datetime
 
+import metrics
+
 # ---------------------------------------------------------
 # [경로 설정 로직]
 # ---------------------------------------------------------
@@ -24,18 +31,237 @@ def get_desktop_path():
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PROJECT_IMG_ROOT = os.path.join(PROJECT_ROOT, "public", "static", "images")
 
+# 변환 기록(증분 처리용): 소스 mtime/크기/해시 -> 이미 변환된 파일은 건너뜀
+MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "image_manifest.json"
+)
+
+VALID_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# 반응형 이미지 설정: 소스 1회 디코딩으로 여러 폭의 WebP(+선택적으로 AVIF)를 생성
+DEFAULT_WIDTH = 1200  # 본문에서 쓰는 기본 파일({name}.webp)의 폭 (기존과 동일)
+RESPONSIVE_WIDTHS = (480, 800, 1200, 1600)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+# Next.js 쪽 srcset 구성용 매니페스트 (타겟 폴더에 생성)
+SRCSET_MANIFEST_NAME = "images.json"
+
+# ---------------------------------------------------------
+# [증분 처리: 변환 기록 Manifest]
+# ---------------------------------------------------------
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def needs_conversion(file_path, target_path, record, profile=None):
+    """
+    (변환 필요 여부, 계산한 sha1 또는 None)을 반환합니다.
+    mtime/크기가 기록과 같으면 해시 계산 없이 바로 건너뜁니다.
+    기록이 없거나 변환 설정(profile)이 다르면, 타깃이 소스보다 최신이어도 다시 변환합니다.
+    (어떤 설정으로 만들어졌는지 알 수 없는 타깃은 믿지 않음)
+    기본 파일뿐 아니라 기록된 반응형 변형(-{w}w.webp, .avif)이나 images.json이 하나라도 없으면
+    다시 변환합니다. (변형 목록이 없는 예전 기록도 다시 변환)
+    """
+    target_dir = os.path.dirname(target_path)
+    if not os.path.exists(target_path):
+        return True, None
+    if not os.path.exists(os.path.join(target_dir, SRCSET_MANIFEST_NAME)):
+        return True, None
+    if not record or record.get("profile") != profile:
+        return True, None
+    variants = record.get("variants")
+    if not isinstance(variants, list) or not all(
+        os.path.exists(os.path.join(target_dir, name)) for name in variants
+    ):
+        return True, None
+
+    stat = os.stat(file_path)
+    if record.get("mtime") == stat.st_mtime and record.get("size") == stat.st_size:
+        return False, None
+
+    # mtime만 바뀐 경우(복사/동기화 등) 내용 해시로 한 번 더 확인
+    digest = file_digest(file_path)
+    return digest != record.get("sha1"), digest
+
+
+# ---------------------------------------------------------
+# [단일 이미지 변환] (프로세스 풀에서 실행되므로 최상위 함수)
+# ---------------------------------------------------------
+def avif_supported():
+    """Pillow 내장(11.2+) 또는 pillow-avif-plugin으로 AVIF 저장이 가능한지 확인"""
+    try:
+        import pillow_avif  # noqa: F401  (설치되어 있으면 AVIF 플러그인 등록)
+    except ImportError:
+        pass
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def conversion_profile(widths=RESPONSIVE_WIDTHS, avif=False):
+    """변환 설정 요약 문자열 (설정이 바뀌면 증분 처리 기록을 무효화하는 데 사용)"""
+    return f"w={','.join(map(str, widths))};q={WEBP_QUALITY};avif={int(avif)}"
+
+
+def convert_image(file_path, target_path, widths=RESPONSIVE_WIDTHS, avif=False):
+    """
+    소스를 한 번만 디코딩하여 폭별 WebP 변형을 생성합니다.
+
+    - {name}.webp: 기본 폭(1200px) 이하로 줄인 파일 (기존 MDX 경로 호환)
+    - {name}-{w}w.webp (+ .avif): 반응형 변형. 원본보다 큰 폭은 만들지 않음
+    - JPEG는 draft()로 필요한 크기에 가깝게 축소 디코딩하여 CPU/메모리 절약
+
+    srcset 매니페스트에 넣을 정보(dict)를 반환합니다.
+    """
+    target_dir = os.path.dirname(target_path)
+    pure_name = os.path.splitext(os.path.basename(target_path))[0]
+
+    with Image.open(file_path) as img:
+        src_width, src_height = img.size
+        out_widths = sorted({min(w, src_width) for w in widths})
+        largest = out_widths[-1]
+        largest_height = max(1, round(src_height * largest / src_width))
+
+        # JPEG: 가장 큰 출력 크기 이상을 유지하는 선에서 1/2, 1/4, 1/8 축소 디코딩
+        if img.format == "JPEG":
+            img.draft("RGB", (largest, largest_height))
+
+        img.load()
+        base = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+    def resized(width):
+        height = max(1, round(src_height * width / src_width))
+        if base.width == width:
+            return base
+        # reducing_gap: 정수배 축소(reduce) 후 LANCZOS -> 큰 축소 비율에서 훨씬 빠름
+        return base.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    variants = []
+    for width in out_widths:
+        variant = resized(width)
+        name = f"{pure_name}-{width}w"
+        variant.save(
+            os.path.join(target_dir, f"{name}.webp"), "WEBP", quality=WEBP_QUALITY
+        )
+        variants.append(
+            {
+                "src": f"{name}.webp",
+                "width": width,
+                "height": variant.height,
+                "type": "image/webp",
+            }
+        )
+        if avif:
+            variant.save(
+                os.path.join(target_dir, f"{name}.avif"), "AVIF", quality=AVIF_QUALITY
+            )
+            variants.append(
+                {
+                    "src": f"{name}.avif",
+                    "width": width,
+                    "height": variant.height,
+                    "type": "image/avif",
+                }
+            )
+
+    # 기본 파일: 가로 1200px 최적화 (비율 유지). 같은 폭의 변형이 있으면 재인코딩 없이 복사
+    default = resized(min(DEFAULT_WIDTH, src_width))
+    same_width = os.path.join(target_dir, f"{pure_name}-{default.width}w.webp")
+    if default.width in out_widths:
+        shutil.copyfile(same_width, target_path)
+    else:
+        default.save(target_path, "WEBP", quality=WEBP_QUALITY)
+
+    return {
+        "src": os.path.basename(target_path),
+        "width": default.width,
+        "height": default.height,
+        "originalWidth": src_width,
+        "originalHeight": src_height,
+        "variants": variants,
+    }
+
+
+def convert_job(
+    file_path, target_path, digest=None, widths=RESPONSIVE_WIDTHS, avif=False
+):
+    """
+    변환 후 소스 해시까지 워커에서 계산하여 (target_path, sha1, 이미지 정보)를 반환.
+    측정용으로 워커 안에서 잰 변환 시간(seconds)을 이미지 정보에 함께 넣습니다.
+    """
+    started = time.perf_counter()
+    info = convert_image(file_path, target_path, widths, avif)
+    info["seconds"] = time.perf_counter() - started
+    return target_path, digest or file_digest(file_path), info
+
+
+def update_srcset_manifest(target_dir, url_prefix, entries):
+    """
+    타겟 폴더의 images.json에 변환 결과를 병합합니다.
+    Next.js 쪽에서 src/srcset/width/height를 파일 디코딩 없이 구성할 수 있습니다.
+    """
+    path = os.path.join(target_dir, SRCSET_MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    for name, info in entries.items():
+        info = dict(info)
+        info["src"] = f"{url_prefix}/{info['src']}"
+        info["variants"] = [
+            dict(v, src=f"{url_prefix}/{v['src']}") for v in info["variants"]
+        ]
+        info["srcSet"] = {
+            mime: ", ".join(
+                f"{v['src']} {v['width']}w"
+                for v in info["variants"]
+                if v["type"] == mime
+            )
+            for mime in sorted({v["type"] for v in info["variants"]})
+        }
+        manifest[name] = info
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return path
+
+
 # ---------------------------------------------------------
 # [이미지 최적화 메인 함수]
 # ---------------------------------------------------------
-def run_image_optimization():
+def run_image_optimization(
+    category="briefing", workers=None, force=False, widths=RESPONSIVE_WIDTHS, avif=False
+):
     # 1. 오늘 날짜 및 카테고리 설정
     now = datetime.now()
     year = now.strftime("%Y")
     month_day = now.strftime("%m-%d")
 
     # [수석 책임자의 가이드] 인자가 있으면 사용, 없으면 'briefing'이 기본값
-    category = sys.argv[1] if len(sys.argv) > 1 else "briefing"
     folder_name = f"{month_day}-{category}"
+    workers = workers or os.cpu_count() or 1
 
     # 2. 소스 및 타겟 경로 확정
     source_dir = os.path.join(DESKTOP_PATH, "blog", year, folder_name)
@@ -52,31 +278,129 @@ def run_image_optimization():
 
     os.makedirs(target_dir, exist_ok=True)
 
-    valid_extensions = (".jpg", ".jpeg", ".png", ".bmp")
+    if avif and not avif_supported():
+        print("⚠️ 이 환경의 Pillow는 AVIF 저장을 지원하지 않아 WebP만 생성합니다.")
+        avif = False
+    profile = conversion_profile(widths, avif)
+
+    # 3. 변환 대상 선별 (이미 최신 WebP가 있으면 건너뜀)
+    manifest = load_manifest()
+    jobs = []
+    skipped = 0
+
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.lower().endswith(VALID_EXTENSIONS):
+            continue
+
+        file_path = os.path.join(source_dir, filename)
+        pure_name = os.path.splitext(filename)[0]
+        target_path = os.path.join(target_dir, f"{pure_name}.webp")
+        record = manifest.get(target_path)
+
+        if force:
+            convert, digest = True, None
+        else:
+            convert, digest = needs_conversion(file_path, target_path, record, profile)
+        if not convert:
+            skipped += 1
+            # 해시로 확인한 경우 새 mtime을 기록하여 다음 실행부터는 stat만으로 판단
+            if record and digest:
+                stat = os.stat(file_path)
+                record.update(mtime=stat.st_mtime, size=stat.st_size, sha1=digest)
+            continue
+        jobs.append((filename, file_path, target_path, digest))
+
+    if skipped:
+        print(f"⏭️ 변경 없음: {skipped}개 이미지는 건너뜁니다.")
+
+    # 4. 이미지 변환 로직 (코어 수만큼 프로세스 병렬 처리)
     count = 0
+    converted = {}
 
-    # 3. 이미지 변환 로직
-    for filename in os.listdir(source_dir):
-        if filename.lower().endswith(valid_extensions):
-            file_path = os.path.join(source_dir, filename)
-            pure_name = os.path.splitext(filename)[0]
-            target_path = os.path.join(target_dir, f"{pure_name}.webp")
+    def record_done(file_path, target_path, digest, info):
+        stat = os.stat(file_path)
+        # 워커 프로세스에서 잰 시간을 부모 프로세스의 측정 기록으로 옮김
+        metrics.record(
+            "image.convert",
+            info.pop("seconds", 0.0),
+            bytes=stat.st_size,
+            variants=len(info["variants"]),
+        )
+        manifest[target_path] = {
+            "source": file_path,
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha1": digest,
+            "profile": profile,
+            "variants": [v["src"] for v in info["variants"]],
+        }
+        converted[os.path.splitext(os.path.basename(target_path))[0]] = info
 
+    if jobs and (workers <= 1 or len(jobs) == 1):
+        for filename, file_path, target_path, digest in jobs:
             try:
-                with Image.open(file_path) as img:
-                    # 가로 1200px 최적화 (비율 유지)
-                    if img.width > 1200:
-                        ratio = 1200 / float(img.width)
-                        new_height = int(float(img.height) * ratio)
-                        img = img.resize((1200, new_height), Image.Resampling.LANCZOS)
-
-                    img.save(target_path, "WEBP", quality=80)
-                    print(f"✅ 변환 완료: {pure_name}.webp")
-                    count += 1
+                _, digest, info = convert_job(
+                    file_path, target_path, digest, widths, avif
+                )
+                record_done(file_path, target_path, digest, info)
+                print(f"✅ 변환 완료: {os.path.basename(target_path)}")
+                count += 1
             except Exception as e:
                 print(f"❌ {filename} 처리 중 오류: {e}")
+    elif jobs:
+        workers = min(workers, len(jobs))
+        print(f"⚙️ {len(jobs)}개 이미지를 {workers}개 프로세스로 변환합니다...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    convert_job, job[1], job[2], job[3], widths, avif
+                ): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                filename, file_path, target_path, digest = futures[future]
+                try:
+                    _, digest, info = future.result()
+                    record_done(file_path, target_path, digest, info)
+                    print(f"✅ 변환 완료: {os.path.basename(target_path)}")
+                    count += 1
+                except Exception as e:
+                    print(f"❌ {filename} 처리 중 오류: {e}")
+
+    save_manifest(manifest)
+
+    # 5. srcset 매니페스트 갱신 (변환된 이미지만 병합)
+    if converted:
+        url_prefix = f"/static/images/{year}/{folder_name}"
+        srcset_path = update_srcset_manifest(target_dir, url_prefix, converted)
+        print(f"🗂️ srcset 매니페스트 갱신: {srcset_path}")
 
     print(f"\n✨ 성공: 총 {count}개의 이미지를 프로젝트로 배달했습니다.")
 
 if __name__ == "__main__":
-    run_image_optimization()
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description="바탕화면 이미지를 WebP로 변환하여 프로젝트로 복사"
+    )
+    parser.add_argument(
+        "category", nargs="?", default="briefing", help="카테고리 (기본값: briefing)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="변환 프로세스 수 (기본값: CPU 코어 수)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="변경 여부와 관계없이 모두 다시 변환"
+    )
+    parser.add_argument(
+        "--avif", action="store_true", help="WebP와 함께 AVIF 변형도 생성 (Pillow 지원 시)"
+    )
+    parser.add_argument(
+        "--profile", choices=metrics.PROFILERS, help="프로파일러로 실행하여 결과 저장"
+    )
+    args = parser.parse_args()
+
+    metrics.start_run("images")
+    with metrics.profiled(args.profile, name="images"):
+        run_image_optimization(
+            args.category, workers=args.workers, force=args.force, avif=args.avif
+        )
+    metrics.print_summary()
@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import time
+import zlib
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import metrics
+import search_cache
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# Gemini 응답 캐시: automation/.cache/llm/<키 앞 2자리>/<키>.z (응답 1건 = 파일 1개)
+# 같은 모델 + 같은 프롬프트 + 같은 생성 설정이면 API를 다시 부르지 않고 저장된 응답을 씁니다.
+LLM_CACHE_DIR = os.path.join(search_cache.CACHE_DIR, "llm")
+
+# 디스크 사용량 상한 (압축 후 기준). 넘으면 가장 오래 안 쓴 응답부터 삭제(LRU)
+MAX_LLM_CACHE_BYTES = 32 * 1024 * 1024
+
+# 유효 기간(초). 0이면 만료 없음 (프롬프트가 같으면 응답도 같다고 보는 기본 동작)
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "0"))
+
+# True면 캐시를 읽지 않고 항상 새로 생성합니다. (결과는 다시 저장)
+REFRESH = os.getenv("LLM_CACHE_REFRESH", "") == "1"
+
+# 여러 실행(프로세스)이 같은 캐시 폴더를 쓸 때 쓰기/정리를 직렬화하는 잠금 파일
+LOCK_NAME = ".lock"
+
+
+def make_key(model_name, prompt, config=None):
+    """모델 이름, 프롬프트, 생성 설정(dict)을 정규화하여 캐시 키(sha256)를 만듭니다."""
+    raw = json.dumps(
+        [model_name, prompt, config or {}], ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ==========================================
+# 2. 프로세스 간 파일 잠금
+# ==========================================
+@contextmanager
+def _file_lock(path):
+    """잠금 파일을 배타적으로 잡습니다. (Windows: msvcrt, 그 외: fcntl)"""
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 약 10초 재시도 후 실패하므로 잠금이 풀릴 때까지 계속 대기
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# ==========================================
+# 3. 캐시 본체
+# ==========================================
+class LlmCache:
+    """
+    응답 1건을 zlib으로 압축한 JSON 파일 하나로 저장하는 콘텐츠 주소 캐시.
+    파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로 읽기는 잠금 없이 하고,
+    쓰기와 용량 정리만 잠금 파일로 프로세스/스레드 간 직렬화합니다.
+    """
+
+    def __init__(self, root=LLM_CACHE_DIR, max_bytes=MAX_LLM_CACHE_BYTES, ttl=LLM_CACHE_TTL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._lock_path = os.path.join(root, LOCK_NAME)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.z")
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, _file_lock(self._lock_path):
+            yield
+
+    def get(self, key):
+        """유효 기간 내의 응답 텍스트가 있으면 반환, 없으면 None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"⚠️ [LLM Cache] 손상된 항목 무시: {os.path.basename(path)} ({e})")
+            return None
+
+        if self.ttl and time.time() - entry["created_at"] > self.ttl:
+            return None
+
+        # LRU 정리 기준: 마지막 사용 시각 = 파일 수정 시각
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry["text"]
+
+    def put(self, key, text, model_name=None):
+        payload = zlib.compress(
+            json.dumps(
+                {"model": model_name, "created_at": time.time(), "text": text},
+                ensure_ascii=False,
+            ).encode("utf-8"),
+            6,
+        )
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with self._locked():
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _entries(self):
+        """(마지막 사용 시각, 크기, 경로) 목록"""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".z"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """용량 상한을 넘으면 오래 안 쓴 응답부터 삭제합니다. (잠금 보유 상태에서 호출)"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        with self._locked():
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전체에서 공유하는 캐시 인스턴스를 반환합니다. (첫 호출 시 생성)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LlmCache()
+        return _cache
+
+
+def set_cache(instance):
+    """공유 캐시를 교체합니다. (벤치마크/테스트에서 임시 경로의 캐시 주입용, None이면 초기화)"""
+    global _cache
+    with _cache_lock:
+        _cache = instance
+
+
+# ==========================================
+# 4. 생성 호출 감싸기
+# ==========================================
+def generate(model_name, prompt, produce, config=None, on_text=None):
+    """
+    캐시에 같은 요청의 응답이 있으면 그대로 반환하고, 없으면 produce()로 생성하여 저장합니다.
+    - produce: 실제 Gemini 호출을 수행하고 응답 텍스트를 반환하는 함수
+    - on_text: 스트리밍 호출부의 콜백. 캐시 적중 시 전체 텍스트로 한 번 호출합니다.
+    현재 측정 span에 llm_cache=hit/miss를 기록합니다.
+    """
+    key = make_key(model_name, prompt, config)
+    cache = get_cache()
+
+    if not REFRESH:
+        text = cache.get(key)
+        if text is not None:
+            print(f"   ♻️ [LLM Cache] 저장된 응답 사용 ({model_name}, {key[:12]})")
+            metrics.annotate(llm_cache="hit", output_bytes=metrics.text_size(text)[0])
+            if on_text:
+                on_text(text)
+            return text
+
+    text = produce()
+    metrics.annotate(llm_cache="refresh" if REFRESH else "miss")
+    if text:
+        try:
+            cache.put(key, text, model_name)
+        except OSError as e:
+            print(f"⚠️ [LLM Cache] 저장 실패: {e}")
+    return text
@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+import search_cache
+from dedup_index import estimate_tokens
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 실행별 측정 기록: automation/.cache/metrics/<이름>-<시각>.jsonl (span 1개 = 1줄)
+METRICS_DIR = os.path.join(search_cache.CACHE_DIR, "metrics")
+
+# 비용 추정 단가 (USD). 요금제가 바뀌면 환경 변수로 덮어쓰기
+# Tavily advanced 검색 = 2 credit, Gemini 2.5 Flash 입력/출력 100만 토큰당 단가
+TAVILY_COST_PER_SEARCH = float(os.getenv("TAVILY_COST_PER_SEARCH", "0.016"))
+GEMINI_INPUT_PER_MTOK = float(os.getenv("GEMINI_INPUT_PER_MTOK", "0.30"))
+GEMINI_OUTPUT_PER_MTOK = float(os.getenv("GEMINI_OUTPUT_PER_MTOK", "2.50"))
+
+# --profile 옵션 값
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+# ==========================================
+# 2. Span 기록
+# ==========================================
+class Span:
+    """이름 하나의 구간 측정값. attrs에는 bytes/tokens/cost_usd 등 숫자나 짧은 문자열을 넣습니다."""
+
+    __slots__ = ("name", "attrs", "parent", "started", "seconds", "ok")
+
+    def __init__(self, name, attrs, parent=None):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.started = time.time()
+        self.seconds = 0.0
+        self.ok = True
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def add(self, **counts):
+        for key, value in counts.items():
+            self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def to_dict(self):
+        return {
+            "span": self.name,
+            "parent": self.parent,
+            "ts": round(self.started, 3),
+            "seconds": round(self.seconds, 4),
+            "ok": self.ok,
+            "thread": threading.current_thread().name,
+            **self.attrs,
+        }
+
+
+class Recorder:
+    """끝난 span을 메모리에 모으고, path가 있으면 JSON Lines로 바로 기록합니다."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.records = []
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            self.records.append(record)
+            if not self.path:
+                return
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            except OSError as e:
+                print(f"⚠️ [Metrics] 기록 실패 (이후 메모리에만 보관): {e}")
+                self.path = None
+
+
+_recorder = Recorder()
+_local = threading.local()
+
+
+def start_run(name):
+    """새 측정 파일을 열고 경로를 반환합니다. (이전 기록은 비움)"""
+    global _recorder
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+    _recorder = Recorder(path)
+    return path
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    with metrics.span("tavily.search", query=q) as s:
+        ...
+        s.set(bytes=n)
+    예외가 나면 ok=False와 오류 이름을 기록하고 예외는 그대로 전달합니다.
+    """
+    stack = _stack()
+    current = Span(name, attrs, parent=stack[-1].name if stack else None)
+    stack.append(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.ok = False
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        current.seconds = time.perf_counter() - started
+        stack.pop()
+        _recorder.emit(current.to_dict())
+
+
+def record(name, seconds, **attrs):
+    """다른 프로세스 등에서 이미 측정한 구간을 그대로 기록합니다."""
+    stack = _stack()
+    current = Span(name, attrs, parent=stack[-1].name if stack else None)
+    current.seconds = seconds
+    _recorder.emit(current.to_dict())
+
+
+def annotate(**attrs):
+    """현재 스레드에서 진행 중인 가장 안쪽 span에 값을 덧붙입니다. (없으면 무시)"""
+    stack = _stack()
+    if stack:
+        stack[-1].set(**attrs)
+
+
+def increment(**counts):
+    stack = _stack()
+    if stack:
+        stack[-1].add(**counts)
+
+
+def text_size(text):
+    """(바이트 수, 추정 토큰 수)"""
+    text = text or ""
+    return len(text.encode("utf-8")), estimate_tokens(text)
+
+
+def record_generation(response, prompt, text):
+    """
+    Gemini 호출 span에 프롬프트/응답 크기와 토큰 수, 추정 비용을 기록합니다.
+    usage_metadata가 있으면 실제 토큰 수를, 없으면 글자 수 기반 추정치를 씁니다.
+    """
+    prompt_bytes, prompt_tokens = text_size(prompt)
+    output_bytes, output_tokens = text_size(text)
+
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None) or prompt_tokens
+    output_tokens = getattr(usage, "candidates_token_count", None) or output_tokens
+
+    annotate(
+        prompt_bytes=prompt_bytes,
+        output_bytes=output_bytes,
+        input_tokens=prompt_tokens,
+        output_tokens=output_tokens,
+        cost_usd=round(
+            prompt_tokens / 1e6 * GEMINI_INPUT_PER_MTOK
+            + output_tokens / 1e6 * GEMINI_OUTPUT_PER_MTOK,
+            6,
+        ),
+    )
+
+
+# ==========================================
+# 3. 요약 표
+# ==========================================
+def summarize(records=None):
+    """span 이름별 (횟수, 합계/최대 시간, 바이트, 토큰, 비용, 실패 수) 집계"""
+    records = _recorder.records if records is None else records
+    rows = {}
+    for r in records:
+        row = rows.setdefault(
+            r["span"],
+            {"count": 0, "seconds": 0.0, "max": 0.0, "bytes": 0, "tokens": 0, "cost": 0.0, "errors": 0},
+        )
+        row["count"] += 1
+        row["seconds"] += r["seconds"]
+        row["max"] = max(row["max"], r["seconds"])
+        row["bytes"] += r.get("bytes", 0) + r.get("prompt_bytes", 0) + r.get("output_bytes", 0)
+        row["tokens"] += r.get("tokens", 0) + r.get("input_tokens", 0) + r.get("output_tokens", 0)
+        row["cost"] += r.get("cost_usd", 0.0)
+        row["errors"] += 0 if r["ok"] else 1
+    return rows
+
+
+def print_summary():
+    rows = summarize()
+    if not rows:
+        return
+
+    print("\n📈 [Metrics] 구간별 측정 요약")
+    print(
+        f"   {'Span':<22} {'N':>4} {'Total':>8} {'Max':>8} {'KB':>9} {'Tokens':>9} {'Cost$':>8} {'Err':>4}"
+    )
+    for name, row in sorted(rows.items(), key=lambda item: -item[1]["seconds"]):
+        print(
+            f"   {name[:22]:<22} {row['count']:>4} {row['seconds']:>7.2f}s {row['max']:>7.2f}s "
+            f"{row['bytes'] / 1024:>9.1f} {row['tokens']:>9,} {row['cost']:>8.4f} {row['errors']:>4}"
+        )
+    total_cost = sum(row["cost"] for row in rows.values())
+    print(f"   추정 API 비용 합계: ${total_cost:.4f}")
+    if _recorder.path:
+        print(f"   기록 파일: {_recorder.path}")
+
+
+# ==========================================
+# 4. 프로파일러 (선택)
+# ==========================================
+@contextmanager
+def profiled(mode=None, name="run"):
+    """
+    mode가 "cprofile"이면 cProfile 결과(.prof)를 저장하고 누적 시간 상위 20개를 출력합니다.
+    "pyinstrument"는 설치되어 있을 때만 사용하고, 없으면 cProfile로 대신합니다.
+    mode가 None이면 아무것도 하지 않습니다.
+    """
+    if not mode:
+        yield
+        return
+
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ [Profile] pyinstrument가 설치되어 있지 않아 cProfile을 사용합니다.")
+            mode = "cprofile"
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                path = os.path.join(METRICS_DIR, f"{name}-{stamp}.html")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+                print(profiler.output_text(unicode=True, color=False))
+                print(f"🔬 [Profile] pyinstrument 결과: {path}")
+            return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = os.path.join(METRICS_DIR, f"{name}-{stamp}.prof")
+        profiler.dump_stats(path)
+        print("\n🔬 [Profile] 누적 시간 상위 20개")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        print(f"🔬 [Profile] cProfile 결과: {path} (snakeviz 등으로 열람)")
@@ -0,0 +1,91 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 단계(stage) 작업을 동시에 돌릴 워커 수 (LLM 호출/파일 쓰기 등 I/O 대기 위주)
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+
+
+# ==========================================
+# 2. 단계 실행기 (Stage Executor)
+# ==========================================
+class StageRecord:
+    __slots__ = ("stage", "label", "started", "ended", "ok")
+
+    def __init__(self, stage, label, started, ended, ok):
+        self.stage = stage
+        self.label = label
+        self.started = started
+        self.ended = ended
+        self.ok = ok
+
+    @property
+    def seconds(self):
+        return self.ended - self.started
+
+
+class Pipeline:
+    """
+    collect -> synthesize -> rewrite -> persist 처럼 명시적인 단계 경계를 두고 실행합니다.
+
+    - run(): 현재 스레드에서 바로 실행 (다음 단계가 결과를 기다려야 할 때)
+    - submit(): 공유 워커 풀에서 실행하고 Future 반환 (서로 독립적인 작업을 겹쳐 실행)
+
+    모든 단계의 시작/종료 시각을 기록하여 실행 종료 후 print_summary()로 보여줍니다.
+    """
+
+    def __init__(self, max_workers=PIPELINE_MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="stage"
+        )
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.records = []
+
+    def run(self, stage, label, fn, *args, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            with metrics.span(f"stage.{stage}", label=label):
+                result = fn(*args, **kwargs)
+            ok = result is not None and result is not False
+            return result
+        finally:
+            record = StageRecord(stage, label, started, time.perf_counter(), ok)
+            with self._lock:
+                self.records.append(record)
+
+    def submit(self, stage, label, fn, *args, **kwargs):
+        return self._executor.submit(self.run, stage, label, fn, *args, **kwargs)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+    def print_summary(self):
+        wall = time.perf_counter() - self._started
+        busy = sum(r.seconds for r in self.records)
+
+        print("\n⏱️ [Pipeline] 단계별 소요 시간")
+        print(f"   {'Stage':<12} {'Label':<28} {'Start':>8} {'Time':>8}  Status")
+        for r in sorted(self.records, key=lambda r: r.started):
+            status = "✅" if r.ok else "❌"
+            print(
+                f"   {r.stage:<12} {r.label[:28]:<28} "
+                f"{r.started - self._started:>7.2f}s {r.seconds:>7.2f}s  {status}"
+            )
+        print(
+            f"   전체 {wall:.2f}s (단계 합계 {busy:.2f}s, 병렬 겹침으로 {max(0.0, busy - wall):.2f}s 절약)"
+        )
@@ -0,0 +1,314 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import threading
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 블로그 글 위치와 색인 파일 (automation/.cache/post_index.json)
+BLOG_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "blog"
+)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+INDEX_PATH = os.path.join(CACHE_DIR, "post_index.json")
+
+# 저장 형식을 바꾸면 올려서 기존 색인을 다시 만들게 함
+INDEX_VERSION = 1
+
+# 자동화가 만드는 파일 이름: 2026-01-30-briefing.mdx
+_NAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-([\w-]+)\.mdx$")
+_KEY_RE = re.compile(r"^([\w-]+):\s*(.*)$")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ==========================================
+# 2. MDX 프론트매터 읽기
+# ==========================================
+def _scalar(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    if value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+def _value(value):
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        inner = value[1:-1].strip()
+        return [_scalar(item) for item in inner.split(",") if item.strip()] if inner else []
+    return _scalar(value)
+
+
+def parse_front_matter(text):
+    """
+    '---'로 둘러싼 프론트매터를 (dict, 본문)으로 나눕니다.
+    이 블로그가 쓰는 형식(key: 값, 따옴표 문자열, [a, b] 목록, 들여쓴 여러 줄 값)만 지원합니다.
+    """
+    if not text.startswith("---"):
+        return {}, text
+    end = text.find("\n---", 3)
+    if end < 0:
+        return {}, text
+
+    meta, last = {}, None
+    for line in text[3:end].splitlines():
+        if not line.strip():
+            continue
+        match = _KEY_RE.match(line)
+        if match and not line[0].isspace():
+            last = match.group(1)
+            meta[last] = match.group(2)
+        elif last:
+            meta[last] += " " + line.strip()
+
+    body_start = text.find("\n", end + 4)
+    body = text[body_start + 1 :] if body_start >= 0 else ""
+    return {key: _value(value) for key, value in meta.items()}, body
+
+
+# ==========================================
+# 3. 글 레코드
+# ==========================================
+class Post:
+    """색인에 저장되는 글 1건. (본문은 저장하지 않음)"""
+
+    __slots__ = (
+        "file", "date", "category", "title", "tags", "draft", "summary",
+        "words", "sha", "mtime", "size",
+    )
+
+    def __init__(
+        self, file, date, category, title, tags, draft, summary, words, sha, mtime, size
+    ):
+        self.file = file  # BLOG_DIR 기준 상대 경로 ('/' 구분)
+        self.date = date  # 'YYYY-MM-DD'
+        self.category = category
+        self.title = title
+        self.tags = tags
+        self.draft = draft
+        self.summary = summary
+        self.words = words
+        self.sha = sha
+        self.mtime = mtime
+        self.size = size
+
+    @classmethod
+    def read(cls, path, blog_dir):
+        with open(path, "rb") as f:
+            raw = f.read()
+        stat = os.stat(path)
+        meta, body = parse_front_matter(raw.decode("utf-8"))
+
+        rel = os.path.relpath(path, blog_dir).replace(os.sep, "/")
+        name = _NAME_RE.match(os.path.basename(path))
+        tags = meta.get("tags") or []
+        if not isinstance(tags, list):
+            tags = [tags]
+
+        date = str(meta.get("date") or (name.group(1) if name else ""))[:10]
+        if name:
+            category = name.group(2)
+        else:
+            category = tags[0].lower() if tags else ""
+
+        return cls(
+            rel,
+            date,
+            category,
+            str(meta.get("title") or ""),
+            tags,
+            meta.get("draft") is True,
+            str(meta.get("summary") or ""),
+            len(_WORD_RE.findall(body)),
+            hashlib.sha256(raw).hexdigest(),
+            stat.st_mtime,
+            stat.st_size,
+        )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+    def __repr__(self):
+        flag = " (draft)" if self.draft else ""
+        return f"<Post {self.date} {self.category} {self.title!r}{flag}>"
+
+
+# ==========================================
+# 4. 색인
+# ==========================================
+class PostIndex:
+    """
+    data/blog 아래 MDX 글 목록을 JSON 파일 하나에 유지합니다.
+    refresh()는 파일의 수정 시각/크기만 확인하여 바뀐 글만 다시 읽고,
+    자동화가 글을 쓸 때는 update(path)로 해당 글만 갱신합니다.
+    """
+
+    def __init__(self, blog_dir=None, path=None):
+        self.blog_dir = os.path.abspath(blog_dir or BLOG_DIR)
+        self.path = path or INDEX_PATH
+        self._posts = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # 다른 폴더(벤치마크 임시 폴더 등)나 예전 형식의 색인이면 새로 만듦
+                if data.get("version") == INDEX_VERSION and data.get("blog_dir") == self.blog_dir:
+                    for item in data.get("posts", []):
+                        post = Post.from_dict(item)
+                        self._posts[post.file] = post
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"⚠️ [Post Index] 색인 파일을 읽지 못해 새로 만듭니다: {e}")
+
+    def __len__(self):
+        return len(self._posts)
+
+    def _scan(self):
+        """(상대 경로, 절대 경로, stat) 목록. 본문은 읽지 않음"""
+        found = []
+        stack = [self.blog_dir]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.endswith(".mdx"):
+                    rel = os.path.relpath(entry.path, self.blog_dir).replace(os.sep, "/")
+                    found.append((rel, entry.path, entry.stat()))
+        return found
+
+    def refresh(self):
+        """추가/변경/삭제된 글만 반영하고 (읽은 글 수, 삭제 수)를 반환합니다."""
+        with self._lock:
+            seen, parsed = set(), 0
+            for rel, path, stat in self._scan():
+                seen.add(rel)
+                post = self._posts.get(rel)
+                if post and post.mtime == stat.st_mtime and post.size == stat.st_size:
+                    continue
+                try:
+                    self._posts[rel] = Post.read(path, self.blog_dir)
+                    parsed += 1
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"⚠️ [Post Index] {rel} 읽기 실패: {e}")
+
+            removed = [rel for rel in self._posts if rel not in seen]
+            for rel in removed:
+                del self._posts[rel]
+
+            if parsed or removed:
+                self._save()
+            return parsed, len(removed)
+
+    def update(self, path):
+        """글 하나를 다시 읽어 색인에 반영합니다. (파일이 없으면 제거)"""
+        path = os.path.abspath(path)
+        rel = os.path.relpath(path, self.blog_dir).replace(os.sep, "/")
+        with self._lock:
+            if os.path.exists(path):
+                self._posts[rel] = Post.read(path, self.blog_dir)
+            else:
+                self._posts.pop(rel, None)
+            self._save()
+        return self._posts.get(rel)
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체 (Lock 보유 상태에서 호출)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "blog_dir": self.blog_dir,
+                    "posts": [post.to_dict() for post in self._posts.values()],
+                },
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.path)
+
+    # ---------- 조회 ----------
+    def query(self, category=None, start=None, end=None, drafts=True):
+        """
+        조건에 맞는 글을 날짜 오름차순으로 반환합니다.
+        start/end는 'YYYY-MM-DD' 문자열(양 끝 포함), drafts=False면 발행된 글만.
+        """
+        posts = [
+            post
+            for post in self._posts.values()
+            if (category is None or post.category == category)
+            and (start is None or post.date >= start)
+            and (end is None or post.date <= end)
+            and (drafts or not post.draft)
+        ]
+        posts.sort(key=lambda post: (post.date, post.file))
+        return posts
+
+    def latest(self, n=1, category=None, drafts=True, before=None):
+        """가장 최근 글 n개 (최신순). before를 주면 그 날짜보다 이전 글만"""
+        posts = self.query(category=category, drafts=drafts)
+        if before is not None:
+            posts = [post for post in posts if post.date < before]
+        return posts[::-1][:n]
+
+    def get(self, day, category):
+        """자동화 파일 이름 규칙(<날짜>-<카테고리>.mdx)으로 글 하나를 찾습니다."""
+        return self._posts.get(f"{day}-{category}.mdx")
+
+
+def load(blog_dir=None, path=None):
+    """색인을 불러와 바뀐 글만 반영한 뒤 반환합니다."""
+    index = PostIndex(blog_dir, path)
+    index.refresh()
+    return index
+
+
+def record_post(mdx_path, blog_dir=None, path=None):
+    """자동화가 글을 쓰거나 고친 직후 호출: 해당 글만 색인에 반영"""
+    return load(blog_dir, path).update(mdx_path)
+
+
+# ==========================================
+# 5. 실행부 (조회 CLI)
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="data/blog MDX 글 색인 조회")
+    parser.add_argument("--category", help="카테고리 (예: briefing)")
+    parser.add_argument("--since", help="시작 날짜 YYYY-MM-DD")
+    parser.add_argument("--until", help="끝 날짜 YYYY-MM-DD")
+    parser.add_argument("--latest", type=int, help="최근 N개만")
+    parser.add_argument("--published", action="store_true", help="draft 제외")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    index = PostIndex()
+    parsed, removed = index.refresh()
+    print(f"🗂️ [Post Index] 글 {len(index)}개 (다시 읽음 {parsed}, 삭제 {removed})", file=sys.stderr)
+
+    if args.latest:
+        posts = index.latest(args.latest, category=args.category, drafts=not args.published)
+    else:
+        posts = index.query(args.category, args.since, args.until, drafts=not args.published)
+
+    if args.json:
+        print(json.dumps([post.to_dict() for post in posts], ensure_ascii=False, indent=2))
+    else:
+        for post in posts:
+            flag = " [draft]" if post.draft else ""
+            print(f"{post.date}  {post.category:<10} {post.words:>6}w  {post.title}{flag}")
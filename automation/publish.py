@@ -1,6 +1,8 @@
 import os
-import subprocess
 import sys
+import glob
+import argparse
+import subprocess
 from datetime import datetime
 
 # ---------------------------------------------------------
@@ -9,61 +11,249 @@
 # 프로젝트 루트 경로 (automation 폴더의 두 단계 위)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def run_command(command, cwd=PROJECT_ROOT):
-    """터미널 명령어를 실행하고 결과를 출력하는 함수"""
+# 자동화 산출물 위치 (PROJECT_ROOT 기준, run_automation.py와 같은 규칙)
+# - MDX 초안: data/blog/<날짜>-<카테고리>.mdx
+# - 낮/저녁 업데이트 글: data/blog/<날짜>-<카테고리>-update-<시각>.mdx (delta_briefing.py)
+# - 이미지 폴더: public/static/images/<연도>/<월-일>-<카테고리>/
+BLOG_REL_DIR = "data/blog"
+IMAGE_REL_DIR = "public/static/images"
+
+DEFAULT_REMOTE = "origin"
+DEFAULT_BRANCH = "main"
+BLOG_URL = "https://crypto-oikonomos.vercel.app"
+
+# 이번 실행에서 띄운 git 프로세스 수 (배포 요약에 표시)
+git_calls = 0
+
+
+def run_git(args, cwd=PROJECT_ROOT):
+    """
+    git을 셸 없이 직접 실행합니다. (인자 목록 그대로 전달 -> 따옴표/특수문자 문제 없음)
+    성공하면 표준 출력을, 실패하면 오류를 출력하고 None을 반환합니다.
+    """
+    global git_calls
+    git_calls += 1
     try:
-        # 명령어 실행
         result = subprocess.run(
-            command, 
-            cwd=cwd, 
-            shell=True, 
-            check=True, 
-            stdout=subprocess.PIPE, 
+            ["git", *args],
+            cwd=cwd,
+            check=True,
+            stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            encoding='utf-8' # 한글 깨짐 방지
+            encoding="utf-8",  # 한글 깨짐 방지
         )
-        print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ [Error] 명령어 실행 실패: {command}")
-        print(e.stderr)
+        return result.stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"❌ [Error] 명령어 실행 실패: git {' '.join(args)}")
+        print(getattr(e, "stderr", None) or e)
+        return None
+
+
+# ---------------------------------------------------------
+# 배포 대상 (이번 실행의 산출물만)
+# ---------------------------------------------------------
+def artifact_paths(dates, categories, root=PROJECT_ROOT):
+    """
+    날짜 x 카테고리 조합의 MDX 초안, 업데이트 글, 이미지 폴더 중 디스크에 있는 것만
+    PROJECT_ROOT 기준 상대 경로('/' 구분)로 반환합니다.
+    (git status 범위 지정용. add/commit에는 이 중 실제로 바뀐 파일만 넘깁니다)
+    """
+    paths = []
+    for day in dates:
+        year, month_day = day[:4], day[5:]
+        for category in categories:
+            candidates = (
+                f"{BLOG_REL_DIR}/{day}-{category}.mdx",
+                f"{IMAGE_REL_DIR}/{year}/{month_day}-{category}",
+            )
+            paths.extend(p for p in candidates if os.path.exists(os.path.join(root, p)))
+
+            updates = glob.glob(
+                os.path.join(root, BLOG_REL_DIR, glob.escape(f"{day}-{category}") + "-update-*.mdx")
+            )
+            paths.extend(
+                os.path.relpath(p, root).replace(os.sep, "/") for p in sorted(updates)
+            )
+    return paths
+
+
+def changed_files(paths, cwd=PROJECT_ROOT):
+    """
+    주어진 경로 안에서 바뀐 파일만 [(상태, 경로)]로 반환합니다. (실패 시 None)
+    pathspec으로 범위를 제한하므로 저장소 전체를 훑지 않습니다.
+    이름 변경은 새 경로와 원래 경로(상태 'D ')를 각각 한 항목으로 돌려줍니다.
+    """
+    output = run_git(
+        ["status", "--porcelain=v1", "-z", "--untracked-files=all", "--", *paths], cwd=cwd
+    )
+    if output is None:
+        return None
+
+    changes = []
+    entries = iter(output.split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        status, path = entry[:2], entry[3:]
+        changes.append((status, path))
+        if "R" in status or "C" in status:
+            source = next(entries, None)  # 이름 변경/복사는 원래 경로가 한 항목 더 붙음
+            if source and "R" in status:
+                changes.append(("D ", source))
+    return changes
+
+
+def build_commit_message(dates, categories):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    scope = f"{', '.join(dates)} / {', '.join(categories)}"
+    return f"Blog Update: {scope} ({timestamp}, Auto-deployed via Python)"
+
+
+# ---------------------------------------------------------
+# 배포 (status -> add -> commit -> push, 1회씩)
+# ---------------------------------------------------------
+def publish(
+    paths,
+    message,
+    yes=False,
+    remote=DEFAULT_REMOTE,
+    branch=DEFAULT_BRANCH,
+    cwd=PROJECT_ROOT,
+):
+    """
+    paths 안의 변경만 담아 커밋 1개로 만들고 한 번에 push 합니다.
+    여러 날짜/카테고리를 넘겨도 git 실행은 최대 4회입니다. (커밋 실패 시 reset 1회 추가)
+    yes=True면 확인 질문 없이 진행합니다. (예약 실행용) 성공하면 True.
+    """
+    global git_calls
+    git_calls = 0
+
+    if not paths:
+        print("📭 배포할 산출물이 없습니다. (MDX 초안/이미지 폴더 없음)")
         return False
 
-def publish_to_github():
-    print("🚀 [System] 블로그 배포 자동화를 시작합니다...")
-    
-    # 1. 변경사항 확인 (Git Status)
+    # 1. 변경사항 확인 (대상 경로만)
     print("\n🔍 [Step 1] 변경사항 확인 중...")
-    if not run_command("git status"):
-        return
+    changes = changed_files(paths, cwd=cwd)
+    if changes is None:
+        return False
+    if not changes:
+        print("📭 대상 경로에 바뀐 파일이 없습니다.")
+        return True
+    for status, path in changes:
+        print(f"   {status} {path}")
+
+    # 2. 사용자 확인 (안전장치, --yes면 생략)
+    if not yes:
+        confirm = input(f"👉 {len(changes)}개 파일을 배포(Publish) 하시겠습니까? (y/n): ")
+        if confirm.strip().lower() != "y":
+            print("🚫 배포가 취소되었습니다.")
+            return False
 
-    # 2. 사용자 확인 (안전장치)
-    confirm = input("👉 정말로 배포(Publish) 하시겠습니까? (y/n): ").strip().lower()
-    if confirm != 'y':
-        print("🚫 배포가 취소되었습니다.")
-        return
+    # add/commit에는 실제로 바뀐 파일만 넘김
+    # (빈 이미지 폴더처럼 git이 모르는 경로를 넘기면 "pathspec did not match"로 실패)
+    pathspecs = [path for _, path in changes]
+    # 작업 트리 쪽 변경이 없는 항목(이미 스테이징됨, 이름 변경의 원래 경로 등)은 add 불필요
+    unstaged = [path for status, path in changes if status[1] != " "]
 
-    # 3. Git Add
+    # 3. Git Add (바뀐 파일만, 삭제 포함)
     print("\n📦 [Step 2] 변경사항 담기 (git add)...")
-    if not run_command("git add ."):
-        return
+    if unstaged and run_git(["add", "--all", "--", *unstaged], cwd=cwd) is None:
+        return False
 
-    # 4. Git Commit
-    # 커밋 메시지에 자동으로 날짜/시간을 넣어줍니다.
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    commit_message = f"Blog Update: {timestamp} (Auto-deployed via Python)"
-    
-    print(f"\n📝 [Step 3] 커밋 작성 (git commit): '{commit_message}'")
-    if not run_command(f'git commit -m "{commit_message}"'):
-        return
+    # 4. Git Commit (대상 파일만 커밋: 미리 스테이징되어 있던 다른 파일은 건드리지 않음)
+    print(f"\n📝 [Step 3] 커밋 작성 (git commit): '{message}'")
+    if run_git(["commit", "-m", message, "--", *pathspecs], cwd=cwd) is None:
+        # 방금 담은 파일을 스테이징에서 내려, 다음 커밋에 섞여 들어가지 않게 함
+        print("↩️ 커밋 실패: 담았던 파일을 스테이징에서 되돌립니다. (git reset)")
+        run_git(["reset", "-q", "--", *pathspecs], cwd=cwd)
+        return False
 
     # 5. Git Push
-    print("\nairplane [Step 4] 깃허브로 발사 (git push)...")
-    if run_command("git push origin main"):
+    print(f"\n✈️ [Step 4] 깃허브로 발사 (git push {remote} HEAD:{branch})...")
+    pushed = run_git(["push", remote, f"HEAD:{branch}"], cwd=cwd) is not None
+    print(f"   (git 실행 {git_calls}회, 파일 {len(changes)}개)")
+    if pushed:
         print("\n✅ [Success] 배포 성공! 잠시 후 Vercel이 사이트를 업데이트합니다.")
-        print("🌍 내 블로그: https://crypto-oikonomos.vercel.app")
+        print(f"🌍 내 블로그: {BLOG_URL}")
     else:
-        print("\n❌ [Fail] 배포 실패. 로그를 확인해주세요.")
+        print("\n❌ [Fail] 배포 실패. 커밋은 로컬에 남아 있으니 로그 확인 후 다시 push 하세요.")
+    return pushed
+
+
+def publish_to_github(
+    categories=None, dates=None, yes=False, everything=False, remote=DEFAULT_REMOTE,
+    branch=DEFAULT_BRANCH, cwd=PROJECT_ROOT,
+):
+    """
+    지정한 날짜/카테고리의 산출물(기본값: 오늘 briefing, 업데이트 글 포함)을 한 커밋으로 배포합니다.
+    everything=True면 예전처럼 작업 트리 전체를 담습니다.
+    """
+    print("🚀 [System] 블로그 배포 자동화를 시작합니다...")
+    categories = categories or ["briefing"]
+    dates = dates or [datetime.now().strftime("%Y-%m-%d")]
+
+    if everything:
+        paths = ["."]
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        message = f"Blog Update: {timestamp} (Auto-deployed via Python)"
+    else:
+        paths = artifact_paths(dates, categories, root=cwd)
+        message = build_commit_message(dates, categories)
+        if paths:
+            print(f"📦 [Batch] {len(dates)}개 날짜 x {len(categories)}개 카테고리 -> 대상 경로 {len(paths)}개")
+
+    return publish(paths, message, yes=yes, remote=remote, branch=branch, cwd=cwd)
+
 
 if __name__ == "__main__":
-    publish_to_github()
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description="이번 실행의 MDX 초안/이미지 폴더만 한 커밋으로 묶어 배포"
+    )
+    parser.add_argument(
+        "categories",
+        nargs="*",
+        help="카테고리 목록 (예: briefing study, 쉼표 구분 가능). 기본값: briefing",
+    )
+    parser.add_argument(
+        "--date",
+        dest="dates",
+        action="append",
+        help="배포할 날짜 YYYY-MM-DD (여러 번 지정 또는 쉼표 구분 가능). 기본값: 오늘",
+    )
+    parser.add_argument(
+        "--yes", "-y", action="store_true", help="확인 질문 없이 배포 (예약 실행용)"
+    )
+    parser.add_argument(
+        "--all",
+        dest="everything",
+        action="store_true",
+        help="작업 트리 전체를 담아 배포 (예전 동작)",
+    )
+    parser.add_argument("--remote", default=DEFAULT_REMOTE, help="push 대상 원격 저장소")
+    parser.add_argument("--branch", default=DEFAULT_BRANCH, help="push 대상 브랜치")
+    args = parser.parse_args()
+
+    categories = [c.strip() for arg in args.categories for c in arg.split(",") if c.strip()]
+    dates = []
+    for value in args.dates or []:
+        for item in value.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            try:
+                datetime.strptime(item, "%Y-%m-%d")
+            except ValueError:
+                parser.error("--date는 YYYY-MM-DD 형식이어야 합니다.")
+            if item not in dates:
+                dates.append(item)
+
+    ok = publish_to_github(
+        categories=categories,
+        dates=dates,
+        yes=args.yes,
+        everything=args.everything,
+        remote=args.remote,
+        branch=args.branch,
+    )
+    sys.exit(0 if ok else 1)
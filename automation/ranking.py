@@ -0,0 +1,120 @@
+import math
+import datetime
+from urllib.parse import urlsplit
+
+import sources
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 트랙별로 프롬프트에 넣을 최대 기사 수 (plan["top_k"]가 있으면 우선)
+TOP_K_BY_TYPE = {"news": 8, "context": 3}
+
+# 점수 가중치: 속보는 최신성, 배경 리포트는 관련도/신뢰도 위주
+SCORE_WEIGHTS = {
+    "news": {"recency": 0.45, "trust": 0.20, "relevance": 0.35},
+    "context": {"recency": 0.15, "trust": 0.35, "relevance": 0.50},
+}
+
+# 최신성 반감기(시간): 이 시간이 지나면 최신성 점수가 절반
+RECENCY_HALF_LIFE_HOURS = {"news": 12, "context": 180 * 24}
+
+# 발행일이 없는 기사: 속보는 제외, 배경 리포트는 중간 점수로 유지
+UNDATED_RECENCY = {"context": 0.3}
+
+# 도메인 신뢰도: 목록(TRUSTED_DOMAINS)에 있으면 기본 0.8, 1차 출처(정부/감독기관)는 1.0으로 가산.
+# 목록 밖 도메인은 낮은 점수
+PRIMARY_SOURCE_SUFFIXES = (".gov",)
+TRUSTED_SCORE = 0.8
+PRIMARY_SCORE = 1.0
+UNTRUSTED_SCORE = 0.3
+
+# Tavily score가 없을 때 관련도
+DEFAULT_RELEVANCE = 0.5
+
+
+# ==========================================
+# 2. 점수 계산
+# ==========================================
+def domain_of(url):
+    host = urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def trust_score(url, trusted_domains):
+    domain = domain_of(url)
+    if any(domain == d or domain.endswith("." + d) for d in trusted_domains):
+        return PRIMARY_SCORE if domain.endswith(PRIMARY_SOURCE_SUFFIXES) else TRUSTED_SCORE
+    return UNTRUSTED_SCORE
+
+
+def recency_score(article, now):
+    """반감기 기반 지수 감소 (미래 날짜는 1.0). 발행일이 없으면 UNDATED_RECENCY 또는 None"""
+    if article.published is None:
+        return UNDATED_RECENCY.get(article.track_type)
+    age_hours = max(0.0, (now - article.published).total_seconds() / 3600)
+    half_life = RECENCY_HALF_LIFE_HOURS.get(article.track_type, RECENCY_HALF_LIFE_HOURS["news"])
+    return math.exp(-math.log(2) * age_hours / half_life)
+
+
+def score(article, now, trusted_domains):
+    """0~1 사이 점수. 발행일이 없어 제외 대상이면 None"""
+    recency = recency_score(article, now)
+    if recency is None:
+        return None
+    relevance = article.relevance if article.relevance is not None else DEFAULT_RELEVANCE
+    weights = SCORE_WEIGHTS.get(article.track_type, SCORE_WEIGHTS["news"])
+    return (
+        weights["recency"] * recency
+        + weights["trust"] * trust_score(article.url, trusted_domains)
+        + weights["relevance"] * min(1.0, max(0.0, relevance))
+    )
+
+
+def reference_time(today):
+    """
+    최신성 기준 시각: 오늘 실행이면 현재 시각, 과거 날짜 재처리면 그날의 끝.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if today >= now.date():
+        return now
+    return datetime.datetime.combine(
+        today, datetime.time.max, tzinfo=datetime.timezone.utc
+    )
+
+
+def top_k(plan):
+    default = TOP_K_BY_TYPE.get(plan["type"], TOP_K_BY_TYPE["news"])
+    return plan.get("top_k", min(default, plan.get("count", default)))
+
+
+class RankStats:
+    """트랙 전체에서 나이 제한/발행일 누락으로 제외한 건수"""
+
+    def __init__(self):
+        self.stale = 0
+        self.undated = 0
+
+    def summary(self):
+        return f"기간 초과 {self.stale}건, 발행일 없음 {self.undated}건 제외"
+
+
+def rank_track(articles, plan, now, trusted_domains, stats=None):
+    """
+    트랙 하나의 기사를 나이 제한으로 거른 뒤 점수 내림차순으로 정렬해 반환합니다.
+    (같은 점수는 원래 순서 유지) 상위 K개 선택은 중복 제거와 함께 호출 측에서 합니다.
+    """
+    stats = stats or RankStats()
+    max_age = sources.max_age_days(plan)
+    scored = []
+    for order, article in enumerate(articles):
+        if not article.is_recent(now.date(), max_age):
+            stats.stale += 1
+            continue
+        value = score(article, now, trusted_domains)
+        if value is None:
+            stats.undated += 1
+            continue
+        scored.append((-value, order, article))
+    scored.sort(key=lambda item: (item[0], item[1]))
+    return [(article, -neg) for neg, _, article in scored]
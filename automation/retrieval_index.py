@@ -0,0 +1,448 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import zlib
+import sqlite3
+import argparse
+import datetime
+import threading
+from collections import Counter
+
+import metrics
+import sources
+import search_cache
+import dedup_index
+
+try:
+    import numpy as np
+except ImportError:  # 없으면 같은 계산을 순수 파이썬으로 수행
+    np = None
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 지난 크롤링 기사 전체를 담는 로컬 검색 색인 (automation/.cache/retrieval_index.sqlite3)
+INDEX_PATH = os.path.join(search_cache.CACHE_DIR, "retrieval_index.sqlite3")
+
+# True면 Context 트랙(배경 리포트)을 매일 360일 Tavily 검색 대신 로컬 색인에서 가져옵니다.
+# 로컬 재현율이 낮으면(충분히 비슷한 문서가 부족하면) 해당 트랙만 실시간 검색으로 대체
+LOCAL_CONTEXT = os.getenv("LOCAL_CONTEXT", "1") != "0"
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 최종 관련도 = BM25(결과 내 최댓값으로 정규화) 비중 + 코사인 유사도 비중
+BM25_WEIGHT = 0.5
+
+# 로컬 결과 채택 기준: 코사인 유사도가 이 값 이상인 문서가 트랙 상위 K개(ranking.top_k) 이상
+MIN_SIMILARITY = float(os.getenv("LOCAL_CONTEXT_MIN_SIMILARITY", "0.08"))
+
+# 문서 1건에 저장/색인할 본문 길이 (Context 트랙 잘라내기 기준과 같음)
+MAX_DOC_CHARS = 20000
+
+# 질의에 넣을 오늘 속보 헤드라인 수
+HEADLINES_PER_QUERY = 30
+
+# 질의 단어 상한 (SQLite 바인딩 변수 수 제한 이내) / 그중 점수 계산에 쓰는 정보량 상위 단어 수
+MAX_QUERY_TERMS = 400
+SCORED_QUERY_TERMS = 64
+
+# 이보다 오래 전에 수집한 문서는 정리 (Context 트랙 허용 기간과 같음)
+RETENTION_DAYS = sources.CONTEXT_MAX_AGE_DAYS
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9\-]+|\d{4}|[가-힣]{2,}")
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can could for from had has have he her his how if in
+    into is it its more most new news not of on or our over said says she so than that the
+    their them there these they this to up was we were what when which who will with would
+    year years after about also all amid any before just like may one out per report reports
+    update updates week today yesterday
+    """.split()
+)
+
+
+def tokenize(text):
+    """소문자 단어/연도/한글 토큰 (불용어 제외)"""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+# ==========================================
+# 2. 색인 본체
+# ==========================================
+class RetrievalIndex:
+    """
+    SQLite 한 파일에 문서(정규화 URL 기준 1건)와 역색인(term -> 문서, 빈도)을 저장합니다.
+    - BM25: 질의 단어의 역색인 행만 읽어 계산 (전체 문서를 메모리에 올리지 않음)
+    - 코사인 유사도: 문서는 log(tf) 벡터를 추가 시점에 정규화(lnc), 질의는 log(tf)*idf (ltc)
+      -> 문서 길이 정규화 값이 다른 문서 추가에 영향받지 않아 증분 추가가 가능합니다.
+    NumPy가 있으면 점수 누적을 배열 연산으로 처리합니다.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                link TEXT NOT NULL,
+                title TEXT NOT NULL,
+                published TEXT,
+                crawled TEXT NOT NULL,
+                category TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                norm REAL NOT NULL,
+                content BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+            CREATE INDEX IF NOT EXISTS docs_crawled ON docs (crawled);
+            """
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    # ---------- 추가 ----------
+    def add_results(self, results, crawled, category=""):
+        """
+        Tavily 검색 결과 목록을 색인에 추가합니다. (이미 있는 URL은 건너뜀)
+        crawled: 수집 날짜 'YYYY-MM-DD'. 반환: 새로 추가한 문서 수
+        """
+        added = 0
+        with self._lock:
+            for result in results:
+                content = (result.get("raw_content") or "")[:MAX_DOC_CHARS]
+                url = dedup_index.canonicalize_url(result.get("url") or "")
+                if not content or not url:
+                    continue
+                title = result.get("title") or ""
+                terms = Counter(tokenize(f"{title}\n{content}"))
+                if not terms:
+                    continue
+
+                published = sources.parse_published_date(result.get("published_date"))
+                norm = math.sqrt(sum((1 + math.log(tf)) ** 2 for tf in terms.values()))
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO docs "
+                    "(url, link, title, published, crawled, category, length, norm, content) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        result.get("url") or url,
+                        title,
+                        published.isoformat() if published else None,
+                        crawled,
+                        category,
+                        sum(terms.values()),
+                        norm,
+                        zlib.compress(content.encode("utf-8"), 6),
+                    ),
+                )
+                if not cursor.rowcount:
+                    continue
+                doc_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO postings VALUES (?, ?, ?)",
+                    [(term, doc_id, tf) for term, tf in terms.items()],
+                )
+                added += 1
+            self._conn.commit()
+        return added
+
+    def prune(self, today=None, retention_days=RETENTION_DAYS):
+        """보관 기간이 지난 문서를 지우고 삭제 수를 반환합니다."""
+        today = today or datetime.date.today()
+        cutoff = (today - datetime.timedelta(days=retention_days)).isoformat()
+        with self._lock:
+            ids = [
+                (row[0],)
+                for row in self._conn.execute("SELECT id FROM docs WHERE crawled < ?", (cutoff,))
+            ]
+            if ids:
+                self._conn.executemany("DELETE FROM postings WHERE doc = ?", ids)
+                self._conn.executemany("DELETE FROM docs WHERE id = ?", ids)
+                self._conn.commit()
+        return len(ids)
+
+    # ---------- 검색 ----------
+    def search(self, text, k=5, before=None, max_age_days=None):
+        """
+        text와 비슷한 문서 상위 k개를 [(문서 dict, 관련도, 코사인 유사도)]로 반환합니다.
+        before('YYYY-MM-DD')를 주면 그 날짜 이전에 수집한 문서만,
+        max_age_days를 주면 발행일(없으면 수집일)이 그 기간 이내인 문서만 대상으로 합니다.
+        """
+        query = Counter(tokenize(text))
+        if not query:
+            return []
+
+        with self._lock:
+            total_docs, avg_len = self._conn.execute(
+                "SELECT COUNT(*), AVG(length) FROM docs"
+            ).fetchone()
+            if not total_docs:
+                return []
+
+            terms = [term for term, _ in query.most_common(MAX_QUERY_TERMS)]
+            marks = ",".join("?" * len(terms))
+            df = dict(
+                self._conn.execute(
+                    f"SELECT term, COUNT(*) FROM postings WHERE term IN ({marks}) GROUP BY term",
+                    terms,
+                )
+            )
+
+            # 질의 단어별 가중치: 코사인용 ltc(log tf * idf) / BM25 idf
+            query_w = {
+                t: (1 + math.log(query[t])) * math.log(total_docs / n) for t, n in df.items()
+            }
+            query_norm = math.sqrt(sum(w * w for w in query_w.values())) or 1.0
+
+            # 정보량(질의 가중치)이 큰 단어의 역색인만 읽음: 흔한 단어의 긴 목록은 건너뜀
+            terms = sorted(query_w, key=lambda t: -query_w[t])[:SCORED_QUERY_TERMS]
+            if not terms:
+                return []
+            marks = ",".join("?" * len(terms))
+            where, params = "", list(terms)
+            if before:
+                where += " AND d.crawled < ?"
+                params.append(before)
+            if max_age_days is not None and before:
+                cutoff = (
+                    datetime.date.fromisoformat(before) - datetime.timedelta(days=max_age_days)
+                ).isoformat()
+                where += " AND COALESCE(d.published, d.crawled) >= ?"
+                params.append(cutoff)
+            rows = self._conn.execute(
+                f"SELECT p.term, p.doc, p.tf, d.length, d.norm FROM postings p "
+                f"JOIN docs d ON d.id = p.doc WHERE p.term IN ({marks}){where}",
+                params,
+            ).fetchall()
+
+        if not rows:
+            return []
+
+        bm25_idf = {
+            t: math.log(1 + (total_docs - df[t] + 0.5) / (df[t] + 0.5)) for t in terms
+        }
+
+        scores = _score(rows, bm25_idf, query_w, avg_len or 1.0)
+        best_bm25 = max(bm25 for bm25, _ in scores.values()) or 1.0
+        ranked = sorted(
+            (
+                (BM25_WEIGHT * bm25 / best_bm25 + (1 - BM25_WEIGHT) * dot / query_norm,
+                 dot / query_norm, doc_id)
+                for doc_id, (bm25, dot) in scores.items()
+            ),
+            reverse=True,
+        )[:k]
+
+        # 본문은 최종 k개만 읽음
+        with self._lock:
+            return [
+                (self._load_doc(doc_id), round(relevance, 4), round(cosine, 4))
+                for relevance, cosine, doc_id in ranked
+            ]
+
+    def _load_doc(self, doc_id):
+        row = self._conn.execute(
+            "SELECT url, link, title, published, crawled, category, content FROM docs WHERE id = ?",
+            (doc_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        url, link, title, published, crawled, category, content = row
+        return {
+            "url": url,
+            "link": link,
+            "title": title,
+            "published": published,
+            "crawled": crawled,
+            "category": category,
+            "content": zlib.decompress(content).decode("utf-8"),
+        }
+
+    def stats(self):
+        with self._lock:
+            docs, first, last = self._conn.execute(
+                "SELECT COUNT(*), MIN(crawled), MAX(crawled) FROM docs"
+            ).fetchone()
+            terms = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {"docs": docs, "terms": terms, "first": first, "last": last}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _score(rows, bm25_idf, query_w, avg_len):
+    """역색인 행 [(term, doc, tf, length, norm)] -> {doc: (BM25, 정규화 내적)}"""
+    if np is not None:
+        terms, docs, tfs, lengths, norms = zip(*rows)
+        docs = np.asarray(docs)
+        tfs = np.asarray(tfs, dtype=np.float64)
+        lengths = np.asarray(lengths, dtype=np.float64)
+        norms = np.asarray(norms, dtype=np.float64)
+        idf = np.fromiter((bm25_idf[t] for t in terms), np.float64, len(terms))
+        qw = np.fromiter((query_w[t] for t in terms), np.float64, len(terms))
+
+        bm25 = idf * tfs * (BM25_K1 + 1) / (
+            tfs + BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_len)
+        )
+        dot = qw * (1 + np.log(tfs)) / norms
+
+        unique, inverse = np.unique(docs, return_inverse=True)
+        bm25_sum = np.bincount(inverse, weights=bm25)
+        dot_sum = np.bincount(inverse, weights=dot)
+        return {
+            int(doc): (float(b), float(d)) for doc, b, d in zip(unique, bm25_sum, dot_sum)
+        }
+
+    scores = {}
+    for term, doc, tf, length, norm in rows:
+        bm25 = bm25_idf[term] * tf * (BM25_K1 + 1) / (
+            tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_len)
+        )
+        dot = query_w[term] * (1 + math.log(tf)) / norm
+        prev = scores.get(doc, (0.0, 0.0))
+        scores[doc] = (prev[0] + bm25, prev[1] + dot)
+    return scores
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """프로세스 전체에서 공유하는 색인 인스턴스를 반환합니다. (첫 호출 시 생성)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RetrievalIndex(INDEX_PATH)
+        return _index
+
+
+def set_index(instance):
+    """공유 색인을 교체합니다. (벤치마크/테스트에서 임시 경로의 색인 주입용, None이면 초기화)"""
+    global _index
+    with _index_lock:
+        _index = instance
+
+
+# ==========================================
+# 3. 파이프라인 연동
+# ==========================================
+def context_results(plan, headlines, today, k):
+    """
+    Context 트랙 하나를 로컬 색인에서 채웁니다.
+    질의 = 트랙 검색어 + 오늘 속보 헤드라인. 결과는 Tavily 검색 결과와 같은 형태의 dict 목록이며,
+    코사인 유사도가 MIN_SIMILARITY 이상인 문서가 k개 미만이면 None (실시간 검색으로 대체).
+    """
+    query = "\n".join([plan["query"], *headlines[:HEADLINES_PER_QUERY]])
+    with metrics.span("retrieval.search", track=plan["category"][:40]) as s:
+        try:
+            found = get_index().search(
+                query,
+                k=max(k * 2, k + 2),  # 랭킹/중복 제거 후에도 K개가 남도록 여유
+                before=today.isoformat(),
+                max_age_days=sources.max_age_days(plan),
+            )
+        except sqlite3.Error as e:
+            print(f"   ⚠️ [Local] 색인 검색 실패 (실시간 검색 사용): {e}")
+            s.set(error="sqlite")
+            return None
+
+        confident = sum(1 for _, _, cosine in found if cosine >= MIN_SIMILARITY)
+        s.set(results=len(found), confident=confident)
+        if confident < k:
+            print(
+                f"   🔎 [Local] {plan['category']}: 유사 문서 {confident}/{k}건 -> 실시간 검색으로 대체"
+            )
+            s.set(fallback=True)
+            return None
+
+    print(f"   📚 [Local] {plan['category']}: 로컬 색인에서 {len(found)}건 (유사 {confident}건)")
+    return [
+        {
+            "url": doc["link"],
+            "title": doc["title"],
+            "published_date": doc["published"] or doc["crawled"],
+            "raw_content": doc["content"],
+            "score": relevance,
+        }
+        for doc, relevance, _ in found
+    ]
+
+
+def record_crawl(search_plan, track_results, today):
+    """이번 실행에서 실시간으로 수집한 기사를 색인에 추가하고 오래된 문서를 정리합니다."""
+    with metrics.span("retrieval.update") as s:
+        try:
+            index = get_index()
+            added = sum(
+                index.add_results(results, today.isoformat(), plan["category"])
+                for plan, results in zip(search_plan, track_results)
+                if results
+            )
+            removed = index.prune(today)
+        except sqlite3.Error as e:
+            print(f"⚠️ [Local] 색인 갱신 실패: {e}")
+            return
+        s.set(added=added, removed=removed)
+    if added or removed:
+        print(f"📚 [Local] 색인 갱신: 추가 {added}건, 정리 {removed}건 (총 {len(index):,}건)")
+
+
+# ==========================================
+# 4. 실행부 (초기 적재 / 조회)
+# ==========================================
+def import_search_cache(index, path=search_cache.CACHE_PATH):
+    """검색 캐시에 남아 있는 지난 검색 결과를 색인에 적재합니다. (처음 한 번 초기화용)"""
+    if not os.path.exists(path):
+        return 0
+    conn = sqlite3.connect(path)
+    added = 0
+    try:
+        for created_at, payload in conn.execute("SELECT created_at, payload FROM search_cache"):
+            crawled = datetime.date.fromtimestamp(created_at).isoformat()
+            results = json.loads(zlib.decompress(payload).decode("utf-8"))
+            added += index.add_results(results, crawled)
+    finally:
+        conn.close()
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="지난 크롤링 기사 로컬 검색 색인")
+    parser.add_argument("--import-cache", action="store_true", help="검색 캐시의 지난 결과를 적재")
+    parser.add_argument("--query", help="질의 텍스트로 상위 문서 조회")
+    parser.add_argument("-k", type=int, default=5, help="조회 결과 수")
+    args = parser.parse_args()
+
+    index = get_index()
+    if args.import_cache:
+        print(f"📥 [Local] 검색 캐시에서 {import_search_cache(index)}건 적재")
+    if args.query:
+        started = time.perf_counter()
+        found = index.search(args.query, k=args.k)
+        elapsed = (time.perf_counter() - started) * 1000
+        for doc, relevance, cosine in found:
+            print(f"{relevance:.3f} (cos {cosine:.3f})  {doc['crawled']}  {doc['title'][:80]}")
+        print(f"⏱️ {elapsed:.1f}ms ({'numpy' if np is not None else 'pure python'})", file=sys.stderr)
+    print(f"📊 [Local] {index.stats()}")
@@ -1,27 +1,35 @@
 import os
-import sys
+import argparse
+from concurrent.futures import as_completed
 from datetime import datetime, date
-from pathlib import Path
-from dotenv import load_dotenv
-import google.generativeai as genai
 
 # 1. 크롤러 함수 가져오기
-from daily_news_crawler import get_morning_investment_briefing
+from daily_news_crawler import collect_briefing_sources, synthesize_report
+from pipeline import Pipeline
+import clients
+import delta_briefing
+import html_compact
+import llm_cache
+import metrics
+import post_index
+import retrieval_index
+import run_store
+import scheduler
+import search_cache
+import sources
+import streaming
+import structured_report
+import summarizer
 
 # ---------------------------------------------------------
 # 설정 (Settings & Init)
 # ---------------------------------------------------------
-env_path = Path(__file__).parent / ".env"
-load_dotenv(dotenv_path=env_path)
+# 글쓰기용 모델 (창의성/정리 능력 중요). 클라이언트는 clients 모듈이 첫 사용 시 생성
+EDITOR_MODEL_NAME = "gemini-2.5-flash"
 
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    raise ValueError("🚨 API 키 오류: .env 파일에서 GOOGLE_API_KEY를 찾을 수 없습니다.")
-
-# Gemini 설정
-genai.configure(api_key=GOOGLE_API_KEY)
-# 글쓰기용 모델 (창의성/정리 능력 중요)
-editor_model = genai.GenerativeModel("gemini-2.5-flash")
+# True면 에디터에게 HTML 원문 대신 간결한 Markdown 변환본을 보냅니다.
+# (<head>/CSS/style 속성/출처 목록 링크 제거 -> 프롬프트 토큰과 첫 응답 시간 감소)
+COMPACT_REWRITE = os.getenv("COMPACT_REWRITE", "1") != "0"
 
 # 경로 설정
 BLOG_DIR = os.path.join(
@@ -52,11 +60,39 @@ def get_desktop_path():
 # ---------------------------------------------------------
 # AI 에디터 함수 (HTML -> Engaging Blog Post)
 # ---------------------------------------------------------
-def rewrite_as_blog_post(html_content):
+def rewrite_as_blog_post(html_content, on_text=None, today_str=None, category=None):
+    """
+    HTML 리포트를 블로그용 Markdown 본문으로 다시 씁니다.
+    on_text를 주면 스트리밍으로 받아 조각마다 on_text(text)를 호출합니다.
+    today_str/category는 프롬프트에 들어가, 카테고리마다 다른 관점의 글이 나오게 합니다.
+    """
     print(
         "✍️ [AI Editor] HTML 리포트를 바탕으로 매력적인 블로그 초안을 작성 중입니다..."
     )
 
+    # [측정] HTML 원문과 에디터에게 보내는 리포트의 크기 비교
+    html_bytes, html_tokens = metrics.text_size(html_content)
+    if COMPACT_REWRITE:
+        report = html_compact.to_markdown(html_content)
+        report_label = "HTML 리포트 (Markdown 변환본, 문장 끝 [숫자]는 출처 ID)"
+        report_bytes, report_tokens = metrics.text_size(report)
+        print(
+            f"   🗜️ [AI Editor] 리포트 {html_tokens:,} -> {report_tokens:,} 토큰 "
+            f"({html_bytes / 1024:.1f}KB -> {report_bytes / 1024:.1f}KB)"
+        )
+    else:
+        report, report_label = html_content, "HTML 리포트 소스"
+        report_bytes, report_tokens = html_bytes, html_tokens
+
+    # 발행 정보: 같은 리포트라도 카테고리/날짜마다 다른 프롬프트 (응답 캐시도 따로)
+    post_info = ""
+    if today_str or category:
+        post_info = f"""
+    [발행 정보]
+    - 발행일: {today_str or "오늘"} (본문의 '오늘'은 이 날짜를 뜻합니다)
+    - 카테고리: {category or "briefing"} (이 카테고리 독자에 맞는 관점, 제목, 강조점으로 작성하세요)
+    """
+
     prompt = f"""
     당신은 'Crypto Oikonomos' 블로그의 **수석 전문 에디터**입니다.
     아래 제공된 [HTML 리포트]는 팩트 위주의 딱딱한 데이터입니다.
@@ -77,35 +113,42 @@ def rewrite_as_blog_post(html_content):
        - HTML 태그는 쓰지 말고, 오직 **Markdown 문법**만 사용하세요.
     5. **Constraint:** - 제공된 [HTML 리포트]에 없는 내용은 절대 지어내지 마십시오. (No Hallucination)
        - 분석이나 해석은 추가하되, 팩트는 유지하세요.
-
-    [HTML 리포트 소스]
-    {html_content}
+    {post_info}
+    [{report_label}]
+    {report}
     """
 
     try:
-        response = editor_model.generate_content(prompt)
-        return response.text
+        with metrics.span(
+            "gemini.rewrite",
+            stream=bool(on_text),
+            compact=COMPACT_REWRITE,
+            html_tokens=html_tokens,
+            report_tokens=report_tokens,
+        ):
+            editor_model = clients.get_model(EDITOR_MODEL_NAME)
+
+            def produce():
+                if on_text:
+                    return streaming.stream_generate(
+                        editor_model, prompt, on_text, label="Editor"
+                    )
+                response = scheduler.get_scheduler().call(
+                    "gemini", editor_model.generate_content, prompt
+                )
+                metrics.record_generation(response, prompt, response.text)
+                return response.text
+
+            return llm_cache.generate(EDITOR_MODEL_NAME, prompt, produce, on_text=on_text)
     except Exception as e:
         print(f"❌ [AI Editor Error] 글 작성 중 오류 발생: {e}")
         return None
 
 # ---------------------------------------------------------
-# 메인 로직
+# 단계(Stage) 함수
 # ---------------------------------------------------------
-def save_to_blog():
-    print("🚀 [System] 통합 브리핑 & 블로그 초안 생성 프로세스 시작...")
-
-    # 1. 날짜 및 폴더명 계산
-    now = datetime.now()
-    year = now.strftime("%Y")  # 2026
-    month_day = now.strftime("%m-%d")  # 01-30
-    today_str = now.strftime("%Y-%m-%d")
-
-    # [수석 책임자의 가이드] 인자가 있으면 해당 카테고리 사용 (예: study, insight)
-    category = sys.argv[1] if len(sys.argv) > 1 else "briefing"
-    folder_name = f"{month_day}-{category}"
-
-    # 2. [폴더 생성] 바탕화면 작업 폴더 & 프로젝트 이미지 폴더
+def prepare_folders(year, folder_name):
+    """[Prepare] 바탕화면 작업 폴더 & 프로젝트 이미지 폴더 생성"""
     desktop_target_dir = os.path.join(DESKTOP_PATH, "blog", year, folder_name) # 바탕화면용
     project_target_dir = os.path.join(PUBLIC_IMG_DIR, year, folder_name) # 프로젝트용
 
@@ -116,45 +159,68 @@ def save_to_blog():
         os.startfile(desktop_target_dir) # 탐색기 자동 열기
     except Exception as e:
         print(f"⚠️ [Warning] 폴더 생성 알림: {e}")
+    return True
 
-    # 3. 크롤러 실행 (데이터 수집)
+
+def collect_stage(store=None, today=None):
+    """[Collect] today(date, 기본값: 오늘) 기준 뉴스/컨텍스트 수집 및 프롬프트용 컨텍스트 조립"""
     try:
-        html_content = get_morning_investment_briefing()
-        if not html_content:
-            print("❌ [Error] HTML 내용이 비어있습니다. 중단합니다.")
-            return
+        return collect_briefing_sources(today=today, store=store)
     except Exception as e:
         print(f"❌ [Error] 크롤러 실행 중 오류: {e}")
-        return
+        return None
+
 
-    # 4. [소장용] HTML 파일 저장 (기존 방식 유지)
+def synthesize_stage(collected, html_path=None, store=None):
+    """
+    [Synthesize] HTML 리포트 생성 (html_path를 주면 스트리밍으로 바로 기록)
+    store가 있으면 컨텍스트가 같을 때 저장된 리포트를 재사용합니다. (Gemini 호출 없음)
+    """
     try:
-        save_folder = PERSONAL_DIR if os.path.exists(PERSONAL_DIR) else os.getcwd()
-        html_filename = f"Briefing_{date.today()}.html"
-        html_path = os.path.join(save_folder, html_filename)
+        if store is None:
+            html_content = synthesize_report(collected, stream_to=html_path)
+        else:
+            inputs = {
+                "context": run_store.inputs_hash(collected),
+                "model": clients.DEFAULT_MODEL,
+                "structured": structured_report.STRUCTURED,
+            }
+            html_content, _, reused = store.run(
+                "html",
+                "report.html",
+                inputs,
+                lambda: synthesize_report(collected, stream_to=html_path),
+            )
+            # 스트리밍 모드에서는 생성 중 소장용 파일을 쓰므로, 재사용 시 여기서 기록
+            if reused and html_path:
+                write_personal_copy(html_path, html_content)
+        if not html_content:
+            print("❌ [Error] HTML 내용이 비어있습니다. 중단합니다.")
+            return None
+        return html_content
+    except Exception as e:
+        print(f"❌ [Error] 리포트 생성 중 오류: {e}")
+        return None
+
 
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+def write_personal_copy(html_path, html_content):
+    """[Persist] 소장용 HTML 파일 저장 (기존 방식 유지)"""
+    try:
+        with metrics.span("write.html", bytes=metrics.text_size(html_content)[0]):
+            with open(html_path, "w", encoding="utf-8") as f:
+                f.write(html_content)
         print(f"\n✅ [Personal Copy] 소장용 리포트 저장 완료 ({html_path})")
+        return html_path
     except Exception as e:
         print(f"⚠️ [Warning] 소장용 저장 실패: {e}")
+        return None
 
-    # 5. [블로그용] AI 에디팅 및 MDX 저장
-    try:
-        # (1) AI에게 글쓰기 시키기
-        blog_body = rewrite_as_blog_post(html_content)
-
-        if not blog_body:
-            print("❌ 블로그 본문 생성 실패.")
-            return
-
-        # (2) 프론트매터(Frontmatter) 붙이기
-        today_str = datetime.now().strftime("%Y-%m-%d")
 
-        # 블로그에 표시될 요약문
-        summary_text = "오늘의 글로벌 암호화폐 인사이트 브리핑입니다."
+def build_frontmatter(today_str, category):
+    # 블로그에 표시될 요약문
+    summary_text = "오늘의 글로벌 암호화폐 인사이트 브리핑입니다."
 
-        mdx_content = f"""---
+    return f"""---
 title: '시장 브리핑: 오늘의 크립토 인사이트 ({today_str})'
 date: '{today_str}'
 tags: ['{category.capitalize()}']
@@ -162,26 +228,346 @@ def save_to_blog():
 summary: {summary_text}
 ---
 
-{blog_body}
 """
-        # (3) 파일 저장
-        mdx_content = mdx_content.replace("$", "\\$")
-        mdx_filename = f"{today_str}-{category}.mdx" # 파일명에도 카테고리 반영
-        mdx_path = os.path.join(BLOG_DIR, mdx_filename)
 
-        with open(mdx_path, "w", encoding="utf-8") as f:
-            f.write(mdx_content)
 
-        print(f"✅ [Blog Draft] 블로그 초안 생성 완료!")
+def get_mdx_path(today_str, category):
+    mdx_filename = f"{today_str}-{category}.mdx" # 파일명에도 카테고리 반영
+    return os.path.join(BLOG_DIR, mdx_filename)
+
+
+def rewrite_stage(html_content, today_str, category, stream=False, store=None):
+    """
+    [Rewrite] AI 에디터로 블로그 본문 작성.
+    스트리밍 모드에서는 프론트매터와 본문을 .part 파일에 바로 기록합니다.
+    store가 있으면 리포트/카테고리가 같을 때 저장된 본문을 재사용합니다.
+    """
+    if store is None:
+        return _rewrite(html_content, today_str, category, stream)
+
+    inputs = {
+        "html": run_store.content_hash(html_content),
+        "date": today_str,
+        "category": category,
+        "model": EDITOR_MODEL_NAME,
+        "compact": COMPACT_REWRITE,
+        "post_info": True,  # 프롬프트에 발행일/카테고리 포함 (이전 산출물과 구분)
+    }
+    blog_body, _, reused = store.run(
+        "mdx",
+        f"mdx-{today_str}-{category}.md",
+        inputs,
+        lambda: _rewrite(html_content, today_str, category, stream),
+    )
+    # 스트리밍 모드의 persist는 .part 파일을 교체하므로, 재사용 시 .part를 직접 만들어 둠
+    if reused and stream and blog_body:
+        mdx_content = f"{build_frontmatter(today_str, category)}{blog_body}\n"
+        with open(f"{get_mdx_path(today_str, category)}.part", "w", encoding="utf-8") as f:
+            f.write(mdx_content.replace("$", "\\$"))
+    return blog_body
+
+
+def _rewrite(html_content, today_str, category, stream):
+    if not stream:
+        return rewrite_as_blog_post(html_content, today_str=today_str, category=category)
+
+    part_path = f"{get_mdx_path(today_str, category)}.part"
+    with open(part_path, "w", encoding="utf-8") as f:
+        f.write(build_frontmatter(today_str, category).replace("$", "\\$"))
+
+        # 조각이 도착할 때마다 '$' 이스케이프 후 바로 기록
+        def on_text(text):
+            f.write(text.replace("$", "\\$"))
+            f.flush()
+
+        blog_body = rewrite_as_blog_post(
+            html_content, on_text=on_text, today_str=today_str, category=category
+        )
+        f.write("\n")
+
+    if not blog_body:
+        os.remove(part_path)
+    return blog_body
+
+
+def persist_stage(blog_body, today_str, category, stream=False, source_list=None):
+    """
+    [Persist] MDX 초안 저장 (스트리밍 모드에서는 .part 파일을 원자적으로 교체)
+    source_list(sources.Article 목록)가 있으면 본문 끝에 참고 자료 섹션을 붙입니다.
+    """
+    if not blog_body:
+        print(f"❌ [{category}] 블로그 본문 생성 실패.")
+        return None
+
+    try:
+        mdx_path = get_mdx_path(today_str, category)
+        with metrics.span("write.mdx", category=category) as s:
+            sources_md = sources.render_mdx_sources(source_list).replace("$", "\\$")
+            if stream:
+                if sources_md:
+                    with open(f"{mdx_path}.part", "a", encoding="utf-8") as f:
+                        f.write(sources_md)
+                os.replace(f"{mdx_path}.part", mdx_path)
+            else:
+                mdx_content = f"{build_frontmatter(today_str, category)}{blog_body}\n"
+                mdx_content = mdx_content.replace("$", "\\$") + sources_md
+
+                with open(mdx_path, "w", encoding="utf-8") as f:
+                    f.write(mdx_content)
+            s.set(bytes=os.path.getsize(mdx_path))
+
+        # 글 목록 색인에 이 글만 반영 (다른 도구가 data/blog 전체를 다시 읽지 않도록)
+        try:
+            post_index.record_post(mdx_path, BLOG_DIR)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [Post Index] 색인 갱신 실패: {e}")
+
+        print(f"✅ [Blog Draft] 블로그 초안 생성 완료! ({category})")
         print(f"📂 위치: {mdx_path}")
         print(f"💡 [Next Step] 탐색기에 이미지를 넣고 'python image_processor.py {category}'를 실행하세요.")
-
+        return mdx_path
     except Exception as e:
         print(f"❌ [Error] 블로그 처리 중 오류: {e}")
+        return None
+
+
+# ---------------------------------------------------------
+# 메인 로직
+# ---------------------------------------------------------
+def parse_dates(values):
+    """'YYYY-MM-DD' 목록(쉼표 구분 허용)을 검증하여 중복 없이 반환합니다."""
+    dates = []
+    for value in values or []:
+        for item in value.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            # 형식 검증 (틀리면 ValueError), 아직 오지 않은 날짜는 수집할 뉴스가 없으므로 거부
+            if datetime.strptime(item, "%Y-%m-%d").date() > date.today():
+                raise ValueError(f"미래 날짜: {item}")
+            if item not in dates:
+                dates.append(item)
+    return dates
+
+
+def save_to_blog(categories=None, dates=None, stream=False, from_stage=None):
+    """
+    날짜마다 collect -> synthesize -> (rewrite -> persist) x 카테고리 순서의 파이프라인.
+
+    크롤링과 HTML 리포트 생성은 날짜마다 한 번씩(그 날짜 기준으로) 수행하고,
+    카테고리마다 AI 에디팅(rewrite)만 공유 워커 풀에서 동시에 진행합니다.
+    날짜 D개 x 카테고리 N개 = 크롤링 D회 + 리라이트 D x N회.
+
+    단계별 산출물(search/context/html/mdx)은 .cache/runs/<날짜>/에 저장되며,
+    다시 실행하면 입력이 바뀌지 않은 단계는 건너뜁니다. from_stage부터는 강제로 다시 실행합니다.
+    저장에 성공한 MDX 경로 목록을 반환합니다.
+    """
+    print("🚀 [System] 통합 브리핑 & 블로그 초안 생성 프로세스 시작...")
+
+    # 1. 날짜 및 카테고리 조합 계산
+    # [수석 책임자의 가이드] 인자가 있으면 해당 카테고리 사용 (예: study, insight)
+    categories = categories or ["briefing"]
+    dates = dates or [datetime.now().strftime("%Y-%m-%d")]
+    jobs = [(day, category) for day in dates for category in categories]
+    if len(jobs) > 1:
+        print(f"📦 [Batch] {len(dates)}개 날짜 x {len(categories)}개 카테고리 = {len(jobs)}개 초안")
+
+    # 소장용 HTML 폴더 (스트리밍 모드에서는 생성과 동시에 Briefing_<날짜>.html에 기록)
+    save_folder = PERSONAL_DIR if os.path.exists(PERSONAL_DIR) else os.getcwd()
+
+    written = []
+    reports = {}  # 날짜 -> (collected, html_content, 출처 목록)
+    with Pipeline() as pipeline:
+        # 2. [폴더 생성] 크롤링과 겹쳐서 실행
+        for day, category in jobs:
+            year, month_day = day[:4], day[5:]  # 2026, 01-30
+            pipeline.submit(
+                "prepare",
+                f"{day} {category}",
+                prepare_folders,
+                year,
+                f"{month_day}-{category}",
+            )
+
+        rewrites = {}
+        for day in dates:
+            # 3. 크롤러 실행 (그 날짜 기준 수집) -> HTML 리포트 생성 (그 날짜의 모든 초안이 공유)
+            store = run_store.RunStore(day, from_stage=from_stage)
+            print(f"🗂️ [Run] 실행 디렉터리: {store.path}")
+            html_path = os.path.join(save_folder, f"Briefing_{day}.html")
+
+            collected = pipeline.run(
+                "collect",
+                f"crawl {day}",
+                collect_stage,
+                store,
+                datetime.strptime(day, "%Y-%m-%d").date(),
+            )
+            if not collected:
+                continue
+
+            html_content = pipeline.run(
+                "synthesize",
+                f"html report {day}",
+                synthesize_stage,
+                collected,
+                html_path if stream else None,
+                store,
+            )
+            if not html_content:
+                continue
+            reports[day] = (collected, html_content, sources.from_dicts(collected["sources"]))
+
+            # 4. [소장용] HTML 저장과 5. [블로그용] AI 에디팅을 동시에 시작
+            # (다음 날짜의 크롤링은 이 날짜의 에디팅과 겹쳐서 진행)
+            if stream:
+                print(f"\n✅ [Personal Copy] 소장용 리포트 스트리밍 저장 완료 ({html_path})")
+            else:
+                pipeline.submit(
+                    "persist", f"personal html {day}", write_personal_copy, html_path, html_content
+                )
+
+            for category in categories:
+                future = pipeline.submit(
+                    "rewrite",
+                    f"{day} {category}",
+                    rewrite_stage,
+                    html_content,
+                    day,
+                    category,
+                    stream,
+                    store,
+                )
+                rewrites[future] = (day, category)
+
+        # 6. MDX 저장 (에디팅이 끝나는 순서대로)
+        for future in as_completed(rewrites):
+            day, category = rewrites[future]
+            try:
+                blog_body = future.result()
+            except Exception as e:
+                print(f"❌ [AI Editor Error] {category} 작성 중 오류 발생: {e}")
+                blog_body = None
+            mdx_path = pipeline.run(
+                "persist",
+                f"mdx {day} {category}",
+                persist_stage,
+                blog_body,
+                day,
+                category,
+                stream,
+                reports[day][2],
+            )
+            if mdx_path:
+                written.append(mdx_path)
+
+    # 낮/저녁 업데이트(delta_briefing)가 오늘 본 기사와 리포트 요약을 기준으로 삼도록 기록
+    today_str = str(date.today())
+    today_written = [p for p in written if os.path.basename(p).startswith(f"{today_str}-")]
+    if today_str in reports and today_written:
+        collected, html_content, _ = reports[today_str]
+        try:
+            delta_briefing.record_briefing(collected, html_content, today_written)
+        except OSError as e:
+            print(f"⚠️ [Delta] 상태 저장 실패: {e}")
+
+    pipeline.print_summary()
+    return written
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="통합 브리핑 & 블로그 초안 생성 (날짜별 크롤링 1회로 여러 카테고리 처리)"
+    )
+    parser.add_argument(
+        "categories",
+        nargs="*",
+        help="카테고리 목록 (예: briefing study insight, 쉼표 구분 가능). 기본값: briefing",
+    )
+    parser.add_argument(
+        "--date",
+        dest="dates",
+        action="append",
+        help="초안 날짜 YYYY-MM-DD (여러 번 지정 또는 쉼표 구분 가능, 날짜마다 그날 기준으로 수집). 기본값: 오늘",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Gemini 응답을 받는 즉시 HTML/MDX 파일에 기록",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="검색 캐시를 무시하고 새로 수집 (결과는 캐시에 다시 저장)",
+    )
+    parser.add_argument(
+        "--structured",
+        action="store_true",
+        help="모델은 섹션 내용만 JSON으로 생성하고 HTML 리포트는 로컬 템플릿으로 렌더링",
+    )
+    parser.add_argument(
+        "--raw-html-rewrite",
+        action="store_true",
+        help="에디터에게 Markdown 변환본 대신 HTML 리포트 원문을 그대로 전달",
+    )
+    parser.add_argument(
+        "--live-context",
+        action="store_true",
+        help="배경 리포트(Context) 트랙도 로컬 색인 대신 항상 실시간 검색",
+    )
+    parser.add_argument(
+        "--refresh-llm",
+        action="store_true",
+        help="저장된 Gemini 응답을 무시하고 새로 생성 (결과는 캐시에 다시 저장)",
+    )
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="기사별 요약을 병렬로 먼저 만들고 요약본으로 최종 리포트 생성 (대량 수집용)",
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=run_store.STAGES,
+        help="이 단계부터 저장된 산출물을 무시하고 다시 실행 (기본: 입력이 바뀐 단계만)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=metrics.PROFILERS,
+        help="프로파일러로 실행하여 결과를 .cache/metrics에 저장",
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        search_cache.BYPASS = True
+    if args.structured:
+        structured_report.STRUCTURED = True
+    if args.raw_html_rewrite:
+        COMPACT_REWRITE = False
+    if args.live_context:
+        retrieval_index.LOCAL_CONTEXT = False
+    if args.refresh_llm:
+        llm_cache.REFRESH = True
+    if args.map_reduce:
+        summarizer.MAP_REDUCE = True
+
+    categories = [
+        c.strip() for arg in args.categories for c in arg.split(",") if c.strip()
+    ]
+    try:
+        dates = parse_dates(args.dates)
+    except ValueError:
+        parser.error("--date는 오늘 또는 지난 날짜(YYYY-MM-DD)여야 합니다.")
+
     if not os.path.exists(BLOG_DIR):
         print(f"❌ 블로그 폴더 누락")
     else:
-        save_to_blog()
+        # 구간별 측정은 .cache/metrics/blog-<시각>.jsonl에 기록되고 끝에 요약 표를 출력
+        metrics.start_run("blog")
+        with metrics.profiled(args.profile, name="blog"):
+            save_to_blog(
+                categories=categories,
+                dates=dates,
+                stream=args.stream,
+                from_stage=args.from_stage,
+            )
+        metrics.print_summary()
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+import metrics
+import search_cache
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 실행 디렉터리: automation/.cache/runs/<날짜>/ (단계별 산출물 + manifest.json)
+RUNS_DIR = os.path.join(search_cache.CACHE_DIR, "runs")
+MANIFEST_NAME = "manifest.json"
+
+# 단계 순서 (--from-stage 기준). 앞 단계 산출물의 해시가 뒷 단계의 입력이 됩니다.
+# search: 트랙별 원본 검색 결과 / context: 필터링·중복 제거 후 조립한 컨텍스트
+# html: McKinsey 스타일 리포트 / mdx: 카테고리별 블로그 본문
+STAGES = ("search", "context", "html", "mdx")
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def serialize(name, content):
+    """산출물을 파일에 쓸 텍스트로 변환합니다. (.json이면 JSON 직렬화)"""
+    if name.endswith(".json"):
+        return json.dumps(content, ensure_ascii=False, indent=1)
+    return content
+
+
+def inputs_hash(inputs):
+    """단계 입력(dict)을 정규화하여 해시합니다."""
+    raw = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return content_hash(raw)
+
+
+# ==========================================
+# 2. 실행 저장소
+# ==========================================
+class RunStore:
+    """
+    make처럼 동작하는 작은 단계 저장소.
+
+    각 산출물은 manifest에 (입력 해시, 내용 해시)와 함께 기록됩니다.
+    다시 실행할 때 입력 해시가 같으면 저장된 산출물을 그대로 쓰고(API 호출 없음),
+    다르면 다시 만듭니다. 산출물 파일을 직접 고치면 내용 해시가 바뀌므로
+    그 뒤 단계만 다시 실행됩니다.
+
+    from_stage를 주면 해당 단계와 그 이후 단계는 입력과 관계없이 다시 만듭니다.
+    """
+
+    def __init__(self, run_key, root=RUNS_DIR, from_stage=None):
+        if from_stage is not None and from_stage not in STAGES:
+            raise ValueError(f"알 수 없는 단계: {from_stage} (가능: {', '.join(STAGES)})")
+        self.run_key = run_key
+        self.path = os.path.join(root, run_key)
+        self.from_stage = from_stage
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.path, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def forced(self, stage):
+        """from_stage 지정으로 강제 재실행 대상인지"""
+        if self.from_stage is None:
+            return False
+        return STAGES.index(stage) >= STAGES.index(self.from_stage)
+
+    def lookup(self, stage, name, inputs):
+        """
+        입력이 같은 최신 산출물이 있으면 (내용, 내용 해시)를, 없으면 None을 반환합니다.
+        name은 파일명이며 .json이면 JSON으로 읽습니다.
+        """
+        if self.forced(stage):
+            return None
+        with self._lock:
+            record = self._manifest.get(name)
+        if not record or record.get("inputs") != inputs_hash(inputs):
+            return None
+
+        try:
+            with open(os.path.join(self.path, name), "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+
+        sha = content_hash(text)
+        if sha != record.get("sha256"):
+            print(f"   ✏️ [Run] {name} 내용이 바뀌어 이후 단계를 다시 실행합니다.")
+        content = json.loads(text) if name.endswith(".json") else text
+        return content, sha
+
+    def save(self, stage, name, inputs, content):
+        """산출물을 원자적으로 저장하고 manifest를 갱신한 뒤 내용 해시를 반환합니다."""
+        text = serialize(name, content)
+        sha = content_hash(text)
+
+        os.makedirs(self.path, exist_ok=True)
+        file_path = os.path.join(self.path, name)
+        tmp_path = file_path + ".tmp"
+        with metrics.span("write.artifact", stage=stage, bytes=metrics.text_size(text)[0]):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, file_path)
+
+        with self._lock:
+            self._manifest[name] = {
+                "stage": stage,
+                "inputs": inputs_hash(inputs),
+                "sha256": sha,
+                "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save_manifest()
+        return sha
+
+    def run(self, stage, name, inputs, build, keep=None):
+        """
+        저장된 산출물이 최신이면 재사용하고, 아니면 build()로 만들어 저장합니다.
+        keep(content)가 False이면 (예: 일부 트랙 검색 실패) 저장하지 않아 다음 실행에서 다시 만듭니다.
+        반환: (내용, 내용 해시, 재사용 여부). build()가 None을 반환하면 (None, None, False)
+        """
+        found = self.lookup(stage, name, inputs)
+        if found is not None:
+            content, sha = found
+            print(f"   ♻️ [Run] {stage} 재사용: {name} ({sha[:10]})")
+            metrics.record(f"reuse.{stage}", 0.0, artifact=name)
+            return content, sha, True
+
+        content = build()
+        if content is None:
+            return None, None, False
+        if keep is not None and not keep(content):
+            print(f"   ⚠️ [Run] {name} 결과가 불완전하여 저장하지 않습니다.")
+            return content, content_hash(serialize(name, content)), False
+        try:
+            sha = self.save(stage, name, inputs, content)
+        except OSError as e:
+            print(f"   ⚠️ [Run] {name} 저장 실패 (다음 실행에서 다시 생성): {e}")
+            sha = content_hash(serialize(name, content))
+        return content, sha, False
@@ -0,0 +1,320 @@
+import os
+import time
+import random
+import threading
+
+import metrics
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 공급자별 호출 정책
+# - rate/burst: 토큰 버킷 (초당 허용 호출 수 / 순간 최대 호출 수)
+# - max_attempts: 재시도 포함 최대 시도 횟수
+# - base_delay/max_delay: 지수 백오프 범위(초), full jitter 적용
+# - deadline: 호출 1건(재시도 포함)에 허용하는 총 시간(초)
+# - failure_threshold/reset_timeout: 연속 실패 N회 시 차단, reset_timeout 후 1건 시험 호출
+PROVIDER_POLICIES = {
+    "tavily": {
+        "rate": float(os.getenv("TAVILY_RATE_PER_SEC", "2")),
+        "burst": 4,
+        "max_attempts": 4,
+        "base_delay": 1.0,
+        "max_delay": 20.0,
+        "deadline": 120.0,
+        "failure_threshold": 5,
+        "reset_timeout": 60.0,
+    },
+    "gemini": {
+        "rate": float(os.getenv("GEMINI_RATE_PER_SEC", "0.5")),
+        "burst": 2,
+        "max_attempts": 4,
+        "base_delay": 2.0,
+        "max_delay": 60.0,
+        "deadline": 600.0,
+        "failure_threshold": 3,
+        "reset_timeout": 120.0,
+    },
+}
+DEFAULT_POLICY = PROVIDER_POLICIES["tavily"]
+
+# 재시도할 가치가 있는 오류 (HTTP 상태 코드 / 예외 클래스 이름 일부)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_NAMES = (
+    "Timeout",
+    "RateLimit",
+    "TooManyRequests",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "DeadlineExceeded",
+    "Connection",
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """연속 실패로 차단된 공급자에 호출을 시도한 경우"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """재시도를 포함한 호출 제한 시간을 넘긴 경우"""
+
+
+def is_retryable(error):
+    """
+    일시적 오류(429, 5xx, 타임아웃, 연결 오류)인지 상태 코드와 예외 타입으로만 판단합니다.
+    (메시지 본문의 숫자는 보지 않음: "4290 tokens" 같은 문구를 429로 오인하지 않도록)
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    for attr in ("status_code", "code", "status"):
+        value = getattr(error, attr, None)
+        value = getattr(value, "value", value)  # enum 형태 대응
+        if isinstance(value, int) and value in RETRYABLE_STATUS:
+            return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in RETRYABLE_STATUS:
+        return True
+
+    name = type(error).__name__
+    return any(token in name for token in RETRYABLE_NAMES)
+
+
+def run_with_timeout(fn, args, kwargs, timeout, label="call"):
+    """
+    fn(*args, **kwargs)를 데몬 스레드에서 실행하고 timeout초 안에 끝나지 않으면
+    DeadlineExceededError를 냅니다. 응답 없이 멈춘 요청이 호출 제한 시간을 넘기지 않게 하는 용도이며,
+    멈춘 요청 자체는 취소할 수 없으므로 스레드는 백그라운드에서 끝날 때까지 버려둡니다.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    worker = threading.Thread(target=target, name=f"{label}-attempt", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise DeadlineExceededError(f"{label} 호출이 {timeout:.1f}s 안에 응답하지 않았습니다.")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+# ==========================================
+# 2. 구성 요소
+# ==========================================
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷. acquire()는 토큰이 생길 때까지 기다립니다."""
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """토큰 1개를 가져옵니다. timeout 안에 못 가져오면 False."""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    closed(정상) -> 연속 실패 failure_threshold회 -> open(즉시 거절)
+    -> reset_timeout 경과 -> half-open(시험 호출 1건) -> 성공 시 closed / 실패 시 open
+    """
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+# ==========================================
+# 3. 호출 스케줄러
+# ==========================================
+class CallScheduler:
+    """
+    공급자(tavily/gemini)별 토큰 버킷 + 지수 백오프(jitter) + 호출 제한 시간 + 서킷 브레이커.
+
+    scheduler.call("tavily", client.search, query=..., max_results=...)
+    """
+
+    def __init__(self, policies=None, clock=time.monotonic, sleep=time.sleep, rng=None):
+        self.policies = policies or PROVIDER_POLICIES
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._buckets = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _policy(self, provider):
+        return self.policies.get(provider, DEFAULT_POLICY)
+
+    def _components(self, provider):
+        with self._lock:
+            if provider not in self._buckets:
+                policy = self._policy(provider)
+                self._buckets[provider] = TokenBucket(
+                    policy["rate"], policy["burst"], self._clock, self._sleep
+                )
+                self._breakers[provider] = CircuitBreaker(
+                    policy["failure_threshold"], policy["reset_timeout"], self._clock
+                )
+                self.stats[provider] = {"calls": 0, "retries": 0, "failures": 0}
+            return self._buckets[provider], self._breakers[provider]
+
+    def _count(self, provider, key):
+        with self._lock:
+            self.stats[provider][key] += 1
+
+    def backoff(self, provider, attempt):
+        """attempt번째 실패 후 대기 시간 (full jitter: 0 ~ min(max, base * 2^attempt))"""
+        policy = self._policy(provider)
+        ceiling = min(policy["max_delay"], policy["base_delay"] * (2**attempt))
+        return self._rng.uniform(0, ceiling)
+
+    def call(self, provider, fn, *args, deadline=None, **kwargs):
+        """
+        fn(*args, **kwargs)를 공급자 정책에 따라 호출합니다.
+        제한 시간(deadline, 기본값: 정책의 deadline)은 대기/재시도뿐 아니라 진행 중인 시도에도 적용됩니다.
+        """
+        policy = self._policy(provider)
+        bucket, breaker = self._components(provider)
+        deadline_at = self._clock() + (deadline or policy["deadline"])
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"{provider} 호출이 연속 실패로 일시 차단되었습니다. (circuit open)"
+                )
+
+            remaining = deadline_at - self._clock()
+            if remaining <= 0 or not bucket.acquire(timeout=remaining):
+                breaker.record_failure()
+                raise DeadlineExceededError(f"{provider} 호출 제한 시간 초과")
+
+            self._count(provider, "calls")
+            metrics.increment(api_calls=1)
+            try:
+                result = run_with_timeout(
+                    fn, args, kwargs, max(0.0, deadline_at - self._clock()), label=provider
+                )
+            except DeadlineExceededError:
+                # 남은 시간을 다 쓴 시도이므로 재시도하지 않음
+                breaker.record_failure()
+                self._count(provider, "failures")
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    # 잘못된 요청 등은 공급자 장애가 아니므로 차단 판정에 넣지 않음
+                    breaker.record_success()
+                    self._count(provider, "failures")
+                    raise
+
+                breaker.record_failure()
+                attempt += 1
+                if attempt >= policy["max_attempts"]:
+                    self._count(provider, "failures")
+                    raise
+
+                delay = self.backoff(provider, attempt - 1)
+                if self._clock() + delay >= deadline_at:
+                    self._count(provider, "failures")
+                    raise
+
+                self._count(provider, "retries")
+                metrics.increment(retries=1)
+                print(
+                    f"   🔁 [{provider}] 일시 오류로 재시도 {attempt}/{policy['max_attempts'] - 1} "
+                    f"({delay:.1f}s 후): {type(e).__name__}: {str(e)[:80]}"
+                )
+                self._sleep(delay)
+                continue
+
+            breaker.record_success()
+            return result
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """프로세스 전체에서 공유하는 스케줄러 (첫 호출 시 생성)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = CallScheduler()
+        return _scheduler
+
+
+def set_scheduler(instance):
+    """공유 스케줄러를 교체합니다. (벤치마크/테스트에서 속도 제한 없는 인스턴스 주입용, None이면 초기화)"""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = instance
@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 캐시 저장 위치 (automation/.cache)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "search_cache.sqlite3")
+
+# 트랙 타입별 유효 기간(초): 속보는 몇 시간, 배경 리포트는 며칠
+TTL_BY_TYPE = {
+    "news": 6 * 60 * 60,
+    "context": 7 * 24 * 60 * 60,
+}
+DEFAULT_TTL = TTL_BY_TYPE["news"]
+
+# 디스크 사용량 상한 (압축 후 기준). 넘으면 가장 오래 안 쓴 항목부터 삭제(LRU)
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# True면 캐시를 읽지 않고 항상 새로 검색합니다. (결과는 다시 저장)
+BYPASS = os.getenv("SEARCH_CACHE_BYPASS", "") == "1"
+
+
+def make_key(query, count, days, topic, time_range, domains):
+    """검색 파라미터 전체를 정규화하여 캐시 키(sha256)를 만듭니다."""
+    raw = json.dumps(
+        [query, count, days, topic, time_range, sorted(domains or [])],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ==========================================
+# 2. 캐시 본체
+# ==========================================
+class SearchCache:
+    """
+    SQLite 한 파일에 zlib으로 압축한 JSON을 저장하는 검색 결과 캐시.
+    병렬 검색(스레드)에서 함께 쓰므로 연결 하나를 Lock으로 보호합니다.
+    clock(유닉스 시각)을 주입하면 가짜 시계로 유효 기간을 확인할 수 있습니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                track_type TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key, track_type="news", max_age=None):
+        """
+        유효 기간 내의 결과가 있으면 반환, 없으면 None.
+        max_age(초)를 주면 유효 기간보다 짧게, 저장된 지 max_age 이내인 결과만 인정합니다.
+        (기간이 지났을 뿐 TTL 안의 항목은 지우지 않음)
+        """
+        ttl = TTL_BY_TYPE.get(track_type, DEFAULT_TTL)
+        now = self._clock()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, payload FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            created_at, payload = row
+            if now - created_at > ttl:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            if max_age is not None and now - created_at > max_age:
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+    def put(self, key, results, track_type="news"):
+        payload = zlib.compress(
+            json.dumps(results, ensure_ascii=False).encode("utf-8"), 6
+        )
+        now = self._clock()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, track_type, now, now, len(payload), payload),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """용량 상한을 넘으면 last_access가 오래된 순서대로 삭제합니다. (Lock 보유 상태에서 호출)"""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM search_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM search_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 전체에서 공유하는 캐시 인스턴스를 반환합니다. (첫 호출 시 생성)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
+
+
+def set_cache(instance):
+    """공유 캐시를 교체합니다. (벤치마크/테스트에서 임시 경로의 캐시 주입용, None이면 초기화)"""
+    global _cache
+    with _cache_lock:
+        _cache = instance
@@ -0,0 +1,173 @@
+import datetime
+from email.utils import parsedate_to_datetime
+from html import escape
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 발행일 기준 허용 기간(일)
+# - news: 검색 기간(plan["days"]) + 시차/지연 여유
+# - context: 연간 보고서 위주이므로 2년까지
+NEWS_GRACE_DAYS = 2
+CONTEXT_MAX_AGE_DAYS = 730
+
+# 출처 목록 표기 (HTML 리포트 하단)
+_LABELS = {"context": "📄 REPORT", "news": "📰 NEWS"}
+_LABEL_STYLES = {"context": "color:#005a9c; font-weight:bold;", "news": "color:#666;"}
+
+
+def parse_published_date(value):
+    """
+    Tavily published_date를 UTC 기준 datetime으로 바꿉니다.
+    RFC 2822("Tue, 27 Jan 2026 14:00:00 GMT")와 ISO 8601을 지원하며, 해석할 수 없으면 None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+def max_age_days(plan):
+    if plan["type"] == "context":
+        return CONTEXT_MAX_AGE_DAYS
+    return plan.get("days", 1) + NEWS_GRACE_DAYS
+
+
+# ==========================================
+# 2. 기사(출처) 레코드
+# ==========================================
+class Article:
+    """
+    검색 결과 1건. 원본 dict의 문자열(title/url/content)을 복사하지 않고 그대로 참조하며,
+    category/track_type은 검색 계획의 문자열을 공유합니다.
+    출력 형식(프롬프트/HTML/MDX)은 필요할 때만 렌더링합니다.
+    """
+
+    __slots__ = (
+        "id", "track_type", "category", "title", "url", "published", "content", "relevance"
+    )
+
+    def __init__(
+        self, track_type, category, title, url, published, content="", id=None, relevance=None
+    ):
+        self.id = id
+        self.track_type = track_type
+        self.category = category
+        self.title = title
+        self.url = url
+        self.published = published
+        self.content = content
+        self.relevance = relevance  # Tavily score (0~1)
+
+    @classmethod
+    def from_result(cls, result, plan):
+        """Tavily 검색 결과 dict -> Article"""
+        return cls(
+            plan["type"],
+            plan["category"],
+            result.get("title") or "",
+            result.get("url") or "",
+            parse_published_date(result.get("published_date")),
+            result.get("raw_content") or "",
+            relevance=result.get("score"),
+        )
+
+    @property
+    def date_str(self):
+        return self.published.date().isoformat() if self.published else ""
+
+    @property
+    def datetime_str(self):
+        """'YYYY-MM-DD HH:MM UTC' (같은 날 기사들의 선후를 모델이 구분할 수 있도록)"""
+        return self.published.strftime("%Y-%m-%d %H:%M UTC") if self.published else ""
+
+    def age_days(self, today):
+        """today(date) 기준 경과 일수. 발행일이 없으면 None"""
+        if self.published is None:
+            return None
+        return (today - self.published.date()).days
+
+    def is_recent(self, today, max_age):
+        """발행일이 max_age일 이내인지 (발행일이 없는 기사는 통과)"""
+        age = self.age_days(today)
+        return age is None or age <= max_age
+
+    # ---------- 렌더러 ----------
+    def prompt_header(self):
+        """[Source Data] 블록의 기사 머리말"""
+        return (
+            f"\n[Article ID: {self.id} | Type: {self.track_type.upper()} | Category: {self.category}]\n"
+            f"Title: {self.title}\n"
+            f"Date: {self.datetime_str}\n"
+        )
+
+    def html_item(self):
+        """HTML 리포트 하단 Source Verification 목록의 <li>"""
+        label = _LABELS.get(self.track_type, _LABELS["news"])
+        style = _LABEL_STYLES.get(self.track_type, _LABEL_STYLES["news"])
+        return (
+            f"<li style='margin-bottom: 5px;'><b>[{self.id}]</b> "
+            f"<span style='font-size:0.8em; {style}'>[{label}]</span> "
+            f"<span style='color:#666; font-size:0.9em'>({self.date_str})</span> "
+            f"<a href='{escape(self.url, quote=True)}' target='_blank' "
+            f"style='color:#051c2c; text-decoration:none; border-bottom:1px solid #ccc;'>"
+            f"{escape(self.title, quote=False)}</a></li>"
+        )
+
+    def mdx_item(self):
+        """MDX 참고 자료 목록의 한 줄"""
+        title = self.title.replace("[", "(").replace("]", ")")
+        date = f" ({self.date_str})" if self.date_str else ""
+        return f"- [{self.id}] [{title}]({self.url}){date}"
+
+    # ---------- 직렬화 (run_store 산출물용, 본문 제외) ----------
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "type": self.track_type,
+            "category": self.category,
+            "title": self.title,
+            "url": self.url,
+            "published": self.published.isoformat() if self.published else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        published = data.get("published")
+        return cls(
+            data["type"],
+            data["category"],
+            data["title"],
+            data["url"],
+            datetime.datetime.fromisoformat(published) if published else None,
+            id=data["id"],
+        )
+
+
+def from_dicts(items):
+    return [Article.from_dict(item) for item in items]
+
+
+def render_html_footer(articles):
+    """리포트 </body> 직전에 붙일 출처 목록 (닫는 태그 포함)"""
+    return (
+        "<div class='footer'><h3>✅ Source Verification</h3>"
+        + "".join(article.html_item() for article in articles)
+        + "</div></body></html>"
+    )
+
+
+def render_mdx_sources(articles):
+    """블로그 초안 끝에 붙일 참고 자료 섹션 (출처가 없으면 빈 문자열)"""
+    if not articles:
+        return ""
+    return "\n## 참고 자료\n\n" + "\n".join(article.mdx_item() for article in articles) + "\n"
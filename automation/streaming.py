@@ -0,0 +1,132 @@
+import re
+import time
+
+import metrics
+import scheduler
+
+# ==========================================
+# 1. HTML 스트림 정리기 (Incremental State Machine)
+# ==========================================
+DOCTYPE = "<!DOCTYPE html>"
+
+# 제거할 토큰(코드 펜스, </html>)과 본문 종료 토큰(</body>)
+_TOKEN_RE = re.compile(r"```html|```|</html>|</body>")
+
+# 청크 경계에 걸쳐 있을 수 있는 토큰을 위해 끝부분 (가장 긴 토큰 길이-1)글자는 보류
+_HOLD_BACK = len("```html") - 1
+
+
+class HtmlStreamCleaner:
+    """
+    Gemini가 조각(chunk)으로 보내는 HTML을 받아 바로 내보낼 수 있는 부분만 돌려줍니다.
+
+    - ```html / ``` 코드 펜스와 </html> 제거
+    - 문서 맨 앞에 <!DOCTYPE html>이 없으면 삽입
+    - </body>를 만나면 그 이후는 버림 (출처 footer를 뒤에 이어 붙이기 위함)
+
+    상태: "start"(DOCTYPE 판정 전) -> "body"(본문 출력 중) -> "closed"(</body> 이후)
+    """
+
+    def __init__(self):
+        self.state = "start"
+        self._buffer = ""
+        self._pending = ""
+
+    def feed(self, chunk):
+        if self.state == "closed" or not chunk:
+            return ""
+        self._buffer += chunk
+        return self._drain(final=False)
+
+    def close(self):
+        """스트림 종료 시 보류 중이던 나머지를 내보냅니다."""
+        if self.state == "closed":
+            return ""
+        out = self._drain(final=True)
+        self.state = "closed"
+        return out
+
+    def process(self, text):
+        """스트리밍이 아닌 전체 응답을 한 번에 정리합니다."""
+        return self.feed(text) + self.close()
+
+    def _drain(self, final):
+        buf = self._buffer
+        limit = len(buf) if final else len(buf) - _HOLD_BACK
+        parts = []
+        pos = 0
+
+        # limit 이전에서 시작하는 토큰은 항상 버퍼 안에 완전히 들어와 있음
+        for match in _TOKEN_RE.finditer(buf):
+            if match.start() >= limit:
+                break
+            parts.append(buf[pos : match.start()])
+            pos = match.end()
+            if match.group() == "</body>":
+                self._buffer = ""
+                out = self._emit("".join(parts), final=True)
+                self.state = "closed"
+                return out
+
+        if pos < limit:
+            parts.append(buf[pos:limit])
+        self._buffer = buf[max(pos, limit) :]
+        return self._emit("".join(parts), final)
+
+    def _emit(self, text, final):
+        if self.state != "start":
+            return text
+
+        # 앞쪽 공백을 건너뛴 첫 내용이 DOCTYPE인지 판단할 만큼 모일 때까지 대기
+        self._pending += text
+        head = self._pending.lstrip()
+        if len(head) < len(DOCTYPE) and not final:
+            return ""
+
+        self._pending = ""
+        self.state = "body"
+        if head.upper().startswith(DOCTYPE.upper()):
+            return head
+        return DOCTYPE + "\n" + head
+
+
+# ==========================================
+# 2. 스트리밍 생성
+# ==========================================
+def stream_generate(model, prompt, on_text, label="Gemini"):
+    """
+    model.generate_content(stream=True)로 응답을 받으며 조각마다 on_text(text)를 호출합니다.
+    첫 조각까지의 시간(TTFB)과 전체 생성 시간을 따로 기록하고, 전체 텍스트를 반환합니다.
+    요청 시작(첫 조각 수신 전)의 일시 오류만 스케줄러가 재시도합니다.
+    """
+    started = time.perf_counter()
+    first_at = None
+    chunks = []
+
+    response = scheduler.get_scheduler().call(
+        "gemini", model.generate_content, prompt, stream=True
+    )
+    for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # 안전 필터 등으로 텍스트가 없는 조각
+            continue
+        if not text:
+            continue
+
+        if first_at is None:
+            first_at = time.perf_counter()
+            print(f"   ⚡ [{label}] 첫 응답까지 {first_at - started:.2f}s (TTFB)")
+
+        chunks.append(text)
+        on_text(text)
+
+    total = time.perf_counter() - started
+    print(f"   ⏱️ [{label}] 전체 생성 {total:.2f}s ({len(chunks)} chunks)")
+
+    full_text = "".join(chunks)
+    metrics.record_generation(response, prompt, full_text)
+    if first_at is not None:
+        metrics.annotate(ttfb=round(first_at - started, 3), chunks=len(chunks))
+    return full_text
@@ -0,0 +1,290 @@
+import os
+import re
+import json
+from html import escape
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+
+import clients
+import metrics
+import scheduler
+import llm_cache
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# 구조화 모드: 모델은 섹션 내용만 JSON으로 출력하고, HTML/CSS 골격은 여기서 렌더링합니다.
+# (디자인 시스템/마크업을 매번 출력 토큰으로 생성하지 않음)
+STRUCTURED = os.getenv("STRUCTURED_REPORT", "") == "1"
+
+# True면 섹션 묶음을 동시에 생성 (입력 토큰은 묶음 수만큼 늘고, 대기 시간은 가장 긴 묶음 기준)
+PARALLEL_SECTIONS = os.getenv("STRUCTURED_PARALLEL", "1") != "0"
+
+# JSON 응답 강제 (google.generativeai generation_config)
+GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# 섹션 묶음: 출력이 긴 테마 분석을 먼저 시작 (Gemini 버스트 2 -> 세 번째 묶음은 잠시 대기)
+SECTION_GROUPS = {
+    "macro": ("theme_macro",),
+    "crypto": ("theme_crypto",),
+    "overview": ("ticker", "executive_insight", "conclusion"),
+}
+
+# 섹션별 JSON 형식 안내 (프롬프트에 그대로 들어감)
+SECTION_SPECS = {
+    "ticker": (
+        '"ticker": [{"sector": "Crypto" | "Macro" | "Geo", "headline": "한 줄 헤드라인", "ids": [출처 ID]}]'
+        "  // 섹터별 중요도 순 최대 2개, 최신 속보(NEWS) 중심"
+    ),
+    "executive_insight": (
+        '"executive_insight": [{"text": "문장", "ids": [출처 ID]}]  // 시장 흐름 5줄 요약'
+    ),
+    "theme_macro": (
+        '"theme_macro": {"title": "Macro & Policy (거시 경제 및 동향)", '
+        '"paragraphs": [{"text": "문단", "ids": [출처 ID]}]}'
+        "  // 정책, 경제 지표 분석, 지정학적 이슈. 3~5문단"
+    ),
+    "theme_crypto": (
+        '"theme_crypto": {"title": "Crypto Dynamics (암호화폐 시장 동향)", '
+        '"paragraphs": [{"text": "문단", "ids": [출처 ID]}]}'
+        "  // 규제 및 기관 동향. 3~5문단"
+    ),
+    "conclusion": (
+        '"conclusion": [{"text": "문단", "ids": [출처 ID]}]'
+        "  // 결론 및 전망: 낙관적이되 현실적인 어조, 1~2문단"
+    ),
+}
+
+STYLE = """
+body { font-family: "Helvetica Neue", Helvetica, Arial, sans-serif; color: #333; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; background-color: #fff; word-break: keep-all; word-wrap: break-word; }
+h1 { font-family: "Georgia", "Times New Roman", serif; font-size: 1.8em; color: #051c2c; border-bottom: 3px solid #051c2c; padding-bottom: 10px; margin-bottom: 20px; letter-spacing: -0.5px; }
+h2 { font-family: "Georgia", serif; font-size: 1.4em; color: #051c2c; margin-top: 40px; border-bottom: 1px solid #ddd; padding-bottom: 5px; }
+h3 { font-size: 1.1em; font-weight: bold; color: #051c2c; margin-top: 25px; }
+p { font-size: 16px; text-align: justify; line-height: 1.7; margin-bottom: 10px; }
+ul.ticker-list { list-style: none; padding-left: 0; margin: 0; }
+ul.ticker-list li { margin-bottom: 8px; }
+sup { color: #005a9c; font-weight: bold; font-size: 0.7em; margin-left: 2px; vertical-align: super; }
+a { text-decoration: none; color: #005a9c; }
+.exec-box { background-color: #f4f6f8; padding: 20px; border-left: 5px solid #051c2c; margin: 20px 0; border-radius: 4px; }
+.exec-box ul { margin: 0; padding-left: 18px; }
+.exec-title { display: block; font-weight: bold; color: #051c2c; margin-bottom: 8px; text-transform: uppercase; font-size: 0.8em; letter-spacing: 1px; }
+.footer { margin-top: 50px; font-size: 0.85em; color: #888; border-top: 1px solid #eee; padding-top: 20px; }
+.footer ul { padding-left: 0; list-style: none; }
+.footer li { margin-bottom: 10px; font-size: 0.9em; }
+"""
+
+# 리포트 골격 (</body></html>은 출처 목록 footer가 닫음)
+PAGE = Template(
+    """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Global Market Briefing</title>
+    <style>$style</style>
+</head>
+<body>
+    <h1>Global Market Morning Briefing <br><span style='font-size:0.6em; font-weight:normal; color:#555'>$date</span></h1>
+
+    <h2>SECTION 1: Market Ticker (24h)</h2>
+    <ul class="ticker-list">$ticker</ul>
+
+    <h2>SECTION 2: Deep Dive Analysis</h2>
+    <div class="exec-box">
+        <span class="exec-title">Executive Insight</span>
+        <ul>$insight</ul>
+    </div>
+$themes
+    <h2>SECTION 3: Conclusion</h2>
+$conclusion
+"""
+)
+
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+
+# ==========================================
+# 2. 섹션 생성 (JSON)
+# ==========================================
+def _section_prompt(today_str, full_context, keys):
+    specs = "\n".join(f"    {SECTION_SPECS[key]}" for key in keys)
+    return f"""
+    당신은 글로벌 최상위 컨설팅펌(McKinsey & Company)의 '수석 매크로 전략가'입니다.
+    아래 [Source Data]는 **'최신 속보(NEWS)'**와 **'배경 리포트(CONTEXT)'**로 구분되어 있습니다.
+    두 가지를 유기적으로 결합하여 단순한 사실 나열이 아닌 **'깊이 있는 통찰'**을 담은 리포트의 일부 섹션을 작성하십시오.
+
+    [Source Data]
+    {full_context}
+
+    [Rules]
+    1. **Tone:** 권위 있고, 분석적이며, 냉철한 프로페셔널 톤. 한국어 (전문 용어는 유지하되 자연스럽게)
+    2. **Strict Date Check:** 최신 속보는 `Date:` 필드를 확인하여 오늘({today_str}) 기준 24시간 이상 지난 뉴스는 인용하지 마십시오.
+    3. **Anti-Hallucination:** 모든 문장/문단은 근거가 된 Article ID를 "ids"에 숫자로 넣으십시오. 본문 텍스트에 [1] 같은 표기는 쓰지 마십시오.
+    4. **Connect the Dots:** [NEWS]의 사건을 [CONTEXT]의 흐름 속에서 해석하고, [CONTEXT] 인용 시 "최근 보고서에 따르면..." 등으로 시점을 명시하십시오.
+    5. 강조할 단어는 `**단어**`로 표시하되 남용하지 마십시오. HTML 태그는 쓰지 마십시오.
+
+    [Output]
+    다음 키만 가진 JSON 객체 하나만 출력하십시오. (코드블록/설명 금지)
+{specs}
+    """
+
+
+def _load_json(text):
+    text = (text or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("\n") + 1 :] if "\n" in text else text
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < 0:
+        raise ValueError("섹션 응답에서 JSON을 찾지 못했습니다.")
+    return json.loads(text[start : end + 1])
+
+
+def _check_items(key, items, dicts_only=False):
+    """[{"text"/"headline", "ids"}] (dicts_only가 아니면 문자열 항목도 허용) 형식인지 확인"""
+    if not isinstance(items, list):
+        raise ValueError(f"{key} 항목이 목록이 아닙니다. ({type(items).__name__})")
+    for item in items:
+        if isinstance(item, dict):
+            if not isinstance(item.get("ids", []), (list, type(None))):
+                raise ValueError(f"{key} 항목의 ids가 목록이 아닙니다.")
+        elif dicts_only or not isinstance(item, str):
+            raise ValueError(f"{key} 항목에 잘못된 값이 있습니다. ({type(item).__name__})")
+
+
+def _check_section(key, value):
+    """SECTION_SPECS 형식과 맞지 않는 섹션이면 ValueError (렌더링 전에 걸러냄)"""
+    if key == "ticker":
+        _check_items(key, value, dicts_only=True)
+    elif key.startswith("theme_"):
+        if not isinstance(value, dict):
+            raise ValueError(f"{key} 항목이 객체가 아닙니다. ({type(value).__name__})")
+        _check_items(f"{key}.paragraphs", value.get("paragraphs"))
+    else:
+        _check_items(key, value)
+
+
+def _parse_group(name, keys, text):
+    """응답 JSON에서 keys 섹션을 꺼내 형식을 확인한 뒤 {키: 내용}으로 반환 (실패 시 예외)"""
+    data = _load_json(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"{name} 묶음 응답이 JSON 객체가 아닙니다.")
+    missing = [key for key in keys if key not in data]
+    if missing:
+        raise ValueError(f"{name} 묶음 응답에 {', '.join(missing)} 항목이 없습니다.")
+    for key in keys:
+        _check_section(key, data[key])
+    return {key: data[key] for key in keys}
+
+
+def _generate_group(name, keys, today_str, full_context):
+    """섹션 묶음 하나를 생성하여 {키: 내용}을 반환합니다. (실패 시 예외)"""
+    prompt = _section_prompt(today_str, full_context, keys)
+    model = clients.get_model()
+
+    def produce():
+        response = scheduler.get_scheduler().call(
+            "gemini", model.generate_content, prompt, generation_config=GENERATION_CONFIG
+        )
+        metrics.record_generation(response, prompt, response.text)
+        _parse_group(name, keys, response.text)  # 형식이 틀린 응답은 캐시에 저장하지 않음 (예외)
+        return response.text
+
+    with metrics.span("gemini.section", group=name):
+        text = llm_cache.generate(clients.DEFAULT_MODEL, prompt, produce, config=GENERATION_CONFIG)
+        return _parse_group(name, keys, text)
+
+
+def generate_sections(today_str, full_context, parallel=None):
+    """
+    모든 섹션 내용을 dict로 반환합니다. 하나라도 실패하면 None (호출 측에서 기존 HTML 생성으로 대체)
+    parallel=True(기본값: PARALLEL_SECTIONS)면 묶음별로 동시에, 아니면 한 번의 호출로 생성합니다.
+    """
+    parallel = PARALLEL_SECTIONS if parallel is None else parallel
+    groups = SECTION_GROUPS if parallel else {"all": tuple(SECTION_SPECS)}
+    print(f"   🧩 [Structured] 섹션 JSON 생성 ({len(groups)}개 호출{', 병렬' if parallel else ''})")
+
+    sections = {}
+    try:
+        if len(groups) == 1:
+            for name, keys in groups.items():
+                sections.update(_generate_group(name, keys, today_str, full_context))
+        else:
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                futures = [
+                    executor.submit(_generate_group, name, keys, today_str, full_context)
+                    for name, keys in groups.items()
+                ]
+                for future in futures:
+                    sections.update(future.result())
+    except Exception as e:
+        print(f"   ⚠️ [Structured] 섹션 생성 실패 ({type(e).__name__}: {e})")
+        return None
+    return sections
+
+
+# ==========================================
+# 3. 로컬 렌더링
+# ==========================================
+def _cite(ids, valid_ids):
+    """출처 ID 목록 -> <sup>[n]</sup> (목록에 없는 ID는 버림)"""
+    cited = []
+    for value in ids or []:
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            continue
+        if number in valid_ids and number not in cited:
+            cited.append(number)
+    return "".join(f"<sup>[{number}]</sup>" for number in cited)
+
+
+def _text(value):
+    """모델 텍스트를 이스케이프하고 **강조**만 <strong>으로 변환"""
+    return _BOLD_RE.sub(r"<strong>\1</strong>", escape(str(value or "").strip(), quote=False))
+
+
+def _items(items):
+    """[{"text", "ids"}] 또는 문자열 목록을 (text, ids) 쌍으로 정리"""
+    for item in items or []:
+        if isinstance(item, dict):
+            yield item.get("text") or item.get("headline") or "", item.get("ids")
+        else:
+            yield item, None
+
+
+def render(sections, today_str, valid_ids):
+    """섹션 dict -> 리포트 HTML (</body> 직전까지, 출처 footer는 호출 측에서 이어 붙임)"""
+    ticker = "".join(
+        f"\n        <li><strong>[{escape(str(item.get('sector', '')), quote=False)}]</strong> "
+        f"{_text(item.get('headline'))}{_cite(item.get('ids'), valid_ids)}</li>"
+        for item in sections.get("ticker") or []
+        if isinstance(item, dict)
+    )
+    insight = "".join(
+        f"\n            <li>{_text(text)}{_cite(ids, valid_ids)}</li>"
+        for text, ids in _items(sections.get("executive_insight"))
+    )
+
+    themes = []
+    for number, key in enumerate(("theme_macro", "theme_crypto"), 1):
+        theme = sections.get(key) or {}
+        paragraphs = "".join(
+            f"\n    <p>{_text(text)}{_cite(ids, valid_ids)}</p>"
+            for text, ids in _items(theme.get("paragraphs"))
+        )
+        themes.append(f"\n    <h3>Theme {number}: {_text(theme.get('title'))}</h3>{paragraphs}")
+
+    conclusion = "".join(
+        f"\n    <p>{_text(text)}{_cite(ids, valid_ids)}</p>"
+        for text, ids in _items(sections.get("conclusion"))
+    )
+
+    return PAGE.substitute(
+        style=STYLE,
+        date=escape(today_str),
+        ticker=ticker,
+        insight=insight,
+        themes="".join(themes),
+        conclusion=conclusion,
+    )
@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import clients
+import metrics
+import scheduler
+import search_cache
+from context_builder import SEPARATOR, clean_content
+from dedup_index import canonicalize_url, estimate_tokens
+
+# ==========================================
+# 1. 설정 (Settings)
+# ==========================================
+# Map-Reduce 모드: 트랙별 기사 묶음을 작은 모델 호출로 병렬 요약(map)한 뒤,
+# 요약본만으로 최종 리포트를 한 번 생성(reduce)합니다.
+MAP_REDUCE = os.getenv("MAP_REDUCE", "") == "1"
+
+# 요약용 모델 (빠르고 저렴한 모델), 동시 호출 수, 호출 1회에 묶을 기사 수
+MAP_MODEL_NAME = os.getenv("MAP_MODEL_NAME", "gemini-2.5-flash-lite")
+MAP_MAX_WORKERS = int(os.getenv("MAP_MAX_WORKERS", "4"))
+MAP_BATCH_SIZE = 4
+
+# 기사(정규화 URL + 원문 해시)별 요약 캐시 (검색 캐시와 같은 SQLite 형식, 7일 유지)
+MAP_CACHE_PATH = os.path.join(search_cache.CACHE_DIR, "map_cache.sqlite3")
+MAP_CACHE_TTL_TYPE = "context"
+
+# 프롬프트를 바꾸면 올려서 이전 요약 캐시를 무효화
+MAP_PROMPT_VERSION = "2"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_map_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = search_cache.SearchCache(MAP_CACHE_PATH)
+        return _cache
+
+
+# ==========================================
+# 2. 요약 캐시 키
+# ==========================================
+def map_key(article):
+    """
+    정규화 URL + 원문 전체 해시로 요약 캐시 키를 만듭니다.
+    (Article ID는 실행마다 바뀌므로 제외, 모델/프롬프트 버전 포함)
+    같은 URL이라도 본문이 갱신되면 다시 요약합니다.
+    """
+    content_hash = hashlib.sha256((article.content or "").encode("utf-8")).hexdigest()
+    raw = "\n".join(
+        (MAP_MODEL_NAME, MAP_PROMPT_VERSION, canonicalize_url(article.url), content_hash)
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ==========================================
+# 3. Map: 묶음 단위 병렬 요약
+# ==========================================
+def _map_prompt(articles):
+    body = "".join(
+        f"{article.prompt_header()}Content: {clean_content(article.content)}\n{SEPARATOR}"
+        for article in articles
+    )
+    return f"""
+    당신은 금융 리서치 애널리스트입니다. 아래 기사들을 **각각** 요약하십시오.
+
+    [규칙]
+    1. 기사마다 핵심 사실 3~5개를 한국어 문장으로 요약하십시오. 수치, 날짜, 기관/인물 이름은 원문 그대로 유지하십시오.
+    2. 원문에 없는 내용은 절대 추가하지 마십시오.
+    3. 출력은 JSON 객체 하나만: {{"<Article ID 숫자>": "요약", ...}} (코드블록/설명 금지)
+
+    [Articles]
+    {body}
+    """
+
+
+def _parse_summaries(text):
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("\n") + 1 :] if "\n" in text else text
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < 0:
+        raise ValueError("요약 응답에서 JSON을 찾지 못했습니다.")
+    data = json.loads(text[start : end + 1])
+    return {int(k): str(v).strip() for k, v in data.items() if str(k).strip().isdigit()}
+
+
+def _summarize_batch(articles):
+    """묶음 하나를 요약하여 {article_id: 요약}을 반환 (실패 시 빈 dict)"""
+    prompt = _map_prompt(articles)
+    ids = ",".join(str(a.id) for a in articles)
+    try:
+        with metrics.span("gemini.map", articles=len(articles), ids=ids):
+            model = clients.get_model(MAP_MODEL_NAME)
+            response = scheduler.get_scheduler().call(
+                "gemini", model.generate_content, prompt
+            )
+            metrics.record_generation(response, prompt, response.text)
+            return _parse_summaries(response.text)
+    except Exception as e:
+        print(f"   ⚠️ [Map] 기사 {ids} 요약 실패 (원문 사용): {type(e).__name__}: {e}")
+        return {}
+
+
+def _batches(articles):
+    """같은 트랙(카테고리)끼리 MAP_BATCH_SIZE개씩 묶음"""
+    by_category = {}
+    for article in articles:
+        by_category.setdefault(article.category, []).append(article)
+    for items in by_category.values():
+        for i in range(0, len(items), MAP_BATCH_SIZE):
+            yield items[i : i + MAP_BATCH_SIZE]
+
+
+# ==========================================
+# 4. 기사별 요약 (컨텍스트 예산 배분 전)
+# ==========================================
+def summarize_articles(articles, use_cache=True):
+    """
+    기사(sources.Article, id 부여 후) 원문 전체를 요약하여 {article_id: 요약}을 반환합니다.
+    ContextBuilder가 예산에 맞춰 본문을 자르기 전에 호출하므로, 잘린 본문이 아니라 기사 전체가 요약되고
+    예산은 요약본 기준으로 배분됩니다. 요약에 실패한 기사는 결과에 없으므로 원문 본문을 그대로 사용합니다.
+    """
+    articles = [a for a in articles if a.content]
+    if not articles:
+        return {}
+
+    summaries = {}
+    cache = get_map_cache() if use_cache else None
+    pending = []
+    for article in articles:
+        cached = cache.get(map_key(article), MAP_CACHE_TTL_TYPE) if cache else None
+        if cached is not None:
+            summaries[article.id] = cached
+        else:
+            pending.append(article)
+
+    print(
+        f"🗺️ [Map] 기사 {len(articles)}건 중 캐시 {len(articles) - len(pending)}건, "
+        f"요약 {len(pending)}건 ({MAP_MODEL_NAME}, workers={MAP_MAX_WORKERS})"
+    )
+
+    with metrics.span("mapreduce.map", articles=len(articles), cached=len(articles) - len(pending)):
+        batches = list(_batches(pending))
+        if batches:
+            with ThreadPoolExecutor(max_workers=MAP_MAX_WORKERS) as executor:
+                for batch, result in zip(batches, executor.map(_summarize_batch, batches)):
+                    for article in batch:
+                        summary = result.get(article.id)
+                        if not summary:
+                            continue
+                        summaries[article.id] = summary
+                        if cache:
+                            cache.put(map_key(article), summary, MAP_CACHE_TTL_TYPE)
+
+    before = sum(estimate_tokens(a.content) for a in articles if a.id in summaries)
+    after = sum(estimate_tokens(text) for text in summaries.values())
+    print(f"🗜️ [Map] 요약된 기사 {len(summaries)}건: 원문 {before:,} -> {after:,} 토큰")
+    return summaries